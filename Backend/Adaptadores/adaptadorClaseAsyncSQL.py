@@ -0,0 +1,45 @@
+# Adaptadores/adaptadorClaseAsyncSQL.py
+from typing import List, Optional
+from datetime import time
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.clase import Clase, condicion_dia, condicion_horario, condicion_rango_hora
+
+
+class AdaptadorClaseAsyncSQL:
+    """Variante asyncio de AdaptadorClaseSQL para los endpoints de mayor tráfico"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def obtener_clase_por_id(self, clase_id: int) -> Optional[Clase]:
+        return await self.session.get(Clase, clase_id)
+
+    async def listar_clases(self,
+                            activas: bool = False,
+                            instructor: Optional[str] = None,
+                            dificultad: Optional[str] = None,
+                            horario: Optional[str] = None,
+                            dia_semana: Optional[str] = None,
+                            hora_desde: Optional[time] = None,
+                            hora_hasta: Optional[time] = None) -> List[Clase]:
+        query = select(Clase)
+
+        if activas:
+            query = query.where(Clase.activa == True)
+        if instructor:
+            query = query.where(Clase.instructor == instructor)
+        if dificultad:
+            query = query.where(Clase.dificultad == dificultad)
+        if horario:
+            query = query.where(condicion_horario(horario))
+        if hora_desde is not None or hora_hasta is not None:
+            query = query.where(condicion_rango_hora(hora_desde, hora_hasta))
+        if dia_semana:
+            query = query.where(condicion_dia(dia_semana))
+
+        # Mismo orden que listar_todas_las_clases del adaptador sync
+        query = query.order_by(Clase.activa.desc(), Clase.nombre)
+
+        resultado = await self.session.exec(query)
+        return resultado.all()
@@ -0,0 +1,120 @@
+# Adaptadores/adaptadorClaseCache.py
+from datetime import time
+from typing import Any, Dict, List, Optional
+
+from Dominio.repositorios.repositorioClase import RepositorioClase
+from models.clase import Clase
+from servicios.cache_clases import CacheCatalogoClases, cache_clases
+
+
+class AdaptadorClaseCache(RepositorioClase):
+    """
+    Repositorio de clases con cache delante de otro repositorio.
+
+    Cachea las lecturas del catálogo (listados y clase por id) y, en cada
+    escritura, invalida la clase tocada y los listados y guarda la versión
+    recién escrita. Las clases que devuelve la cache no están asociadas a
+    ninguna sesión: para modificar una clase se usa consultar_clase, que
+    siempre va a la base.
+    """
+
+    def __init__(self, repositorio: RepositorioClase, cache: CacheCatalogoClases = cache_clases):
+        self.repositorio = repositorio
+        self.cache = cache
+
+    def __getattr__(self, nombre: str):
+        # Métodos propios del adaptador envuelto (estadísticas, inscripciones...)
+        if nombre == "repositorio":
+            raise AttributeError(nombre)
+        return getattr(self.repositorio, nombre)
+
+    def _listado(self, consulta: str, filtros: Dict[str, Any], cargar) -> List[Clase]:
+        clave = self.cache.clave_listado(consulta, filtros)
+        clases = self.cache.obtener_listado(clave)
+        if clases is None:
+            clases = list(cargar())
+            self.cache.guardar_listado(clave, clases)
+        return clases
+
+    # ---- lecturas cacheadas ----
+    def obtener_clase_por_id(self, clase_id: int) -> Optional[Clase]:
+        clave = self.cache.clave_clase(clase_id)
+        clase = self.cache.obtener_clase(clave)
+        if clase is None:
+            clase = self.repositorio.obtener_clase_por_id(clase_id)
+            if clase is not None:
+                self.cache.guardar_clase(clave, clase)
+        return clase
+
+    def listar_clases(self, activas: bool = True, instructor: Optional[str] = None, horario: Optional[str] = None,
+                      dia_semana: Optional[str] = None,
+                      hora_desde: Optional[time] = None, hora_hasta: Optional[time] = None) -> List[Clase]:
+        filtros = {"activas": activas, "instructor": instructor, "horario": horario,
+                   "dia_semana": dia_semana, "hora_desde": hora_desde, "hora_hasta": hora_hasta}
+        return self._listado("listar_clases", filtros, lambda: self.repositorio.listar_clases(**filtros))
+
+    def listar_todas_las_clases(self, instructor: Optional[str] = None) -> List[Clase]:
+        return self._listado("listar_todas_las_clases", {"instructor": instructor},
+                             lambda: self.repositorio.listar_todas_las_clases(instructor=instructor))
+
+    # ---- lecturas directas ----
+    def consultar_clase(self, clase_id: int) -> Optional[Clase]:
+        return self.repositorio.consultar_clase(clase_id)
+
+    def obtener_clase_por_nombre(self, nombre: str) -> Optional[Clase]:
+        return self.repositorio.obtener_clase_por_nombre(nombre)
+
+    def listar_clases_por_instructor(self, instructor: str) -> List[Clase]:
+        return self.repositorio.listar_clases_por_instructor(instructor)
+
+    def listar_clases_por_dificultad(self, dificultad: str, activas: bool = True) -> List[Clase]:
+        return self.repositorio.listar_clases_por_dificultad(dificultad, activas)
+
+    def listar_clases_por_dia_hora(self, dia_semana: str, hora: str) -> List[Clase]:
+        return self.repositorio.listar_clases_por_dia_hora(dia_semana, hora)
+
+    def verificar_nombre_existente(self, nombre: str, excluir_id: Optional[int] = None) -> bool:
+        return self.repositorio.verificar_nombre_existente(nombre, excluir_id)
+
+    def obtener_estadisticas_clases(self, clase_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        return self.repositorio.obtener_estadisticas_clases(clase_ids)
+
+    # ---- escrituras: write-through + invalidación ----
+    def crear_clase(self, clase: Clase) -> Clase:
+        creada = self.repositorio.crear_clase(clase)
+        self.cache.invalidar_clase(creada.id, creada)
+        return creada
+
+    def actualizar_clase(self, clase_id: int, datos_actualizados: dict) -> Optional[Clase]:
+        clase = self.repositorio.actualizar_clase(clase_id, datos_actualizados)
+        if clase is not None:
+            self.cache.invalidar_clase(clase_id, clase)
+        return clase
+
+    def eliminar_clase(self, clase_id: int) -> bool:
+        eliminada = self.repositorio.eliminar_clase(clase_id)
+        if eliminada:
+            self.cache.invalidar_clase(clase_id)
+        return eliminada
+
+    def activar_clase(self, clase_id: int) -> Optional[Clase]:
+        clase = self.repositorio.activar_clase(clase_id)
+        if clase is not None:
+            self.cache.invalidar_clase(clase_id, clase)
+        return clase
+
+
+class AdaptadorClaseCacheAsync:
+    """Misma cache para el listado async del panel; comparte versiones con el sync"""
+
+    def __init__(self, repositorio, cache: CacheCatalogoClases = cache_clases):
+        self.repositorio = repositorio
+        self.cache = cache
+
+    async def listar_clases(self, **filtros) -> List[Clase]:
+        clave = self.cache.clave_listado("listar_clases_async", filtros)
+        clases = self.cache.obtener_listado(clave)
+        if clases is None:
+            clases = list(await self.repositorio.listar_clases(**filtros))
+            self.cache.guardar_listado(clave, clases)
+        return clases
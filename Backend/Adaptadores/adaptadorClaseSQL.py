@@ -1,8 +1,14 @@
 # Adaptadores/adaptadorClaseSQL.py - VERSIÓN COMPLETA
 from Dominio.repositorios.repositorioClase import RepositorioClase
-from models.clase import Clase
+from models.clase import Clase, condicion_dia, condicion_horario, condicion_rango_hora
+from models.cupo_fragmento import inscritos_activos_total, inscritos_historicos_total
 from sqlmodel import Session, select
 from typing import List, Optional, Dict, Any
+from datetime import time
+from servicios.sesiones import regenerar_sesiones_clase
+
+# Campos que cambian las sesiones materializadas de una clase
+CAMPOS_SESION = {"dias_semana", "hora", "activa", "instructor", "duracion_minutos"}
 
 class AdaptadorClaseSQL(RepositorioClase):
     def __init__(self, session: Session):
@@ -12,6 +18,7 @@ class AdaptadorClaseSQL(RepositorioClase):
         self.session.add(clase)
         self.session.commit()
         self.session.refresh(clase)
+        regenerar_sesiones_clase(self.session, clase)
         return clase
 
     def consultar_clase(self, clase_id: int) -> Optional[Clase]:
@@ -23,16 +30,18 @@ class AdaptadorClaseSQL(RepositorioClase):
     def listar_clases_por_dia_hora(self, dia_semana: str, hora: str) -> List[Clase]:
         query = select(Clase).where(
             Clase.activa == True,
-            Clase.hora == hora
+            Clase.hora == hora,
+            condicion_dia(dia_semana)
         )
-        clases = self.session.exec(query).all()
-        return [c for c in clases if c.dias_semana and dia_semana in c.dias_semana]
+        return self.session.exec(query).all()
     
     def obtener_clase_por_nombre(self, nombre: str) -> Optional[Clase]:
         statement = select(Clase).where(Clase.nombre == nombre)
         return self.session.exec(statement).first()
 
-    def listar_clases(self, activas: bool = True, instructor: Optional[str] = None, horario: Optional[str] = None) -> List[Clase]:
+    def listar_clases(self, activas: bool = True, instructor: Optional[str] = None, horario: Optional[str] = None,
+                      dia_semana: Optional[str] = None,
+                      hora_desde: Optional[time] = None, hora_hasta: Optional[time] = None) -> List[Clase]:
         query = select(Clase)
         
         if activas:
@@ -42,7 +51,13 @@ class AdaptadorClaseSQL(RepositorioClase):
             query = query.where(Clase.instructor == instructor)
         
         if horario:
-            query = query.where(Clase.hora == horario)
+            query = query.where(condicion_horario(horario))
+
+        if dia_semana:
+            query = query.where(condicion_dia(dia_semana))
+
+        if hora_desde is not None or hora_hasta is not None:
+            query = query.where(condicion_rango_hora(hora_desde, hora_hasta))
         
         query = query.order_by(Clase.nombre)
         
@@ -61,7 +76,7 @@ class AdaptadorClaseSQL(RepositorioClase):
         return self.session.exec(query).all()
 
     def listar_clases_por_horario(self, horario: str, activas: bool = True) -> List[Clase]:
-        query = select(Clase).where(Clase.hora == horario)
+        query = select(Clase).where(condicion_horario(horario))
         if activas:
             query = query.where(Clase.activa == True)
         return self.session.exec(query).all()
@@ -82,6 +97,8 @@ class AdaptadorClaseSQL(RepositorioClase):
         self.session.add(clase)
         self.session.commit()
         self.session.refresh(clase)
+        if CAMPOS_SESION.intersection(datos_actualizados):
+            regenerar_sesiones_clase(self.session, clase)
         return clase
 
     def eliminar_clase(self, clase_id: int) -> bool:
@@ -90,6 +107,7 @@ class AdaptadorClaseSQL(RepositorioClase):
             clase.activa = False  # Soft delete
             self.session.add(clase)
             self.session.commit()
+            regenerar_sesiones_clase(self.session, clase)
             return True
         return False
 
@@ -100,6 +118,7 @@ class AdaptadorClaseSQL(RepositorioClase):
             self.session.add(clase)
             self.session.commit()
             self.session.refresh(clase)
+            regenerar_sesiones_clase(self.session, clase)
         return clase
 
     def verificar_nombre_existente(self, nombre: str, excluir_id: Optional[int] = None) -> bool:
@@ -132,26 +151,28 @@ class AdaptadorClaseSQL(RepositorioClase):
 
     # NUEVO MÉTODO: Estadísticas de una clase
     def obtener_estadisticas_clase(self, clase_id: int) -> Dict[str, Any]:
-        from models.inscripcion import Inscripcion, EstadoInscripcion
-        from sqlalchemy import func
-        
-        clase = self.consultar_clase(clase_id)
-        if not clase:
+        return self.obtener_estadisticas_clases([clase_id]).get(clase_id, {})
+
+    def obtener_estadisticas_clases(self, clase_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Estadísticas de varias clases leídas de los contadores de ocupación"""
+        if not clase_ids:
             return {}
-        
-        # Contar inscripciones activas
-        inscripciones_activas = len(self.obtener_inscripciones_activas(clase_id))
-        
-        # Contar total de inscripciones históricas
-        statement_total = select(func.count(Inscripcion.id)).where(Inscripcion.clase_id == clase_id)
-        total_inscripciones = self.session.exec(statement_total).first()
-        
-        return {
-            'clase_id': clase_id,
-            'nombre': clase.nombre,
-            'cupo_maximo': clase.cupo_maximo,
-            'inscripciones_activas': inscripciones_activas,
-            'cupos_disponibles': clase.cupo_maximo - inscripciones_activas,
-            'porcentaje_ocupacion': (inscripciones_activas / clase.cupo_maximo * 100) if clase.cupo_maximo > 0 else 0,
-            'total_inscripciones_historicas': total_inscripciones or 0
-        }
\ No newline at end of file
+
+        statement = (
+            select(Clase.id, Clase.nombre, Clase.cupo_maximo, inscritos_activos_total(), inscritos_historicos_total())
+            .where(Clase.id.in_(clase_ids))
+        )
+
+        estadisticas = {}
+        for clase_id, nombre, cupo_maximo, inscripciones_activas, total_inscripciones in self.session.exec(statement).all():
+            cupo_maximo = cupo_maximo or 0
+            estadisticas[clase_id] = {
+                'clase_id': clase_id,
+                'nombre': nombre,
+                'cupo_maximo': cupo_maximo,
+                'inscripciones_activas': inscripciones_activas,
+                'cupos_disponibles': cupo_maximo - inscripciones_activas,
+                'porcentaje_ocupacion': (inscripciones_activas / cupo_maximo * 100) if cupo_maximo > 0 else 0,
+                'total_inscripciones_historicas': total_inscripciones
+            }
+        return estadisticas
@@ -0,0 +1,109 @@
+# Adaptadores/adaptadorClaseSesionSQL.py
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+
+from sqlalchemy import bindparam, delete
+from sqlmodel import Session, select
+
+from Dominio.repositorios.repositorioClaseSesion import RepositorioClaseSesion
+from models.clase import Clase
+from models.clase_sesion import ClaseSesion
+from models.cupo_fragmento import inscritos_activos_total
+from servicios.cronograma import compilar_plan, expandir_plan
+
+
+class AdaptadorClaseSesionSQL(RepositorioClaseSesion):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def sincronizar_sesiones(self, clases: List[Clase], desde: datetime, hasta: datetime) -> Dict[str, int]:
+        """
+        Dejar en [desde, hasta] exactamente las sesiones que indica la
+        recurrencia de cada clase: solo se insertan las que faltan, se borran
+        las que ya no corresponden y se corrigen instructor/duración.
+        """
+        resultado = {"creadas": 0, "eliminadas": 0, "actualizadas": 0}
+        por_id = {clase.id: clase for clase in clases}
+        if not por_id:
+            return resultado
+
+        existentes = {
+            (sesion.clase_id, sesion.fecha_hora): sesion
+            for sesion in self.session.exec(
+                select(ClaseSesion).where(
+                    ClaseSesion.clase_id.in_(por_id.keys()),
+                    ClaseSesion.fecha_hora >= desde,
+                    ClaseSesion.fecha_hora <= hasta,
+                )
+            ).all()
+        }
+
+        # Clases inactivas o sin hora no generan sesiones (y pierden las futuras)
+        plan = compilar_plan([
+            {"clase_id": clase.id, "nombre": clase.nombre, "descripcion": clase.descripcion,
+             "dias_mask": clase.dias_mask, "hora": clase.hora}
+            for clase in clases if clase.activa and clase.hora
+        ])
+        deseadas = {(o["clase_id"], o["fecha"]) for o in expandir_plan(plan, desde, hasta)}
+
+        sobrantes = [sesion.id for clave, sesion in existentes.items() if clave not in deseadas]
+        if sobrantes:
+            self.session.exec(delete(ClaseSesion).where(ClaseSesion.id.in_(sobrantes)))
+
+        nuevas = [
+            {"clase_id": clase_id, "fecha_hora": fecha_hora,
+             "instructor": por_id[clase_id].instructor,
+             "duracion_minutos": por_id[clase_id].duracion_minutos}
+            for clase_id, fecha_hora in deseadas - existentes.keys()
+        ]
+        if nuevas:
+            self.session.execute(ClaseSesion.__table__.insert(), nuevas)
+
+        cambios = [
+            {"_id": sesion.id, "_instructor": por_id[clase_id].instructor,
+             "_duracion": por_id[clase_id].duracion_minutos}
+            for (clase_id, fecha_hora), sesion in existentes.items()
+            if (clase_id, fecha_hora) in deseadas and (
+                sesion.instructor != por_id[clase_id].instructor
+                or sesion.duracion_minutos != por_id[clase_id].duracion_minutos)
+        ]
+        if cambios:
+            tabla = ClaseSesion.__table__
+            self.session.execute(
+                tabla.update().where(tabla.c.id == bindparam("_id")).values(
+                    instructor=bindparam("_instructor"), duracion_minutos=bindparam("_duracion")),
+                cambios,
+            )
+
+        self.session.commit()
+        resultado.update(creadas=len(nuevas), eliminadas=len(sobrantes), actualizadas=len(cambios))
+        return resultado
+
+    def listar_sesiones(self, desde: datetime, hasta: datetime,
+                        clase_id: Optional[int] = None,
+                        instructor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sesiones del rango con el cupo y los inscritos activos de su clase"""
+        statement = (
+            select(ClaseSesion, Clase.nombre, Clase.cupo_maximo, inscritos_activos_total())
+            .join(Clase, Clase.id == ClaseSesion.clase_id)
+            .where(ClaseSesion.fecha_hora >= desde, ClaseSesion.fecha_hora <= hasta)
+        )
+        if clase_id is not None:
+            statement = statement.where(ClaseSesion.clase_id == clase_id)
+        if instructor:
+            statement = statement.where(ClaseSesion.instructor == instructor)
+        statement = statement.order_by(ClaseSesion.fecha_hora, ClaseSesion.clase_id)
+
+        return [
+            {
+                "id": sesion.id,
+                "clase_id": sesion.clase_id,
+                "nombre": nombre,
+                "instructor": sesion.instructor,
+                "fecha_hora": sesion.fecha_hora,
+                "duracion_minutos": sesion.duracion_minutos,
+                "cupo_maximo": cupo_maximo,
+                "inscritos": cantidad,
+            }
+            for sesion, nombre, cupo_maximo, cantidad in self.session.exec(statement).all()
+        ]
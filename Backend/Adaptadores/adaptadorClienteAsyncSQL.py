@@ -0,0 +1,26 @@
+# Adaptadores/adaptadorClienteAsyncSQL.py
+from typing import Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.cliente import Cliente
+
+
+class AdaptadorClienteAsyncSQL:
+    """Variante asyncio de AdaptadorClienteSQL para los endpoints de mayor tráfico"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def consultar_usuario(self, dni: str) -> Optional[Cliente]:
+        resultado = await self.session.exec(select(Cliente).where(Cliente.dni == dni))
+        return resultado.first()
+
+    async def consultar_usuario_por_correo(self, correo: str) -> Optional[Cliente]:
+        resultado = await self.session.exec(select(Cliente).where(Cliente.correo == correo))
+        return resultado.first()
+
+    async def iniciar_sesion(self, correo: str, password: str) -> Optional[Cliente]:
+        cliente = await self.consultar_usuario_por_correo(correo)
+        if cliente and cliente.password == password:
+            return cliente
+        return None
@@ -1,8 +1,13 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from Dominio.repositorios.repositorioCliente import RepositorioCliente
-from models.cliente import Cliente
+from models.cliente import Cliente, ClienteCreate
+from pydantic import ValidationError
+from sqlalchemy import delete, exists, insert, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select, func
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from Adaptadores.exportacion import columnas_de, iterar_filas
+from Adaptadores.lotes import procesar_en_lotes
 
 class AdaptadorClienteSQL(RepositorioCliente):
     def __init__(self, session: Session):
@@ -98,6 +103,22 @@ class AdaptadorClienteSQL(RepositorioCliente):
             resultados = session.exec(statement).all()
             return resultados
     
+    def exportar_clientes(self,
+                          solo_activos: bool = False,
+                          fecha_registro_inicio: Optional[datetime] = None,
+                          fecha_registro_fin: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Recorrer los clientes filtrados como filas planas (sin password), sin materializarlos"""
+        query = select(*columnas_de(Cliente, excluir=("password",)))
+        if solo_activos:
+            query = query.where(Cliente.activo == True)
+        if fecha_registro_inicio:
+            query = query.where(Cliente.fecha_registro >= fecha_registro_inicio.date())
+        if fecha_registro_fin:
+            # fecha_registro_fin es exclusiva
+            query = query.where(Cliente.fecha_registro < fecha_registro_fin.date())
+        query = query.order_by(Cliente.id)
+        return iterar_filas(self.session, query)
+
     def consultar_usuario_completo(self, dni: str) -> Optional[Cliente]:
         """Obtener usuario con información completa"""
         return self.consultar_usuario(dni)
@@ -147,6 +168,116 @@ class AdaptadorClienteSQL(RepositorioCliente):
                 return True
             return False
     
+    def cambiar_estado_usuarios(self, cliente_ids: List[int], activo: bool) -> Dict[int, Optional[str]]:
+        """Activar/desactivar varios usuarios con un UPDATE por lote"""
+        return procesar_en_lotes(
+            self.session, Cliente.id, cliente_ids,
+            lambda ids: [update(Cliente).where(Cliente.id.in_(ids)).values(activo=activo)],
+            no_encontrado="No encontrado",
+        )
+
+    def eliminar_usuarios_permanentemente(self, cliente_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Eliminar varios usuarios con un DELETE por lote; no se borran los que tienen historial"""
+        from models.inscripcion import Inscripcion
+        from models.pago import Pago
+        from models.transaccion import Transaccion
+        from models.informacion import Informacion
+        from models.lista_espera import ListaEspera
+
+        dependencias = [
+            exists().where(Inscripcion.cliente_dni == Cliente.dni),
+            exists().where(Pago.id_usuario == Cliente.dni),
+            exists().where(Transaccion.cliente_dni == Cliente.dni),
+            exists().where(Informacion.destinatario_id == Cliente.id),
+            # lista_espera.cliente_dni es FK: sin esto el DELETE falla en MySQL (y el lote entero)
+            exists().where(ListaEspera.cliente_dni == Cliente.dni),
+        ]
+        return procesar_en_lotes(
+            self.session, Cliente.id, cliente_ids,
+            lambda ids: [delete(Cliente).where(Cliente.id.in_(ids))],
+            no_encontrado="Cliente no encontrado",
+            columnas=[or_(*dependencias)],
+            motivo_rechazo=lambda fila: "El cliente tiene inscripciones, pagos, transacciones, informaciones o listas de espera asociadas" if fila[1] else None,
+        )
+
+    def _validar_clientes(self, filas: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Validar un lote de filas (número, datos) como lo hace RegistrarUsuarioCase,
+        pero con una sola consulta IN para los DNI y correos ya registrados.
+        Devuelve (valores a insertar, errores por fila).
+        """
+        candidatos, errores = [], []
+        dnis, correos = set(), set()
+        for numero, datos in filas:
+            try:
+                # Las celdas vacías del CSV llegan como "": los opcionales quedan en None
+                cliente = ClienteCreate(**{k: v for k, v in datos.items() if v not in ("", None)})
+            except (ValidationError, TypeError) as e:
+                errores.append({"fila": numero, "dni": datos.get("dni"), "error": " ".join(str(e).split())})
+                continue
+            if cliente.dni in dnis:
+                errores.append({"fila": numero, "dni": cliente.dni, "error": "DNI repetido en el archivo"})
+                continue
+            if cliente.correo in correos:
+                errores.append({"fila": numero, "dni": cliente.dni, "error": "Correo repetido en el archivo"})
+                continue
+            dnis.add(cliente.dni)
+            correos.add(cliente.correo)
+            candidatos.append((numero, cliente))
+
+        if not candidatos:
+            return [], errores
+
+        existentes = self.session.execute(
+            select(Cliente.dni, Cliente.correo).where(or_(Cliente.dni.in_(dnis), Cliente.correo.in_(correos)))
+        ).all()
+        dnis_existentes = {fila.dni for fila in existentes}
+        correos_existentes = {fila.correo for fila in existentes}
+
+        hoy = date.today()
+        valores = []
+        for numero, cliente in candidatos:
+            if cliente.dni in dnis_existentes:
+                errores.append({"fila": numero, "dni": cliente.dni, "error": "Ya existe un usuario con ese DNI."})
+            elif cliente.correo in correos_existentes:
+                errores.append({"fila": numero, "dni": cliente.dni, "error": "Ya existe un usuario con ese correo."})
+            else:
+                valores.append(dict(cliente.dict(), password=cliente.dni, activo=True, fecha_registro=hoy))
+        errores.sort(key=lambda error: error["fila"])
+        return valores, errores
+
+    def _insertar_clientes(self, valores: List[Dict[str, Any]]) -> None:
+        """INSERT de varias filas en un solo executemany (el driver lo envía como INSERT multi-fila)"""
+        if valores:
+            self.session.execute(insert(Cliente.__table__), valores)
+        self.session.commit()
+
+    def importar_clientes(self, filas: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Crear un lote de clientes importados; las filas rechazadas no frenan a las demás"""
+        for intento in range(2):
+            valores, errores = self._validar_clientes(filas)
+            try:
+                self._insertar_clientes(valores)
+                return {"creados": len(valores), "errores": errores}
+            except IntegrityError as e:
+                # Otro alta concurrente ganó un DNI/correo entre la consulta y el INSERT:
+                # en el segundo intento la consulta ya lo ve y se rechaza solo esa fila
+                self.session.rollback()
+                print(f"⚠️ Conflicto importando lote de {len(valores)} clientes (intento {intento + 1}): {e.orig}")
+        return {"creados": 0, "errores": [{"fila": numero, "dni": datos.get("dni"), "error": "Conflicto al insertar el lote"}
+                                          for numero, datos in filas]}
+
+    def crear_usuarios(self, clientes: List[ClienteCreate]) -> List[Cliente]:
+        """Alta masiva todo o nada: si alguna fila no es válida no se crea ninguna"""
+        valores, errores = self._validar_clientes([(i, c.dict()) for i, c in enumerate(clientes, 1)])
+        if errores:
+            primero = errores[0]
+            raise ValueError(f"Error al crear cliente {clientes[primero['fila'] - 1].nombre}: {primero['error']}")
+        self._insertar_clientes(valores)
+        dnis = [valor["dni"] for valor in valores]
+        creados = {c.dni: c for c in self.session.exec(select(Cliente).where(Cliente.dni.in_(dnis))).all()}
+        return [creados[dni] for dni in dnis]
+
     def obtener_estadisticas_clientes(self) -> dict:
         """Obtener estadísticas de clientes"""
         with self.session as session:
@@ -0,0 +1,121 @@
+# Adaptadores/adaptadorCupoFragmentoSQL.py
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, case, func, update
+from sqlmodel import Session, delete, select
+
+from Dominio.repositorios.repositorioCupoFragmento import RepositorioCupoFragmento
+from models.clase import Clase
+from models.cupo_fragmento import CupoFragmento, inscritos_activos_total, repartir_capacidad
+from models.inscripcion import Inscripcion, EstadoInscripcion
+
+
+class AdaptadorCupoFragmentoSQL(RepositorioCupoFragmento):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _bloquear(self, clase_id: int) -> Clase:
+        """
+        Bloquear la clase y sus fragmentos: las reservas en curso terminan
+        antes y las nuevas esperan a que se confirme el cambio
+        """
+        clase = self.session.exec(select(Clase).where(Clase.id == clase_id).with_for_update()).first()
+        if clase is None:
+            raise ValueError("Clase no encontrada")
+        self.session.exec(select(CupoFragmento.id).where(CupoFragmento.clase_id == clase_id).with_for_update()).all()
+        return clase
+
+    def _conteos(self, clase_id: int):
+        activos = func.sum(case((Inscripcion.estado == EstadoInscripcion.ACTIVO, 1), else_=0))
+        return self.session.exec(
+            select(Inscripcion.cupo_fragmento, func.coalesce(activos, 0), func.count(Inscripcion.id))
+            .where(Inscripcion.clase_id == clase_id)
+            .group_by(Inscripcion.cupo_fragmento)
+        ).all()
+
+    def fragmentar(self, clase_id: int, fragmentos: int) -> Dict[str, Any]:
+        try:
+            clase = self._bloquear(clase_id)
+            if fragmentos > 1 and not clase.cupo_maximo:
+                raise ValueError("Solo se puede fragmentar el cupo de una clase con cupo máximo")
+
+            # Se parte de cero: todas las inscripciones de la clase se recuentan
+            sin_sincronizar = {"synchronize_session": False}
+            self.session.exec(delete(CupoFragmento).where(CupoFragmento.clase_id == clase_id),
+                              execution_options=sin_sincronizar)
+            asignacion = Inscripcion.id % fragmentos if fragmentos > 1 else None
+            # fetch: las inscripciones ya cargadas en la sesión ven su fragmento nuevo
+            self.session.exec(update(Inscripcion).where(Inscripcion.clase_id == clase_id)
+                              .values(cupo_fragmento=asignacion), execution_options={"synchronize_session": "fetch"})
+
+            conteos = {fragmento: (int(activos), historicos) for fragmento, activos, historicos in self._conteos(clase_id)}
+            if fragmentos > 1:
+                activos = [conteos.get(i, (0, 0))[0] for i in range(fragmentos)]
+                self.session.add_all([
+                    CupoFragmento(clase_id=clase_id, fragmento=i, capacidad=capacidad,
+                                  activos=activos[i], historicos=conteos.get(i, (0, 0))[1])
+                    for i, capacidad in enumerate(repartir_capacidad(clase.cupo_maximo, activos))
+                ])
+                clase.inscritos_activos, clase.inscritos_historicos = 0, 0
+            else:
+                clase.inscritos_activos, clase.inscritos_historicos = conteos.get(None, (0, 0))
+
+            self.session.add(clase)
+            self.session.commit()
+            return {"clase_id": clase_id, "fragmentos": fragmentos if fragmentos > 1 else 0,
+                    "inscritos_activos": self.inscritos_activos(clase_id)}
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def redistribuir(self, clase_id: int) -> bool:
+        try:
+            return self._aplicar_cupo(self._bloquear(clase_id))
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def cambiar_cupo(self, clase_id: int, cupo_maximo: Optional[int]) -> Clase:
+        try:
+            clase = self._bloquear(clase_id)
+            if cupo_maximo is not None and cupo_maximo < self.inscritos_activos(clase_id):
+                raise ValueError("El nuevo cupo no puede ser menor a las inscripciones activas")
+            clase.cupo_maximo = cupo_maximo
+            self.session.add(clase)
+            self._aplicar_cupo(clase)
+            return clase
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _aplicar_cupo(self, clase: Clase) -> bool:
+        """
+        Ajustar los fragmentos al cupo de la clase ya bloqueada y confirmar
+        junto con lo que haya pendiente (el cupo nuevo). False si la clase
+        no tiene el cupo fragmentado.
+        """
+        filas = self.session.exec(
+            select(CupoFragmento.fragmento, CupoFragmento.activos)
+            .where(CupoFragmento.clase_id == clase.id)
+            .order_by(CupoFragmento.fragmento)
+        ).all()
+        if filas and not clase.cupo_maximo:
+            # Sin cupo no hay nada que repartir: vuelve al contador único, en la misma transacción
+            self.fragmentar(clase.id, 0)
+            return True
+        if filas:
+            capacidades = repartir_capacidad(clase.cupo_maximo, [activos for _, activos in filas],
+                                             clase.inscritos_activos)
+            tabla = CupoFragmento.__table__
+            self.session.execute(
+                tabla.update()
+                .where(tabla.c.clase_id == clase.id, tabla.c.fragmento == bindparam("_fragmento"))
+                .values(capacidad=bindparam("_capacidad")),
+                [{"_fragmento": fragmento, "_capacidad": capacidad}
+                 for (fragmento, _), capacidad in zip(filas, capacidades)],
+            )
+        self.session.commit()
+        return bool(filas)
+
+    def inscritos_activos(self, clase_id: int) -> int:
+        return self.session.exec(select(inscritos_activos_total()).where(Clase.id == clase_id)).one()
@@ -1,8 +1,10 @@
 from Dominio.repositorios.repositorioInformacion import RepositorioInformacion
 from models.informacion import Informacion, InformacionStatsResponse, TipoInformacion
 from models.cliente import Cliente
+from sqlalchemy import delete, update
 from sqlmodel import Session, select, func
-from typing import List, Optional
+from typing import Dict, List, Optional
+from Adaptadores.lotes import procesar_en_lotes
 from datetime import datetime, timedelta
 
 class AdaptadorInformacionSQL(RepositorioInformacion):
@@ -174,6 +176,22 @@ class AdaptadorInformacionSQL(RepositorioInformacion):
                 session.refresh(informacion)
             return informacion
 
+    def cambiar_estado_informaciones(self, informacion_ids: List[int], activa: bool) -> Dict[int, Optional[str]]:
+        """Activar/desactivar varias informaciones con un UPDATE por lote"""
+        return procesar_en_lotes(
+            self.session, Informacion.id, informacion_ids,
+            lambda ids: [update(Informacion).where(Informacion.id.in_(ids)).values(activa=activa)],
+            no_encontrado="No encontrada",
+        )
+
+    def eliminar_informaciones(self, informacion_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Eliminar varias informaciones con un DELETE por lote"""
+        return procesar_en_lotes(
+            self.session, Informacion.id, informacion_ids,
+            lambda ids: [delete(Informacion).where(Informacion.id.in_(ids))],
+            no_encontrado="Información no encontrada",
+        )
+
     def obtener_estadisticas_avanzadas(self):
         """Obtener estadísticas avanzadas"""
         informaciones = self.listar_todas_las_informaciones()
@@ -0,0 +1,65 @@
+# Adaptadores/adaptadorInscripcionAsyncSQL.py
+import random
+
+from sqlalchemy import inspect
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.clase import Clase
+from models.inscripcion import Inscripcion, EstadoInscripcion
+from Adaptadores.adaptadorInscripcionSQL import fragmentos_de_clase, reserva_cupo, reserva_cupo_fragmento
+from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+
+
+class AdaptadorInscripcionesAsyncSQL:
+    """Variante asyncio de AdaptadorInscripcionesSQL para los endpoints de mayor tráfico"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def crear_inscripcion(self, inscripcion: Inscripcion) -> Inscripcion:
+        try:
+            self.session.add(inscripcion)
+            await self.session.commit()
+            await self.session.refresh(inscripcion)
+            return inscripcion
+        except Exception as e:
+            await self.session.rollback()
+            print(f"ERROR al crear inscripción: {e}")
+            raise
+
+    async def _reservar_lugar(self, inscripcion: Inscripcion) -> bool:
+        """Mismo protocolo que reservar_lugar (adaptadorInscripcionSQL)"""
+        fragmentos = list((await self.session.exec(fragmentos_de_clase(inscripcion.clase_id))).all())
+        random.shuffle(fragmentos)
+        if not fragmentos:
+            reservado = (await self.session.execute(reserva_cupo(inscripcion.clase_id))).rowcount > 0
+        else:
+            reservado = False
+            for fragmento in fragmentos:
+                if (await self.session.execute(reserva_cupo_fragmento(inscripcion.clase_id, fragmento))).rowcount:
+                    inscripcion.cupo_fragmento = fragmento
+                    reservado = True
+                    break
+        if reservado:
+            inspect(inscripcion).info["ocupacion_contada"] = True
+        return reservado
+
+    async def crear_inscripcion_con_cupo(self, inscripcion: Inscripcion) -> Inscripcion:
+        """Mismo protocolo que AdaptadorInscripcionesSQL.crear_inscripcion_con_cupo"""
+        try:
+            if inscripcion.estado == EstadoInscripcion.ACTIVO:
+                if not await self._reservar_lugar(inscripcion):
+                    cupo_maximo = (await self.session.execute(
+                        select(Clase.cupo_maximo).where(Clase.id == inscripcion.clase_id))).first()
+                    if cupo_maximo is None:
+                        raise ValueError("Clase no encontrada")
+                    raise CupoAgotadoError(inscripcion.clase_id, cupo_maximo[0])
+            elif await self.session.get(Clase, inscripcion.clase_id) is None:
+                raise ValueError("Clase no encontrada")
+            self.session.add(inscripcion)
+            await self.session.commit()
+            await self.session.refresh(inscripcion)
+            return inscripcion
+        except Exception:
+            await self.session.rollback()
+            raise
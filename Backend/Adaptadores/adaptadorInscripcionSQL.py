@@ -1,11 +1,83 @@
 # Adaptadores/adaptadorInscripcionSQL.py
+import random
 from sqlmodel import Session, select, join, func
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from Dominio.repositorios.repositorioInscripciones import RepositorioInscripciones
+from sqlalchemy import Boolean, Integer, String, case, cast, inspect, literal, null, or_, type_coerce, union_all, update
+from typing import List, Optional, Dict, Any, Iterator
+from datetime import datetime, timedelta
+from Dominio.repositorios.repositorioInscripciones import RepositorioInscripciones, CupoAgotadoError
 from models.inscripcion import Inscripcion, InscripcionRead, EstadoInscripcion
 from models.cliente import Cliente
 from models.clase import Clase
+from models.cupo_fragmento import CupoFragmento, inscritos_activos_total
+from Adaptadores.exportacion import columnas_de, iterar_filas
+
+def reserva_cupo(clase_id: int, nueva: bool = True):
+    """
+    UPDATE condicional que ocupa un lugar solo si queda cupo. El motor evalúa
+    la condición sobre la fila bloqueada y con el último valor confirmado,
+    así que dos reservas simultáneas nunca ven el mismo lugar libre. Una
+    reactivación (nueva=False) ya estaba contada en los históricos.
+    """
+    return (
+        update(Clase)
+        .where(
+            Clase.id == clase_id,
+            or_(Clase.cupo_maximo.is_(None), Clase.inscritos_activos < Clase.cupo_maximo)
+        )
+        .values(
+            inscritos_activos=Clase.inscritos_activos + 1,
+            inscritos_historicos=Clase.inscritos_historicos + int(nueva)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reserva_cupo_fragmento(clase_id: int, fragmento: int, nueva: bool = True):
+    """Como reserva_cupo, pero sobre un solo fragmento del cupo de la clase"""
+    return (
+        update(CupoFragmento)
+        .where(
+            CupoFragmento.clase_id == clase_id,
+            CupoFragmento.fragmento == fragmento,
+            CupoFragmento.activos < CupoFragmento.capacidad
+        )
+        .values(activos=CupoFragmento.activos + 1, historicos=CupoFragmento.historicos + int(nueva))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def fragmentos_de_clase(clase_id: int):
+    return select(CupoFragmento.fragmento).where(CupoFragmento.clase_id == clase_id)
+
+
+def reservar_lugar(session: Session, inscripcion: Inscripcion, nueva: bool = True) -> bool:
+    """
+    Ocupar un lugar para la inscripción. Con el cupo fragmentado se prueban
+    los fragmentos en orden aleatorio y solo se rechaza si ninguno tiene
+    lugar, así el límite sigue siendo exacto. Marca la inscripción para que
+    los eventos de alta o de cambio no vuelvan a contarla.
+    """
+    # Sin autoflush: los cambios pendientes de la inscripción se escriben
+    # después, cuando ya lleva la marca de lugar contado
+    with session.no_autoflush:
+        fragmentos = list(session.exec(fragmentos_de_clase(inscripcion.clase_id)).all())
+        # Orden aleatorio: las altas simultáneas se reparten entre las filas
+        random.shuffle(fragmentos)
+        if not fragmentos:
+            reservado = session.execute(reserva_cupo(inscripcion.clase_id, nueva)).rowcount > 0
+            if reservado:
+                inscripcion.cupo_fragmento = None
+        else:
+            reservado = False
+            for fragmento in fragmentos:
+                if session.execute(reserva_cupo_fragmento(inscripcion.clase_id, fragmento, nueva)).rowcount:
+                    inscripcion.cupo_fragmento = fragmento
+                    reservado = True
+                    break
+    if reservado:
+        inspect(inscripcion).info["ocupacion_contada"] = True
+    return reservado
+
 
 class AdaptadorInscripcionesSQL(RepositorioInscripciones):
     def __init__(self, session: Session):
@@ -27,6 +99,45 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
             print(f"ERROR al crear inscripción: {e}")
             raise
 
+    def crear_inscripcion_con_cupo(self, inscripcion: Inscripcion) -> Inscripcion:
+        """Reservar el lugar e insertar la inscripción en la misma transacción"""
+        try:
+            if inscripcion.estado == EstadoInscripcion.ACTIVO:
+                if not reservar_lugar(self.session, inscripcion):
+                    cupo_maximo = self.session.execute(
+                        select(Clase.cupo_maximo).where(Clase.id == inscripcion.clase_id)).first()
+                    if cupo_maximo is None:
+                        raise ValueError("Clase no encontrada")
+                    raise CupoAgotadoError(inscripcion.clase_id, cupo_maximo[0])
+            elif self.session.get(Clase, inscripcion.clase_id) is None:
+                raise ValueError("Clase no encontrada")
+            self.session.add(inscripcion)
+            self.session.commit()
+            self.session.refresh(inscripcion)
+            return inscripcion
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _reservar_si_ocupa_lugar(self, inscripcion: Inscripcion, estado_anterior: EstadoInscripcion,
+                                 clase_anterior: int) -> None:
+        """
+        Si el cambio pasa la inscripción a ACTIVO o la lleva activa a otra
+        clase, ocupar el lugar con el mismo UPDATE condicional que un alta;
+        CupoAgotadoError si no queda. El lugar anterior lo libera el evento.
+        """
+        if inscripcion.estado != EstadoInscripcion.ACTIVO:
+            return
+        cambia_clase = inscripcion.clase_id != clase_anterior
+        if estado_anterior == EstadoInscripcion.ACTIVO and not cambia_clase:
+            return
+        if not reservar_lugar(self.session, inscripcion, nueva=cambia_clase):
+            cupo_maximo = self.session.execute(
+                select(Clase.cupo_maximo).where(Clase.id == inscripcion.clase_id)).first()
+            if cupo_maximo is None:
+                raise ValueError("Clase no encontrada")
+            raise CupoAgotadoError(inscripcion.clase_id, cupo_maximo[0])
+
     def consultar_inscripcion(self, inscripcion_id: int) -> Optional[Inscripcion]:
         """Obtener una inscripción básica por ID"""
         return self.session.get(Inscripcion, inscripcion_id)
@@ -40,15 +151,20 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
                 print(f"DEBUG: Inscripción {inscripcion_id} no encontrada")
                 return None
             
+            estado_anterior, clase_anterior = inscripcion.estado, inscripcion.clase_id
             for key, value in datos_actualizacion.items():
                 if hasattr(inscripcion, key):
                     setattr(inscripcion, key, value)
+            self._reservar_si_ocupa_lugar(inscripcion, estado_anterior, clase_anterior)
             
             self.session.add(inscripcion)
             self.session.commit()
             self.session.refresh(inscripcion)
             print(f"DEBUG: Inscripción {inscripcion_id} actualizada exitosamente")
             return inscripcion
+        except CupoAgotadoError:
+            self.session.rollback()
+            raise
         except Exception as e:
             self.session.rollback()
             print(f"ERROR al actualizar inscripción: {e}")
@@ -59,11 +175,14 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
         try:
             inscripcion = self.session.get(Inscripcion, inscripcion_id)
             if inscripcion:
+                liberaba_lugar = inscripcion.estado == EstadoInscripcion.ACTIVO
                 # Soft delete - marcar como cancelada
                 inscripcion.estado = EstadoInscripcion.CANCELADO
                 inscripcion.fecha_cancelacion = datetime.utcnow()
                 inscripcion.motivo_cancelacion = "Eliminada por administrador"
                 self.session.add(inscripcion)
+                if liberaba_lugar:
+                    self._promover_lista_espera(inscripcion.clase_id)
                 self.session.commit()
                 return True
             return False
@@ -161,15 +280,26 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
 
     # ========== MÉTODOS DE GESTIÓN DE ESTADO ==========
 
+    def _promover_lista_espera(self, clase_id: int) -> Optional[Inscripcion]:
+        """Ocupar el lugar recién liberado con la cabeza de la lista de espera (misma transacción)"""
+        from Adaptadores.adaptadorListaEsperaSQL import AdaptadorListaEsperaSQL
+
+        # El flush descuenta el lugar en el contador antes de reservarlo de nuevo
+        self.session.flush()
+        return AdaptadorListaEsperaSQL(self.session).promover_siguiente(clase_id)
+
     def cancelar_inscripcion(self, inscripcion_id: int, motivo: str) -> bool:
         """Cancelar una inscripción"""
         try:
             inscripcion = self.session.get(Inscripcion, inscripcion_id)
             if inscripcion:
+                liberaba_lugar = inscripcion.estado == EstadoInscripcion.ACTIVO
                 inscripcion.estado = EstadoInscripcion.CANCELADO
                 inscripcion.fecha_cancelacion = datetime.utcnow()
                 inscripcion.motivo_cancelacion = motivo
                 self.session.add(inscripcion)
+                if liberaba_lugar:
+                    self._promover_lista_espera(inscripcion.clase_id)
                 self.session.commit()
                 return True
             return False
@@ -186,11 +316,15 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
                 inscripcion.estado = EstadoInscripcion.ACTIVO
                 inscripcion.fecha_cancelacion = None
                 inscripcion.motivo_cancelacion = None
+                self._reservar_si_ocupa_lugar(inscripcion, EstadoInscripcion.CANCELADO, inscripcion.clase_id)
                 self.session.add(inscripcion)
                 self.session.commit()
                 self.session.refresh(inscripcion)
                 return inscripcion
             return None
+        except CupoAgotadoError:
+            self.session.rollback()
+            raise
         except Exception as e:
             self.session.rollback()
             print(f"ERROR al reactivar inscripción: {e}")
@@ -246,45 +380,115 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
             print(f"ERROR al obtener inscripciones de la clase: {e}")
             return []
 
+    def obtener_clases_cronograma(self, cliente_dni: str) -> List[Dict[str, Any]]:
+        """Clases activas en las que el cliente tiene inscripción activa, con un solo JOIN"""
+        statement = (
+            select(Clase.id, Clase.nombre, Clase.descripcion, Clase.dias_mask, Clase.hora)
+            .join(Inscripcion, Inscripcion.clase_id == Clase.id)
+            .where(
+                Inscripcion.cliente_dni == cliente_dni,
+                Inscripcion.estado == EstadoInscripcion.ACTIVO,
+                Clase.activa == True
+            )
+            .distinct()
+        )
+        return [
+            {"clase_id": clase_id, "nombre": nombre, "descripcion": descripcion,
+             "dias_mask": dias_mask or 0, "hora": hora}
+            for clase_id, nombre, descripcion, dias_mask, hora in self.session.exec(statement).all()
+        ]
+
     # ========== MÉTODOS DE ESTADÍSTICAS ==========
 
-    def obtener_estadisticas(self) -> Dict[str, Any]:
-        """Obtener estadísticas generales de inscripciones"""
+    def obtener_estadisticas(self, dias: int = 30) -> Dict[str, Any]:
+        """Obtener estadísticas de inscripciones por estado, pago, clase y día en una sola consulta"""
+        vacio = {
+            "total_inscripciones": 0,
+            "activas": 0,
+            "canceladas": 0,
+            "completadas": 0,
+            "pendientes": 0,
+            "pagadas": 0,
+            "no_pagadas": 0,
+            "por_clase": [],
+            "por_dia": [],
+        }
         try:
-            total = self.session.exec(select(func.count(Inscripcion.id))).one()
-            activas = self.session.exec(
-                select(func.count(Inscripcion.id))
-                .where(Inscripcion.estado == EstadoInscripcion.ACTIVO)
-            ).one()
-            canceladas = self.session.exec(
-                select(func.count(Inscripcion.id))
-                .where(Inscripcion.estado == EstadoInscripcion.CANCELADO)
-            ).one()
-            completadas = self.session.exec(
-                select(func.count(Inscripcion.id))
-                .where(Inscripcion.estado == EstadoInscripcion.COMPLETADO)
-            ).one()
-            pendientes = self.session.exec(
-                select(func.count(Inscripcion.id))
-                .where(Inscripcion.estado == EstadoInscripcion.PENDIENTE)
-            ).one()
-            
-            return {
-                "total_inscripciones": total,
-                "activas": activas,
-                "canceladas": canceladas,
-                "completadas": completadas,
-                "pendientes": pendientes
-            }
+            filas = self.session.execute(self._query_resumen(dias)).all()
         except Exception as e:
             print(f"ERROR al obtener estadísticas: {e}")
-            return {
-                "total_inscripciones": 0,
-                "activas": 0,
-                "canceladas": 0,
-                "completadas": 0,
-                "pendientes": 0
-            }
+            return vacio
+
+        campo_estado = {
+            EstadoInscripcion.ACTIVO: "activas",
+            EstadoInscripcion.CANCELADO: "canceladas",
+            EstadoInscripcion.COMPLETADO: "completadas",
+            EstadoInscripcion.PENDIENTE: "pendientes",
+        }
+        resultado = vacio
+        for grupo, estado, pagado, clase_id, clase_nombre, dia, cantidad, activas in filas:
+            if grupo == "estado":
+                resultado["total_inscripciones"] += cantidad
+                resultado[campo_estado[EstadoInscripcion(estado)]] += cantidad
+                resultado["pagadas" if pagado else "no_pagadas"] += cantidad
+            elif grupo == "clase":
+                resultado["por_clase"].append({
+                    "clase_id": clase_id,
+                    "clase_nombre": clase_nombre,
+                    "total": cantidad,
+                    "activas": activas or 0,
+                })
+            else:
+                resultado["por_dia"].append({"fecha": str(dia), "total": cantidad, "activas": activas or 0})
+
+        resultado["por_clase"].sort(key=lambda x: x["total"], reverse=True)
+        resultado["por_dia"].sort(key=lambda x: x["fecha"])
+        return resultado
+
+    def _query_resumen(self, dias: int):
+        """
+        Une en un solo UNION ALL los agrupamientos por (estado, pagado), por clase
+        y por día; la columna "grupo" indica a qué agrupamiento pertenece cada fila.
+        """
+        tipo_estado = Inscripcion.__table__.c.estado.type
+        activas = func.sum(case((Inscripcion.estado == EstadoInscripcion.ACTIVO, 1), else_=0))
+        dia = func.date(Inscripcion.fecha_inscripcion)
+        desde = datetime.utcnow() - timedelta(days=dias)
+
+        por_estado = select(
+            literal("estado").label("grupo"),
+            Inscripcion.estado.label("estado"),
+            Inscripcion.pagado.label("pagado"),
+            cast(null(), Integer).label("clase_id"),
+            cast(null(), String).label("clase_nombre"),
+            cast(null(), String).label("dia"),
+            func.count(Inscripcion.id).label("cantidad"),
+            cast(null(), Integer).label("activas"),
+        ).group_by(Inscripcion.estado, Inscripcion.pagado)
+
+        por_clase = select(
+            literal("clase"),
+            type_coerce(null(), tipo_estado),
+            cast(null(), Boolean),
+            Inscripcion.clase_id,
+            Clase.nombre,
+            cast(null(), String),
+            func.count(Inscripcion.id),
+            activas,
+        ).join(Clase, Clase.id == Inscripcion.clase_id).group_by(Inscripcion.clase_id, Clase.nombre)
+
+        por_dia = select(
+            literal("dia"),
+            type_coerce(null(), tipo_estado),
+            cast(null(), Boolean),
+            cast(null(), Integer),
+            cast(null(), String),
+            cast(dia, String),
+            func.count(Inscripcion.id),
+            activas,
+        ).where(Inscripcion.fecha_inscripcion >= desde).group_by(dia)
+
+        return union_all(por_estado, por_clase, por_dia)
 
     # ========== MÉTODOS AUXILIARES ==========
 
@@ -320,47 +524,117 @@ class AdaptadorInscripcionesSQL(RepositorioInscripciones):
 
     # ========== MÉTODOS ADICIONALES PARA REPORTES ==========
 
-    def obtener_clases_populares(self) -> List[dict]:
+    def _filtros_reporte(
+        self,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        estado: Optional[EstadoInscripcion] = None,
+    ) -> list:
+        """Condiciones comunes de los reportes; fecha_fin es exclusiva"""
+        condiciones = []
+        if fecha_inicio:
+            condiciones.append(Inscripcion.fecha_inscripcion >= fecha_inicio)
+        if fecha_fin:
+            condiciones.append(Inscripcion.fecha_inscripcion < fecha_fin)
+        if estado:
+            condiciones.append(Inscripcion.estado == estado)
+        return condiciones
+
+    def exportar_inscripciones(
+        self,
+        estado: Optional[EstadoInscripcion] = None,
+        cliente_dni: Optional[str] = None,
+        clase_id: Optional[int] = None,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Recorrer las inscripciones filtradas con nombres de cliente y clase, sin materializarlas"""
+        condiciones = self._filtros_reporte(fecha_inicio, fecha_fin, estado)
+        if cliente_dni:
+            condiciones.append(Inscripcion.cliente_dni == cliente_dni)
+        if clase_id:
+            condiciones.append(Inscripcion.clase_id == clase_id)
+
+        query = (
+            select(*columnas_de(Inscripcion), Cliente.nombre.label("nombre_cliente"), Clase.nombre.label("clase_nombre"))
+            .select_from(Inscripcion)
+            .outerjoin(Cliente, Inscripcion.cliente_dni == Cliente.dni)
+            .outerjoin(Clase, Inscripcion.clase_id == Clase.id)
+            .where(*condiciones)
+            .order_by(Inscripcion.fecha_inscripcion.desc(), Inscripcion.id.desc())
+        )
+        return iterar_filas(self.session, query)
+
+    def obtener_clases_populares(
+        self,
+        limite: int = 10,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        estado: Optional[EstadoInscripcion] = None,
+    ) -> List[dict]:
         """Obtener clases más populares"""
+        cantidad = func.count(Inscripcion.id)
+        statement = (
+            select(Inscripcion.clase_id, Clase.nombre, cantidad)
+            .join(Clase, Inscripcion.clase_id == Clase.id)
+            .where(*self._filtros_reporte(fecha_inicio, fecha_fin, estado))
+            .group_by(Inscripcion.clase_id, Clase.nombre)
+            .order_by(cantidad.desc(), Inscripcion.clase_id)
+            .limit(limite)
+        )
         try:
-            inscripciones = self.listar_todas_las_inscripciones()
-            clases_count = {}
-            
-            for insc in inscripciones:
-                clase_id = insc.clase_id
-                if clase_id not in clases_count:
-                    clases_count[clase_id] = {
-                        'clase_id': clase_id,
-                        'nombre': insc.clase_nombre,
-                        'cantidad': 0
-                    }
-                clases_count[clase_id]['cantidad'] += 1
-            
-            return sorted(clases_count.values(), key=lambda x: x['cantidad'], reverse=True)[:10]
-        except:
+            return [
+                {'clase_id': clase_id, 'nombre': nombre, 'cantidad': total, 'total_inscripciones': total}
+                for clase_id, nombre, total in self.session.exec(statement).all()
+            ]
+        except Exception as e:
+            print(f"ERROR al obtener clases populares: {e}")
             return []
 
-    def obtener_clientes_activos(self) -> List[dict]:
+    def obtener_clientes_activos(
+        self,
+        limite: int = 10,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        estado: Optional[EstadoInscripcion] = None,
+    ) -> List[dict]:
         """Obtener clientes más activos"""
+        cantidad = func.count(Inscripcion.id)
+        statement = (
+            select(Inscripcion.cliente_dni, Cliente.nombre, cantidad)
+            .join(Cliente, Inscripcion.cliente_dni == Cliente.dni)
+            .where(*self._filtros_reporte(fecha_inicio, fecha_fin, estado))
+            .group_by(Inscripcion.cliente_dni, Cliente.nombre)
+            .order_by(cantidad.desc(), Inscripcion.cliente_dni)
+            .limit(limite)
+        )
         try:
-            inscripciones = self.listar_todas_las_inscripciones()
-            clientes_count = {}
-            
-            for insc in inscripciones:
-                cliente_dni = insc.cliente_dni
-                if cliente_dni not in clientes_count:
-                    clientes_count[cliente_dni] = {
-                        'cliente_dni': cliente_dni,
-                        'nombre': insc.nombre_cliente,
-                        'cantidad': 0
-                    }
-                clientes_count[cliente_dni]['cantidad'] += 1
-            
-            return sorted(clientes_count.values(), key=lambda x: x['cantidad'], reverse=True)[:10]
-        except:
+            return [
+                {'cliente_dni': cliente_dni, 'nombre': nombre, 'cantidad': total, 'total_inscripciones': total}
+                for cliente_dni, nombre, total in self.session.exec(statement).all()
+            ]
+        except Exception as e:
+            print(f"ERROR al obtener clientes activos: {e}")
             return []
 
     def obtener_clases_cupo_critico(self, porcentaje_alerta: int) -> List[dict]:
-        """Obtener clases con cupos críticos"""
-        # Implementación básica - necesitarías más lógica
-        return []
\ No newline at end of file
+        """Obtener clases cuya ocupación activa alcanza el porcentaje indicado"""
+        ocupadas = inscritos_activos_total()
+        statement = (
+            select(Clase.id, Clase.nombre, Clase.instructor, Clase.cupo_maximo, ocupadas)
+            # Comparación entera para no depender de la división de cada motor
+            .where(Clase.cupo_maximo > 0, ocupadas > 0, ocupadas * 100 >= porcentaje_alerta * Clase.cupo_maximo)
+            .order_by((ocupadas * 100.0 / Clase.cupo_maximo).desc(), Clase.id)
+        )
+
+        return [
+            {
+                "clase_id": clase_id,
+                "nombre": nombre,
+                "instructor": instructor,
+                "cupo_maximo": cupo_maximo,
+                "ocupadas": cantidad,
+                "porcentaje_ocupacion": round(cantidad / cupo_maximo * 100, 2),
+            }
+            for clase_id, nombre, instructor, cupo_maximo, cantidad in self.session.exec(statement).all()
+        ]
\ No newline at end of file
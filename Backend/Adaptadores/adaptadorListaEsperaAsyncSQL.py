@@ -0,0 +1,17 @@
+# Adaptadores/adaptadorListaEsperaAsyncSQL.py
+from typing import Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from Adaptadores.adaptadorListaEsperaSQL import consulta_posicion
+
+
+class AdaptadorListaEsperaAsyncSQL:
+    """Consulta de posición en asyncio: es lo que los clientes repiten mientras esperan"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def consultar_posicion(self, clase_id: int, cliente_dni: str) -> Optional[int]:
+        posicion = (await self.session.exec(consulta_posicion(clase_id, cliente_dni))).one()
+        return posicion or None
@@ -0,0 +1,122 @@
+# Adaptadores/adaptadorListaEsperaSQL.py
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, delete, select
+
+from Adaptadores.adaptadorInscripcionSQL import reservar_lugar
+from Dominio.repositorios.repositorioListaEspera import RepositorioListaEspera
+from models.clase import Clase
+from models.cupo_fragmento import inscritos_activos_total
+from models.cliente import Cliente
+from models.inscripcion import Inscripcion, EstadoInscripcion
+from models.lista_espera import ListaEspera
+
+# Reintentos de anotar cuando dos altas simultáneas toman la misma posición
+INTENTOS_ANOTAR = 3
+
+
+def consulta_posicion(clase_id: int, cliente_dni: str):
+    """
+    Posición del cliente en la cola: cuántas entradas de la clase tienen
+    posición menor o igual a la suya. Son dos lecturas sobre el índice
+    (clase_id, posicion), sin bloquear nada; 0 si no está en la cola.
+    """
+    propia = (
+        select(ListaEspera.posicion)
+        .where(ListaEspera.clase_id == clase_id, ListaEspera.cliente_dni == cliente_dni)
+        .scalar_subquery()
+    )
+    return select(func.count()).select_from(ListaEspera).where(
+        ListaEspera.clase_id == clase_id, ListaEspera.posicion <= propia)
+
+
+class AdaptadorListaEsperaSQL(RepositorioListaEspera):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _inscripcion_activa(self, clase_id: int, cliente_dni: str) -> bool:
+        return self.session.exec(
+            select(Inscripcion.id).where(
+                Inscripcion.clase_id == clase_id,
+                Inscripcion.cliente_dni == cliente_dni,
+                Inscripcion.estado == EstadoInscripcion.ACTIVO)
+        ).first() is not None
+
+    def _inscritos_activos(self, clase_id: int) -> int:
+        return self.session.exec(select(inscritos_activos_total()).where(Clase.id == clase_id)).one()
+
+    def anotar(self, clase_id: int, cliente_dni: str) -> ListaEspera:
+        for intento in range(INTENTOS_ANOTAR):
+            clase = self.session.get(Clase, clase_id)
+            if clase is None:
+                raise ValueError("Clase no encontrada")
+            if self.session.exec(select(Cliente.id).where(Cliente.dni == cliente_dni)).first() is None:
+                raise ValueError("Cliente no encontrado")
+            if self._inscripcion_activa(clase_id, cliente_dni):
+                raise ValueError("El cliente ya está inscrito en la clase")
+            if clase.cupo_maximo is None or self._inscritos_activos(clase_id) < clase.cupo_maximo:
+                raise ValueError("La clase tiene cupos disponibles")
+            if self.consultar_posicion(clase_id, cliente_dni) is not None:
+                raise ValueError("El cliente ya está en la lista de espera")
+
+            ultima = self.session.exec(
+                select(func.max(ListaEspera.posicion)).where(ListaEspera.clase_id == clase_id)).one()
+            entrada = ListaEspera(clase_id=clase_id, cliente_dni=cliente_dni, posicion=(ultima or 0) + 1)
+            try:
+                self.session.add(entrada)
+                self.session.commit()
+                self.session.refresh(entrada)
+                return entrada
+            except IntegrityError:
+                # Otra alta tomó la misma posición: se vuelve a leer la cola
+                self.session.rollback()
+                if intento == INTENTOS_ANOTAR - 1:
+                    raise
+            except Exception:
+                self.session.rollback()
+                raise
+
+    def consultar_posicion(self, clase_id: int, cliente_dni: str) -> Optional[int]:
+        posicion = self.session.exec(consulta_posicion(clase_id, cliente_dni)).one()
+        return posicion or None
+
+    def quitar(self, clase_id: int, cliente_dni: str) -> bool:
+        resultado = self.session.exec(
+            delete(ListaEspera).where(ListaEspera.clase_id == clase_id, ListaEspera.cliente_dni == cliente_dni))
+        self.session.commit()
+        return resultado.rowcount > 0
+
+    def promover_siguiente(self, clase_id: int) -> Optional[Inscripcion]:
+        """
+        Pasar la cabeza de la cola a una inscripción activa si la clase tiene
+        lugar. No confirma: se llama dentro de la transacción que liberó el
+        lugar, así la baja y la promoción se ven juntas o no se ven.
+        """
+        while True:
+            cabeza = self.session.exec(
+                select(ListaEspera)
+                .where(ListaEspera.clase_id == clase_id)
+                .order_by(ListaEspera.posicion)
+                .limit(1)
+                .with_for_update()
+            ).first()
+            if cabeza is None:
+                return None
+
+            if self._inscripcion_activa(clase_id, cabeza.cliente_dni):
+                # Se inscribió por su cuenta mientras esperaba
+                self.session.delete(cabeza)
+                self.session.flush()
+                continue
+
+            inscripcion = Inscripcion(cliente_dni=cabeza.cliente_dni, clase_id=clase_id)
+            if not reservar_lugar(self.session, inscripcion):
+                return None
+
+            self.session.delete(cabeza)
+            self.session.add(inscripcion)
+            self.session.flush()
+            print(f"✅ Lista de espera: {cabeza.cliente_dni} promovido a la clase {clase_id}")
+            return inscripcion
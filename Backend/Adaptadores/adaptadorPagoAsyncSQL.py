@@ -0,0 +1,14 @@
+# Adaptadores/adaptadorPagoAsyncSQL.py
+from typing import Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.pago import Pago
+
+
+class AdaptadorPagoAsyncSQL:
+    """Variante asyncio de AdaptadorPagoSQL para los endpoints de mayor tráfico"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def consultar_pago(self, pago_id: int) -> Optional[Pago]:
+        return await self.session.get(Pago, pago_id)
@@ -1,8 +1,13 @@
 from models.pago import Pago, EstadoPago
+from models.transaccion import Transaccion
+from sqlalchemy import delete, or_, update
 from sqlmodel import Session, select, func
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime
 from Dominio.repositorios.repositorioPago import RepositorioPago
+from Adaptadores.paginacion import paginar_keyset, LIMITE_POR_DEFECTO
+from Adaptadores.exportacion import columnas_de, iterar_filas
+from Adaptadores.lotes import en_lotes, procesar_en_lotes
 
 class AdaptadorPagoSQL(RepositorioPago):
     def __init__(self, session: Session):
@@ -14,6 +19,18 @@ class AdaptadorPagoSQL(RepositorioPago):
         self.session.refresh(pago)
         return pago
 
+    def crear_pago_con_transaccion(self, pago: Pago, transaccion: Transaccion) -> Dict[str, int]:
+        """
+        Alta del pago y su transacción en un solo COMMIT. Los ids se leen
+        después del flush: tras el commit leerlos costaría un SELECT más.
+        """
+        pago.transaccion = transaccion
+        self.session.add(pago)
+        self.session.flush()
+        ids = {"pago_id": pago.id, "transaccion_id": transaccion.id}
+        self.session.commit()
+        return ids
+
     def consultar_pago_completo(self, pago_id: int):
         """Obtener pago con información completa"""
         return self.consultar_pago(pago_id)
@@ -48,6 +65,65 @@ class AdaptadorPagoSQL(RepositorioPago):
                 return True
             return False
 
+    def eliminar_pagos_permanentemente(self, pago_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Eliminar varios pagos con un DELETE por lote; los completados no se eliminan"""
+        return procesar_en_lotes(
+            self.session, Pago.id, pago_ids,
+            lambda ids: [delete(Pago).where(Pago.id.in_(ids), Pago.estado_pago != EstadoPago.COMPLETADO)],
+            no_encontrado="Pago no encontrado",
+            columnas=[Pago.estado_pago],
+            motivo_rechazo=lambda fila: "No se puede eliminar un pago completado" if fila[1] == EstadoPago.COMPLETADO else None,
+        )
+
+    def listar_pendientes_vencidos(self, antes_de: datetime, desde: datetime,
+                                   revisados_antes_de: datetime, limite: int) -> List[Dict[str, Any]]:
+        """
+        Pagos pendientes con referencia creados entre `desde` y `antes_de`.
+        Los ya consultados sin cambios vuelven recién cuando su última
+        consulta es anterior a `revisados_antes_de`, y van después de los
+        nunca consultados: los que Mercado Pago no conoce no tapan a los nuevos.
+        """
+        filas = self.session.execute(
+            select(Pago.id, Pago.referencia)
+            .where(Pago.estado_pago == EstadoPago.PENDIENTE,
+                   Pago.fecha_creacion < antes_de,
+                   Pago.fecha_creacion >= desde,
+                   Pago.referencia.is_not(None),
+                   or_(Pago.ultima_conciliacion.is_(None), Pago.ultima_conciliacion < revisados_antes_de))
+            .order_by(Pago.ultima_conciliacion.is_not(None), Pago.ultima_conciliacion, Pago.fecha_creacion)
+            .limit(limite)
+        ).all()
+        return [{"id": fila.id, "referencia": fila.referencia} for fila in filas]
+
+    def marcar_conciliados(self, pago_ids: List[int], momento: datetime) -> None:
+        """Anotar la consulta de los que siguen pendientes, para no repetirla en cada vuelta"""
+        for lote in en_lotes(pago_ids):
+            self.session.execute(
+                update(Pago)
+                .where(Pago.id.in_(lote))
+                .values(ultima_conciliacion=momento)
+                .execution_options(synchronize_session=False)
+            )
+        self.session.commit()
+
+    def aplicar_estados_pendientes(self, cambios: Dict[EstadoPago, List[int]], observaciones: str) -> int:
+        """
+        Un UPDATE por estado destino (y por lote de ids). Solo se tocan los que
+        siguen pendientes: si un webhook los actualizó mientras tanto, gana él.
+        """
+        actualizados = 0
+        ahora = datetime.utcnow()
+        for estado, pago_ids in cambios.items():
+            for lote in en_lotes(pago_ids):
+                actualizados += self.session.execute(
+                    update(Pago)
+                    .where(Pago.id.in_(lote), Pago.estado_pago == EstadoPago.PENDIENTE)
+                    .values(estado_pago=estado, fecha_actualizacion=ahora, observaciones=observaciones)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+        self.session.commit()
+        return actualizados
+
     def cambiar_estado_pago(self, pago_id: int, estado: EstadoPago, observaciones: Optional[str] = None) -> bool:
         pago = self.session.get(Pago, pago_id)
         if not pago:
@@ -128,6 +204,53 @@ class AdaptadorPagoSQL(RepositorioPago):
         
         return list(self.session.exec(query))
 
+    def _query_pagos_filtrada(self,
+                              estado_pago: Optional[EstadoPago] = None,
+                              id_usuario: Optional[str] = None,
+                              transaccion_id: Optional[int] = None,
+                              metodo_pago: Optional[str] = None,
+                              fecha_inicio: Optional[datetime] = None,
+                              fecha_fin: Optional[datetime] = None,
+                              monto_minimo: Optional[float] = None,
+                              monto_maximo: Optional[float] = None):
+        """Construir el SELECT de pagos con todos los filtros como cláusulas WHERE"""
+        query = select(Pago)
+
+        if estado_pago:
+            query = query.where(Pago.estado_pago == estado_pago)
+        if id_usuario:
+            query = query.where(Pago.id_usuario == id_usuario)
+        if transaccion_id:
+            query = query.where(Pago.transaccion_id == transaccion_id)
+        if metodo_pago:
+            query = query.where(Pago.metodo_pago == metodo_pago)
+        if fecha_inicio:
+            query = query.where(Pago.fecha_creacion >= fecha_inicio)
+        if fecha_fin:
+            # fecha_fin es exclusiva
+            query = query.where(Pago.fecha_creacion < fecha_fin)
+        if monto_minimo is not None:
+            query = query.where(Pago.monto >= monto_minimo)
+        if monto_maximo is not None:
+            query = query.where(Pago.monto <= monto_maximo)
+
+        return query
+
+    def listar_pagos_paginados(self,
+                               limit: int = LIMITE_POR_DEFECTO,
+                               cursor: Optional[str] = None,
+                               **filtros) -> Dict[str, Any]:
+        """Listar pagos filtrados en SQL, paginados por (fecha_creacion, id)"""
+        query = self._query_pagos_filtrada(**filtros)
+        return paginar_keyset(self.session, query, Pago.fecha_creacion, Pago.id, limit, cursor)
+
+    def exportar_pagos(self, **filtros) -> Iterator[Dict[str, Any]]:
+        """Recorrer los pagos filtrados como filas planas, sin materializar el resultado"""
+        query = (self._query_pagos_filtrada(**filtros)
+                 .with_only_columns(*columnas_de(Pago))
+                 .order_by(Pago.fecha_creacion.desc(), Pago.id.desc()))
+        return iterar_filas(self.session, query)
+
     def obtener_pagos_usuario(self, usuario_dni: str) -> List[Pago]:
         query = select(Pago).where(Pago.id_usuario == usuario_dni).order_by(Pago.fecha_creacion.desc())
         return list(self.session.exec(query))
@@ -136,19 +259,26 @@ class AdaptadorPagoSQL(RepositorioPago):
         query = select(Pago).where(Pago.transaccion_id == transaccion_id).order_by(Pago.fecha_creacion.desc())
         return list(self.session.exec(query))
 
+    def _resumen_por_estado(self) -> Dict[EstadoPago, tuple]:
+        """Cantidad y monto de pagos por estado en una sola consulta agrupada"""
+        statement = (select(Pago.estado_pago, func.count(Pago.id), func.coalesce(func.sum(Pago.monto), 0.0))
+                     .group_by(Pago.estado_pago))
+        return {estado: (cantidad, float(monto)) for estado, cantidad, monto in self.session.exec(statement)}
+
     def obtener_estadisticas_avanzadas(self):
         """Estadísticas avanzadas de pagos"""
-        pagos = self.listar_todos_los_pagos()
+        resumen = self._resumen_por_estado()
+        vacio = (0, 0.0)
         
         return {
-            "total": len(pagos),
-            "pendientes": len([p for p in pagos if p.estado_pago == EstadoPago.PENDIENTE]),
-            "completados": len([p for p in pagos if p.estado_pago == EstadoPago.COMPLETADO]),
-            "rechazados": len([p for p in pagos if p.estado_pago == EstadoPago.RECHAZADO]),
-            "reembolsados": len([p for p in pagos if p.estado_pago == EstadoPago.REEMBOLSADO]),
-            "monto_total": sum(p.monto for p in pagos),
-            "monto_pendiente": sum(p.monto for p in pagos if p.estado_pago == EstadoPago.PENDIENTE),
-            "monto_completado": sum(p.monto for p in pagos if p.estado_pago == EstadoPago.COMPLETADO)
+            "total": sum(cantidad for cantidad, _ in resumen.values()),
+            "pendientes": resumen.get(EstadoPago.PENDIENTE, vacio)[0],
+            "completados": resumen.get(EstadoPago.COMPLETADO, vacio)[0],
+            "rechazados": resumen.get(EstadoPago.RECHAZADO, vacio)[0],
+            "reembolsados": resumen.get(EstadoPago.REEMBOLSADO, vacio)[0],
+            "monto_total": sum(monto for _, monto in resumen.values()),
+            "monto_pendiente": resumen.get(EstadoPago.PENDIENTE, vacio)[1],
+            "monto_completado": resumen.get(EstadoPago.COMPLETADO, vacio)[1]
         }
 
     # Métodos para cumplir la interfaz RepositorioPago
@@ -159,6 +289,11 @@ class AdaptadorPagoSQL(RepositorioPago):
         statement = select(Pago).where(Pago.referencia == referencia)
         return self.session.exec(statement).first()
 
+    def consultar_pago_por_referencia_mp(self, referencia_mp: str) -> Optional[Pago]:
+        """Pago por la external_reference de Mercado Pago (la que trae el webhook)"""
+        statement = select(Pago).where(Pago.referencia_mp == referencia_mp)
+        return self.session.exec(statement).first()
+
     def eliminar_pago(self, pago_id: int) -> bool:
         return self.eliminar_pago_permanentemente(pago_id)
 
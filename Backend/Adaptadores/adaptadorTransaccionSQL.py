@@ -1,8 +1,12 @@
 from models.transaccion import Transaccion, EstadoPago, MetodoPago
+from sqlalchemy import delete, update
 from sqlmodel import Session, select, func
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime, timedelta
 from Dominio.repositorios.repositorioTransaccion import RepositorioTransaccion
+from Adaptadores.paginacion import paginar_keyset, LIMITE_POR_DEFECTO
+from Adaptadores.exportacion import columnas_de, iterar_filas
+from Adaptadores.lotes import procesar_en_lotes
 
 class AdaptadorTransaccionSQL(RepositorioTransaccion):
     def __init__(self, session: Session):
@@ -81,6 +85,33 @@ class AdaptadorTransaccionSQL(RepositorioTransaccion):
                 return True
             return False
 
+    def eliminar_transacciones_permanentemente(self, transaccion_ids: List[int]) -> Dict[int, Optional[str]]:
+        """
+        Eliminar varias transacciones con un DELETE por lote; las completadas
+        no se eliminan. Pagos e inscripciones quedan sin transacción, como
+        al eliminarlas de a una por el ORM. Las filas se bloquean al
+        consultarlas, y las tres sentencias solo tocan las no completadas.
+        """
+        from models.pago import Pago
+        from models.inscripcion import Inscripcion
+
+        def sentencias(ids):
+            eliminables = select(Transaccion.id).where(
+                Transaccion.id.in_(ids), Transaccion.estado != EstadoPago.COMPLETADO).scalar_subquery()
+            return [
+                update(Pago).where(Pago.transaccion_id.in_(eliminables)).values(transaccion_id=None),
+                update(Inscripcion).where(Inscripcion.transaccion_id.in_(eliminables)).values(transaccion_id=None),
+                delete(Transaccion).where(Transaccion.id.in_(ids), Transaccion.estado != EstadoPago.COMPLETADO),
+            ]
+
+        return procesar_en_lotes(
+            self.session, Transaccion.id, transaccion_ids, sentencias,
+            no_encontrado="Transacción no encontrada",
+            columnas=[Transaccion.estado],
+            motivo_rechazo=lambda fila: "No se puede eliminar una transacción completada" if fila[1] == EstadoPago.COMPLETADO else None,
+            bloquear=True,
+        )
+
     def cambiar_estado_transaccion(self, transaccion_id: int, estado: EstadoPago, observaciones: Optional[str] = None) -> bool:
         transaccion = self.session.get(Transaccion, transaccion_id)
         if not transaccion:
@@ -142,18 +173,69 @@ class AdaptadorTransaccionSQL(RepositorioTransaccion):
         
         return list(self.session.exec(query))
 
+    def _query_transacciones_filtrada(self,
+                                      estado: Optional[EstadoPago] = None,
+                                      cliente_dni: Optional[str] = None,
+                                      metodo_pago: Optional[MetodoPago] = None,
+                                      fecha_inicio: Optional[datetime] = None,
+                                      fecha_fin: Optional[datetime] = None,
+                                      monto_minimo: Optional[float] = None,
+                                      monto_maximo: Optional[float] = None):
+        """Construir el SELECT de transacciones con todos los filtros como cláusulas WHERE"""
+        query = select(Transaccion)
+
+        if estado:
+            query = query.where(Transaccion.estado == estado)
+        if cliente_dni:
+            query = query.where(Transaccion.cliente_dni == cliente_dni)
+        if metodo_pago:
+            query = query.where(Transaccion.metodo_pago == metodo_pago)
+        if fecha_inicio:
+            query = query.where(Transaccion.fecha >= fecha_inicio)
+        if fecha_fin:
+            # fecha_fin es exclusiva
+            query = query.where(Transaccion.fecha < fecha_fin)
+        if monto_minimo is not None:
+            query = query.where(Transaccion.monto >= monto_minimo)
+        if monto_maximo is not None:
+            query = query.where(Transaccion.monto <= monto_maximo)
+
+        return query
+
+    def listar_transacciones_paginadas(self,
+                                       limit: int = LIMITE_POR_DEFECTO,
+                                       cursor: Optional[str] = None,
+                                       **filtros) -> Dict[str, Any]:
+        """Listar transacciones filtradas en SQL, paginadas por (fecha, id)"""
+        query = self._query_transacciones_filtrada(**filtros)
+        return paginar_keyset(self.session, query, Transaccion.fecha, Transaccion.id, limit, cursor)
+
+    def exportar_transacciones(self, **filtros) -> Iterator[Dict[str, Any]]:
+        """Recorrer las transacciones filtradas como filas planas, sin materializar el resultado"""
+        query = (self._query_transacciones_filtrada(**filtros)
+                 .with_only_columns(*columnas_de(Transaccion))
+                 .order_by(Transaccion.fecha.desc(), Transaccion.id.desc()))
+        return iterar_filas(self.session, query)
+
+    def _resumen_por_estado(self) -> Dict[EstadoPago, tuple]:
+        """Cantidad y monto de transacciones por estado en una sola consulta agrupada"""
+        statement = (select(Transaccion.estado, func.count(Transaccion.id), func.coalesce(func.sum(Transaccion.monto), 0.0))
+                     .group_by(Transaccion.estado))
+        return {estado: (cantidad, float(monto)) for estado, cantidad, monto in self.session.exec(statement)}
+
     def obtener_estadisticas_avanzadas(self):
         """Estadísticas avanzadas de transacciones"""
-        transacciones = self.listar_todas_las_transacciones()
+        resumen = self._resumen_por_estado()
+        vacio = (0, 0.0)
         
         return {
-            "total": len(transacciones),
-            "pendientes": len([t for t in transacciones if t.estado == EstadoPago.PENDIENTE]),
-            "completadas": len([t for t in transacciones if t.estado == EstadoPago.COMPLETADO]),
-            "rechazadas": len([t for t in transacciones if t.estado == EstadoPago.RECHAZADO]),
-            "monto_total": sum(t.monto for t in transacciones),
-            "monto_pendiente": sum(t.monto for t in transacciones if t.estado == EstadoPago.PENDIENTE),
-            "monto_completado": sum(t.monto for t in transacciones if t.estado == EstadoPago.COMPLETADO)
+            "total": sum(cantidad for cantidad, _ in resumen.values()),
+            "pendientes": resumen.get(EstadoPago.PENDIENTE, vacio)[0],
+            "completadas": resumen.get(EstadoPago.COMPLETADO, vacio)[0],
+            "rechazadas": resumen.get(EstadoPago.RECHAZADO, vacio)[0],
+            "monto_total": sum(monto for _, monto in resumen.values()),
+            "monto_pendiente": resumen.get(EstadoPago.PENDIENTE, vacio)[1],
+            "monto_completado": resumen.get(EstadoPago.COMPLETADO, vacio)[1]
         }
 
     def generar_reporte_diario(self, fecha: datetime):
@@ -271,14 +353,14 @@ class AdaptadorTransaccionSQL(RepositorioTransaccion):
         return self.eliminar_transaccion_permanentemente(transaccion_id)
 
     def obtener_estadisticas_metodos_pago(self) -> List[Dict[str, Any]]:
-        transacciones = self.listar_todas_las_transacciones()
-        agrupado = self._agrupar_por_metodo_pago(transacciones)
+        statement = (select(Transaccion.metodo_pago, func.count(Transaccion.id), func.coalesce(func.sum(Transaccion.monto), 0.0))
+                     .group_by(Transaccion.metodo_pago))
         resultado = []
-        for metodo, datos in agrupado.items():
+        for metodo, cantidad, monto_total in self.session.exec(statement):
             resultado.append({
                 "metodo": metodo,
-                "count": datos["count"],
-                "monto_total": datos["monto_total"]
+                "count": cantidad,
+                "monto_total": float(monto_total)
             })
         return resultado
 
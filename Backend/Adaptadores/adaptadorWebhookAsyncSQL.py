@@ -0,0 +1,23 @@
+# Adaptadores/adaptadorWebhookAsyncSQL.py
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from Adaptadores.adaptadorWebhookSQL import sentencia_alta, sentencia_reenvio
+
+
+class AdaptadorWebhookAsyncSQL:
+    """Alta en la bandeja desde el webhook sin bloquear el event loop"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def registrar(self, tipo: str, recurso_id: str) -> bool:
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(sentencia_alta(tipo, recurso_id))
+            nueva = True
+        except IntegrityError:
+            await self.session.execute(sentencia_reenvio(tipo, recurso_id))
+            nueva = False
+        await self.session.commit()
+        return nueva
@@ -0,0 +1,117 @@
+# Adaptadores/adaptadorWebhookSQL.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from Dominio.repositorios.repositorioWebhook import RepositorioWebhook
+from models.webhook_entrada import EstadoWebhook, WebhookEntrada
+
+
+def sentencia_alta(tipo: str, recurso_id: str):
+    return insert(WebhookEntrada).values(tipo=tipo, recurso_id=recurso_id, estado=EstadoWebhook.PENDIENTE,
+                                         notificaciones=1, intentos=0, proximo_intento=datetime.utcnow(),
+                                         recibida=datetime.utcnow())
+
+
+def sentencia_reenvio(tipo: str, recurso_id: str):
+    """
+    Fusionar un reenvío en la entrada existente. Si ya estaba cerrada vuelve
+    a pendiente (puede traer un cambio de estado del pago); si está
+    pendiente solo se incrementa notificaciones, así el worker que la tenga
+    reservada sabe que debe repetirla.
+    """
+    cerrada = WebhookEntrada.estado != EstadoWebhook.PENDIENTE
+    ahora = datetime.utcnow()
+    # ordered_values: MySQL aplica el SET de izquierda a derecha, estado va último
+    return (
+        update(WebhookEntrada)
+        .where(WebhookEntrada.tipo == tipo, WebhookEntrada.recurso_id == recurso_id)
+        .ordered_values(
+            (WebhookEntrada.notificaciones, WebhookEntrada.notificaciones + 1),
+            (WebhookEntrada.intentos, case((cerrada, 0), else_=WebhookEntrada.intentos)),
+            (WebhookEntrada.proximo_intento, case((cerrada, ahora), else_=WebhookEntrada.proximo_intento)),
+            (WebhookEntrada.recibida, case((cerrada, ahora), else_=WebhookEntrada.recibida)),
+            (WebhookEntrada.estado, EstadoWebhook.PENDIENTE),
+        )
+    )
+
+
+class AdaptadorWebhookSQL(RepositorioWebhook):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def registrar(self, tipo: str, recurso_id: str) -> bool:
+        try:
+            # SAVEPOINT: el choque con la clave única no descarta el resto de la transacción
+            with self.session.begin_nested():
+                self.session.execute(sentencia_alta(tipo, recurso_id))
+            nueva = True
+        except IntegrityError:
+            self.session.execute(sentencia_reenvio(tipo, recurso_id))
+            nueva = False
+        self.session.commit()
+        return nueva
+
+    def tomar_pendientes(self, limite: int, reserva_segundos: float) -> List[Dict[str, Any]]:
+        ahora = datetime.utcnow()
+        # SKIP LOCKED: varios procesos toman lotes distintos sin esperarse (SQLite lo ignora)
+        entradas = self.session.exec(
+            select(WebhookEntrada)
+            .where(WebhookEntrada.estado == EstadoWebhook.PENDIENTE, WebhookEntrada.proximo_intento <= ahora)
+            .order_by(WebhookEntrada.proximo_intento)
+            .limit(limite)
+            .with_for_update(skip_locked=True)
+        ).all()
+        tomadas = []
+        for entrada in entradas:
+            # La reserva vence sola si el worker se cae a mitad de camino
+            entrada.proximo_intento = ahora + timedelta(seconds=reserva_segundos)
+            tomadas.append({"id": entrada.id, "tipo": entrada.tipo, "recurso_id": entrada.recurso_id,
+                            "notificaciones": entrada.notificaciones, "intentos": entrada.intentos,
+                            "recibida": entrada.recibida})
+        self.session.commit()
+        return tomadas
+
+    def _cerrar(self, entrada: Dict[str, Any], **valores) -> bool:
+        """Aplicar el resultado si no llegó otro reenvío; si llegó, liberar la reserva para repetirla"""
+        aplicado = self.session.execute(
+            update(WebhookEntrada)
+            .where(WebhookEntrada.id == entrada["id"], WebhookEntrada.notificaciones == entrada["notificaciones"])
+            .values(**valores)
+        ).rowcount
+        if not aplicado:
+            self.session.execute(
+                update(WebhookEntrada).where(WebhookEntrada.id == entrada["id"])
+                .values(proximo_intento=datetime.utcnow(), intentos=0)
+            )
+        self.session.commit()
+        return bool(aplicado)
+
+    def marcar_procesada(self, entrada: Dict[str, Any]) -> bool:
+        return self._cerrar(entrada, estado=EstadoWebhook.PROCESADA, procesada=datetime.utcnow(), ultimo_error=None)
+
+    def registrar_fallo(self, entrada: Dict[str, Any], error: str, max_intentos: int, espera_segundos: float) -> bool:
+        intentos = entrada["intentos"] + 1
+        valores = {"intentos": intentos, "ultimo_error": error[:500]}
+        if intentos >= max_intentos:
+            valores["estado"] = EstadoWebhook.FALLIDA
+        else:
+            valores["proximo_intento"] = datetime.utcnow() + timedelta(seconds=espera_segundos)
+        return self._cerrar(entrada, **valores)
+
+    def resumen(self) -> Dict[str, Any]:
+        """Entradas por estado y antigüedad de la pendiente más vieja (retraso de la cola)"""
+        por_estado = dict(self.session.execute(
+            select(WebhookEntrada.estado, func.count()).group_by(WebhookEntrada.estado)).all())
+        mas_vieja = self.session.execute(
+            select(func.min(WebhookEntrada.recibida)).where(WebhookEntrada.estado == EstadoWebhook.PENDIENTE)
+        ).scalar()
+        return {
+            "pendientes": por_estado.get(EstadoWebhook.PENDIENTE, 0),
+            "procesadas": por_estado.get(EstadoWebhook.PROCESADA, 0),
+            "fallidas": por_estado.get(EstadoWebhook.FALLIDA, 0),
+            "retraso_segundos": round((datetime.utcnow() - mas_vieja).total_seconds(), 3) if mas_vieja else 0.0,
+        }
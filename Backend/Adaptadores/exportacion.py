@@ -0,0 +1,23 @@
+# Adaptadores/exportacion.py
+from typing import Any, Dict, Iterator
+from sqlmodel import Session
+
+TAMANIO_LOTE = 1000
+
+
+def columnas_de(modelo, excluir: tuple = ()) -> list:
+    """Columnas de la tabla de un modelo, para seleccionar filas planas en vez de entidades"""
+    return [columna for columna in modelo.__table__.c if columna.key not in excluir]
+
+
+def iterar_filas(session: Session, query, tamanio_lote: int = TAMANIO_LOTE) -> Iterator[Dict[str, Any]]:
+    """
+    Recorrer una consulta de columnas con un cursor del lado del servidor
+    (yield_per), de a tamanio_lote filas y sin construir objetos ORM.
+    """
+    resultado = session.execute(query.execution_options(yield_per=tamanio_lote))
+    try:
+        for fila in resultado:
+            yield dict(fila._mapping)
+    finally:
+        resultado.close()
@@ -0,0 +1,60 @@
+# Adaptadores/lotes.py
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from sqlmodel import Session, select
+
+# Ids por transacción en las operaciones masivas
+TAMANIO_LOTE = 500
+
+
+def en_lotes(ids: Iterable[int], tamanio_lote: int = TAMANIO_LOTE) -> Iterator[List[int]]:
+    """Ids sin repetir, en el orden pedido, de a tamanio_lote"""
+    unicos = list(dict.fromkeys(ids))
+    for inicio in range(0, len(unicos), tamanio_lote):
+        yield unicos[inicio:inicio + tamanio_lote]
+
+
+def procesar_en_lotes(
+    session: Session,
+    columna_id,
+    ids: Iterable[int],
+    sentencias: Callable[[List[int]], Sequence],
+    no_encontrado: str,
+    columnas: Sequence = (),
+    motivo_rechazo: Optional[Callable] = None,
+    tamanio_lote: Optional[int] = None,
+    bloquear: bool = False,
+) -> Dict[int, Optional[str]]:
+    """
+    Aplicar un UPDATE/DELETE por conjunto en vez de fila por fila. Por cada
+    lote: una consulta trae los ids existentes (y `columnas` para decidir
+    rechazos), se ejecutan `sentencias(ids_validos)` y se confirma. Devuelve
+    id -> None si se aplicó, o el motivo por el que no. Con `bloquear` la
+    consulta toma las filas FOR UPDATE: lo que decidió `motivo_rechazo` no
+    cambia hasta el COMMIT.
+    """
+    resultados: Dict[int, Optional[str]] = {}
+    for lote in en_lotes(ids, tamanio_lote or TAMANIO_LOTE):
+        validos = []
+        consulta = select(columna_id, *columnas).where(columna_id.in_(lote))
+        if bloquear:
+            consulta = consulta.with_for_update()
+        for fila in session.execute(consulta).all():
+            motivo = motivo_rechazo(fila) if motivo_rechazo else None
+            resultados[fila[0]] = motivo
+            if motivo is None:
+                validos.append(fila[0])
+        for id_ in lote:
+            resultados.setdefault(id_, no_encontrado)
+
+        try:
+            if validos:
+                for sentencia in sentencias(validos):
+                    session.execute(sentencia.execution_options(synchronize_session=False))
+            session.commit()
+        except Exception as e:
+            # Falla el lote completo: los demás lotes siguen
+            session.rollback()
+            print(f"❌ Error aplicando lote de {len(validos)} ids: {e}")
+            for id_ in validos:
+                resultados[id_] = str(e)
+    return resultados
@@ -0,0 +1,53 @@
+# Adaptadores/paginacion.py
+import base64
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlmodel import Session
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 500
+
+
+def codificar_cursor(fecha: datetime, registro_id: int) -> str:
+    """Codificar la posición (fecha, id) de la última fila entregada"""
+    crudo = f"{fecha.isoformat()}|{registro_id}"
+    return base64.urlsafe_b64encode(crudo.encode()).decode()
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodificar un cursor generado por codificar_cursor"""
+    try:
+        crudo = base64.urlsafe_b64decode(cursor.encode()).decode()
+        fecha, registro_id = crudo.split("|")
+        return datetime.fromisoformat(fecha), int(registro_id)
+    except Exception:
+        raise ValueError("Cursor de paginación inválido")
+
+
+def paginar_keyset(session: Session, query, columna_fecha, columna_id,
+                   limit: int = LIMITE_POR_DEFECTO, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Paginar una consulta por (fecha, id) descendente sin OFFSET.
+    Se pide una fila extra para saber si existe una página siguiente.
+    """
+    limit = max(1, min(limit, LIMITE_MAXIMO))
+
+    if cursor:
+        fecha, registro_id = decodificar_cursor(cursor)
+        query = query.where(or_(
+            columna_fecha < fecha,
+            and_(columna_fecha == fecha, columna_id < registro_id)
+        ))
+
+    query = query.order_by(columna_fecha.desc(), columna_id.desc()).limit(limit + 1)
+    filas = session.exec(query).all()
+
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+    siguiente = None
+    if hay_mas:
+        ultima = filas[-1]
+        siguiente = codificar_cursor(getattr(ultima, columna_fecha.key), getattr(ultima, columna_id.key))
+
+    return {"items": filas, "next_cursor": siguiente}
@@ -2,12 +2,13 @@
 from typing import Dict, Any
 from sqlmodel import Session
 from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
 from models.clase import Clase, ClaseCreate
 
 class CrearClaseCase:
     def __init__(self, session: Session):
         self.session = session
-        self.repositorio_clases = AdaptadorClaseSQL(session)
+        self.repositorio_clases = AdaptadorClaseCache(AdaptadorClaseSQL(session))
     
     def ejecutar(self, datos_clase: Dict[str, Any]) -> Clase:
         # Validaciones de negocio
@@ -1,12 +1,14 @@
 # Casos_de_uso/eliminar_clase.py
 from sqlmodel import Session
 from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
+from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
 
 
 class EliminarClaseCase:
     def __init__(self, session: Session):
         self.session = session
-        self.repositorio_clases = AdaptadorClaseSQL(session)
+        self.repositorio_clases = AdaptadorClaseCache(AdaptadorClaseSQL(session))
     
     def ejecutar(self, clase_id: int) -> bool:
         clase = self.repositorio_clases.consultar_clase(clase_id)
@@ -14,8 +16,7 @@ class EliminarClaseCase:
             raise ValueError("Clase no encontrada")
         
         # Validar que no tenga inscripciones activas
-        inscripciones_activas = self.repositorio_clases.obtener_inscripciones_activas(clase_id)
-        if inscripciones_activas:
+        if AdaptadorCupoFragmentoSQL(self.session).inscritos_activos(clase_id):
             raise ValueError("No se puede eliminar una clase con inscripciones activas")
         
         return self.repositorio_clases.eliminar_clase(clase_id)
\ No newline at end of file
@@ -2,23 +2,35 @@
 from typing import Any, Dict
 from sqlmodel import Session
 from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
+from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
+from Adaptadores.adaptadorListaEsperaSQL import AdaptadorListaEsperaSQL
 from models.clase import Clase
 
 
 class ModificarClaseCase:
     def __init__(self, session: Session):
         self.session = session
-        self.repositorio_clases = AdaptadorClaseSQL(session)
+        self.repositorio_clases = AdaptadorClaseCache(AdaptadorClaseSQL(session))
+        self.cupos = AdaptadorCupoFragmentoSQL(session)
     
     def ejecutar(self, clase_id: int, datos_actualizacion: Dict[str, Any]) -> Clase:
         clase = self.repositorio_clases.consultar_clase(clase_id)
         if not clase:
             raise ValueError("Clase no encontrada")
         
-        # Validar que no se modifiquen clases con inscripciones activas
-        if datos_actualizacion.get('cupo_maximo'):
-            inscripciones_activas = self.repositorio_clases.obtener_inscripciones_activas(clase_id)
-            if datos_actualizacion['cupo_maximo'] < len(inscripciones_activas):
-                raise ValueError("El nuevo cupo no puede ser menor a las inscripciones activas")
+        datos = dict(datos_actualizacion)
+        if 'cupo_maximo' in datos:
+            # Cupo y fragmentos cambian en la misma transacción, con la clase y
+            # sus fragmentos bloqueados: ninguna reserva ve los fragmentos viejos
+            # con el cupo nuevo. Valida contra las inscripciones activas.
+            self.cupos.cambiar_cupo(clase_id, datos.pop('cupo_maximo'))
+            # Los lugares que abre un cupo mayor son primero de la lista de espera
+            lista_espera = AdaptadorListaEsperaSQL(self.session)
+            while lista_espera.promover_siguiente(clase_id):
+                pass
+            self.session.commit()
         
-        return self.repositorio_clases.actualizar_clase(clase_id, datos_actualizacion)
\ No newline at end of file
+        if datos:
+            return self.repositorio_clases.actualizar_clase(clase_id, datos)
+        return self.repositorio_clases.consultar_clase(clase_id)
@@ -2,8 +2,10 @@
 from sqlmodel import Session, select
 from models.inscripcion import Inscripcion
 from models.cliente import Cliente
-from models.clase import Clase
+from sqlmodel.ext.asyncio.session import AsyncSession
 from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+from Adaptadores.adaptadorInscripcionAsyncSQL import AdaptadorInscripcionesAsyncSQL
+from Adaptadores.adaptadorClienteAsyncSQL import AdaptadorClienteAsyncSQL
 
 class CrearInscripcionAdminCase:
     def __init__(self, session: Session):
@@ -16,10 +18,23 @@ class CrearInscripcionAdminCase:
         if not cliente:
             raise ValueError("Cliente no encontrado")
         
-        clase = self.session.get(Clase, inscripcion_data['clase_id'])
-        if not clase:
-            raise ValueError("Clase no encontrada")
-        
-        # Crear la inscripción
+        # La existencia de la clase y el cupo se validan con la clase bloqueada
+        db_inscripcion = Inscripcion(**inscripcion_data)
+        return self.repositorio.crear_inscripcion_con_cupo(db_inscripcion)
+
+
+class CrearInscripcionAdminAsyncCase:
+    """Misma validación que CrearInscripcionAdminCase, sobre una AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repositorio = AdaptadorInscripcionesAsyncSQL(session)
+        self.clientes = AdaptadorClienteAsyncSQL(session)
+
+    async def ejecutar(self, inscripcion_data: dict) -> Inscripcion:
+        if not await self.clientes.consultar_usuario(inscripcion_data['cliente_dni']):
+            raise ValueError("Cliente no encontrado")
+
         db_inscripcion = Inscripcion(**inscripcion_data)
-        return self.repositorio.crear_inscripcion(db_inscripcion)
\ No newline at end of file
+        return await self.repositorio.crear_inscripcion_con_cupo(db_inscripcion)
+
@@ -1,23 +1,30 @@
 # Casos_de_uso/Pagos/procesar_pago_mercadopago.py
-from typing import Dict, Any
-from sqlmodel import Session, select
+from typing import Dict, Any, Optional
+from sqlmodel import Session
 from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
-from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
 from servicios.mercado_pago import MercadoPagoService
 from models.pago import Pago, EstadoPago
 from models.transaccion import Transaccion, MetodoPago
-from datetime import datetime
 import uuid
 
 class ProcesarPagoMercadoPagoCase:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, mercado_pago_service: Optional[MercadoPagoService] = None):
         self.session = session
         self.repositorio_pagos = AdaptadorPagoSQL(session)
-        self.repositorio_transacciones = AdaptadorTransaccionSQL(session)
-        self.mercado_pago_service = MercadoPagoService()
+        self.mercado_pago_service = mercado_pago_service or MercadoPagoService()
     
     def ejecutar(self, pago_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Ejecutar el proceso completo de pago con Mercado Pago"""
+        """
+        Ejecutar el proceso completo de pago con Mercado Pago.
+
+        Primero se crea la preferencia y después se guardan transacción y
+        pago en un solo COMMIT: si Mercado Pago falla no se toca la base, y
+        no hace falta borrar nada. La referencia del pago se genera acá y es
+        la external_reference; el pago se inserta ya con preference_id y
+        referencia_mp, así que no hay que actualizarlo después.
+        Si el COMMIT falla queda una preferencia sin pago local, que nadie
+        recibe y nadie puede pagar.
+        """
         
         # Validar datos requeridos
         required_fields = ["cliente_dni", "monto", "concepto"]
@@ -26,7 +33,7 @@ class ProcesarPagoMercadoPagoCase:
                 return {"error": f"Campo requerido faltante: {field}"}
         
         try:
-            # 1. Crear transacción
+            # 1. Armar transacción y pago, todavía sin guardar
             transaccion = Transaccion(
                 cliente_dni=pago_data["cliente_dni"],
                 monto=float(pago_data["monto"]),
@@ -34,13 +41,8 @@ class ProcesarPagoMercadoPagoCase:
                 concepto=pago_data["concepto"],
                 referencia=f"TRX-MP-{uuid.uuid4().hex[:8].upper()}"
             )
-            
-            transaccion_creada = self.repositorio_transacciones.crear_transaccion(transaccion)
-            
-            # 2. Crear pago asociado a la transacción
             pago_db = Pago(
                 id_usuario=pago_data["cliente_dni"],
-                transaccion_id=transaccion_creada.id,
                 monto=float(pago_data["monto"]),
                 concepto=pago_data["concepto"],
                 metodo_pago="Mercado Pago",
@@ -48,34 +50,26 @@ class ProcesarPagoMercadoPagoCase:
                 referencia=f"PAGO-MP-{uuid.uuid4().hex[:8].upper()}"
             )
             
-            pago_creado = self.repositorio_pagos.crear_pago(pago_db)
-            
-            # 3. Crear preferencia en Mercado Pago
-            mp_data = {
+            # 2. Crear preferencia en Mercado Pago
+            resultado_mp = self.mercado_pago_service.crear_preferencia_pago({
                 "cliente_dni": pago_data["cliente_dni"],
                 "monto": float(pago_data["monto"]),
                 "concepto": pago_data["concepto"],
-                "pago_id": pago_creado.id
-            }
-            
-            resultado_mp = self.mercado_pago_service.crear_preferencia_pago(mp_data)
+                "referencia": pago_db.referencia
+            })
             
             if "error" in resultado_mp:
-                # Revertir la creación si hay error
-                self.repositorio_pagos.eliminar_pago(pago_creado.id)
-                self.repositorio_transacciones.eliminar_transaccion(transaccion_creada.id)
                 return resultado_mp
             
-            # 4. Actualizar pago con referencia de Mercado Pago
-            self.repositorio_pagos.actualizar_pago(pago_creado.id, {
-                "referencia_mp": resultado_mp["referencia_interna"],
-                "preference_id": resultado_mp["preference_id"]
-            })
+            # 3. Guardar transacción y pago juntos, ya vinculados a la preferencia
+            pago_db.preference_id = resultado_mp["preference_id"]
+            pago_db.referencia_mp = resultado_mp["referencia_interna"]
+            ids = self.repositorio_pagos.crear_pago_con_transaccion(pago_db, transaccion)
             
             return {
                 "success": True,
-                "pago_id": pago_creado.id,
-                "transaccion_id": transaccion_creada.id,
+                "pago_id": ids["pago_id"],
+                "transaccion_id": ids["transaccion_id"],
                 "preference_id": resultado_mp["preference_id"],
                 "init_point": resultado_mp["init_point"],
                 "sandbox_init_point": resultado_mp.get("sandbox_init_point"),
@@ -83,4 +77,5 @@ class ProcesarPagoMercadoPagoCase:
             }
             
         except Exception as e:
-            return {"error": f"Error interno: {str(e)}"}
\ No newline at end of file
+            self.session.rollback()
+            return {"error": f"Error interno: {str(e)}"}
@@ -5,6 +5,24 @@ from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
 from servicios.mercado_pago import MercadoPagoService
 from models.pago import EstadoPago
 
+# Estados de Mercado Pago -> estado del pago local
+ESTADOS_MP = {
+    "pending": EstadoPago.PENDIENTE,
+    "approved": EstadoPago.COMPLETADO,
+    "authorized": EstadoPago.PENDIENTE,
+    "in_process": EstadoPago.PENDIENTE,
+    "in_mediation": EstadoPago.PENDIENTE,
+    "rejected": EstadoPago.RECHAZADO,
+    "cancelled": EstadoPago.CANCELADO,
+    "refunded": EstadoPago.REEMBOLSADO,
+    "charged_back": EstadoPago.REEMBOLSADO
+}
+
+
+def mapear_estado_mp(estado_mp: str) -> EstadoPago:
+    return ESTADOS_MP.get(estado_mp, EstadoPago.PENDIENTE)
+
+
 class VerificarEstadoPagoCase:
     def __init__(self, session: Session):
         self.session = session
@@ -69,16 +87,30 @@ class VerificarEstadoPagoCase:
         except Exception as e:
             return {"error": f"Error al verificar pago: {str(e)}"}
     
-    def _mapear_estado_mp(self, estado_mp: str) -> EstadoPago:
-        mapeo = {
-            "pending": EstadoPago.PENDIENTE,
-            "approved": EstadoPago.COMPLETADO,
-            "authorized": EstadoPago.PENDIENTE,
-            "in_process": EstadoPago.PENDIENTE,
-            "in_mediation": EstadoPago.PENDIENTE,
-            "rejected": EstadoPago.RECHAZADO,
-            "cancelled": EstadoPago.CANCELADO,
-            "refunded": EstadoPago.REEMBOLSADO,
-            "charged_back": EstadoPago.REEMBOLSADO
+    def ejecutar_por_pago_mp(self, payment_id: str) -> Dict[str, Any]:
+        """Actualizar el pago local a partir de un pago notificado por Mercado Pago (webhook)"""
+        payment_info = self.mercado_pago_service.verificar_pago(payment_id)
+        if "error" in payment_info:
+            return payment_info
+
+        referencia = payment_info.get("external_reference") or ""
+        pago = self.repositorio_pagos.consultar_pago_por_referencia(referencia)
+        if not pago:
+            return {"error": f"No hay pago local con referencia {referencia!r}"}
+
+        # La columna se lee como texto: se normaliza al enum
+        estado_anterior = EstadoPago(pago.estado_pago)
+        estado_mapeado = self._mapear_estado_mp(payment_info["status"])
+        if estado_anterior != estado_mapeado:
+            observaciones = f"Actualizado desde Mercado Pago: {payment_info['status']} - {payment_info.get('status_detail', '')}"
+            self.repositorio_pagos.cambiar_estado_pago(pago.id, estado_mapeado, observaciones)
+
+        return {
+            "success": True,
+            "pago_id": pago.id,
+            "estado_anterior": estado_anterior.value,
+            "estado_actual": estado_mapeado.value
         }
-        return mapeo.get(estado_mp, EstadoPago.PENDIENTE)
\ No newline at end of file
+
+    def _mapear_estado_mp(self, estado_mp: str) -> EstadoPago:
+        return mapear_estado_mp(estado_mp)
@@ -1,7 +1,9 @@
 # Casos_de_uso/Usuarios/iniciar_sesion.py
 from sqlmodel import Session
 from models.cliente import Cliente
+from sqlmodel.ext.asyncio.session import AsyncSession
 from Adaptadores.adaptadorClienteSQL import AdaptadorClienteSQL
+from Adaptadores.adaptadorClienteAsyncSQL import AdaptadorClienteAsyncSQL
 
 class IniciarSesionCase:
     def __init__(self, session: Session):
@@ -19,6 +21,24 @@ class IniciarSesionCase:
         
         return cliente
 
+class IniciarSesionAsyncCase:
+    """Misma regla que IniciarSesionCase, sobre una AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repositorio = AdaptadorClienteAsyncSQL(session)
+
+    async def ejecutar(self, correo: str, password: str) -> Cliente:
+        cliente = await self.repositorio.iniciar_sesion(correo, password)
+
+        if not cliente:
+            raise ValueError("Credenciales inválidas")
+
+        if not cliente.activo:
+            raise ValueError("Cuenta inactiva")
+
+        return cliente
+
 # Mantener la función existente para compatibilidad
 def iniciar_sesion(correo: str, password: str, repositorio) -> Cliente:
     caso_uso = IniciarSesionCase(repositorio.session)
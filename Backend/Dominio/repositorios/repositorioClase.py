@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from datetime import time
 from models.clase import Clase
 from models.inscripcion import Inscripcion
 
@@ -17,7 +18,9 @@ class RepositorioClase(ABC):
         pass
 
     @abstractmethod
-    def listar_clases(self, activas: bool = True, instructor: Optional[str] = None) -> List[Clase]:
+    def listar_clases(self, activas: bool = True, instructor: Optional[str] = None, horario: Optional[str] = None,
+                      dia_semana: Optional[str] = None,
+                      hora_desde: Optional[time] = None, hora_hasta: Optional[time] = None) -> List[Clase]:
         pass
 
     @abstractmethod
@@ -46,4 +49,8 @@ class RepositorioClase(ABC):
     
     @abstractmethod
     def listar_clases_por_dia_hora(self, dia_semana: str, hora: str) -> List[Clase]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def obtener_estadisticas_clases(self, clase_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        pass
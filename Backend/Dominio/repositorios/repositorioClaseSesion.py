@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from models.clase import Clase
+
+
+class RepositorioClaseSesion(ABC):
+    @abstractmethod
+    def sincronizar_sesiones(self, clases: List[Clase], desde: datetime, hasta: datetime) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def listar_sesiones(self, desde: datetime, hasta: datetime,
+                        clase_id: Optional[int] = None,
+                        instructor: Optional[str] = None) -> List[Dict[str, Any]]:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from models.cliente import Cliente
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from datetime import datetime
+from models.cliente import Cliente, ClienteCreate
 
 class RepositorioCliente(ABC):
     @abstractmethod
@@ -41,4 +42,29 @@ class RepositorioCliente(ABC):
 
     @abstractmethod
     def contar_usuarios(self) -> int:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def exportar_clientes(self,
+                          solo_activos: bool = False,
+                          fecha_registro_inicio: Optional[datetime] = None,
+                          fecha_registro_fin: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def cambiar_estado_usuarios(self, cliente_ids: List[int], activo: bool) -> Dict[int, Optional[str]]:
+        """Activar/desactivar por lotes; id -> None si se aplicó o el motivo si no"""
+        pass
+
+    @abstractmethod
+    def eliminar_usuarios_permanentemente(self, cliente_ids: List[int]) -> Dict[int, Optional[str]]:
+        pass
+
+    @abstractmethod
+    def crear_usuarios(self, clientes: List[ClienteCreate]) -> List[Cliente]:
+        pass
+
+    @abstractmethod
+    def importar_clientes(self, filas: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Importar un lote de filas (número, datos); devuelve creados y errores por fila"""
+        pass
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+
+from models.clase import Clase
+
+
+class RepositorioCupoFragmento(ABC):
+    @abstractmethod
+    def fragmentar(self, clase_id: int, fragmentos: int) -> Dict[str, Any]:
+        """Repartir el cupo de la clase en `fragmentos` filas (0 o 1 vuelve al contador único)"""
+        pass
+
+    @abstractmethod
+    def redistribuir(self, clase_id: int) -> bool:
+        """Recalcular las capacidades después de cambiar el cupo de la clase"""
+        pass
+
+    @abstractmethod
+    def cambiar_cupo(self, clase_id: int, cupo_maximo: Optional[int]) -> Clase:
+        """Fijar el cupo y repartirlo entre los fragmentos en una sola transacción, con todo bloqueado"""
+        pass
+
+    @abstractmethod
+    def inscritos_activos(self, clase_id: int) -> int:
+        pass
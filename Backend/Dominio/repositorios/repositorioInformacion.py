@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from models.informacion import Informacion, InformacionStatsResponse, TipoInformacion
 
@@ -52,6 +52,15 @@ class RepositorioInformacion(ABC):
     def desactivar_informacion(self, informacion_id: int) -> Optional[Informacion]:
         pass
 
+    @abstractmethod
+    def cambiar_estado_informaciones(self, informacion_ids: List[int], activa: bool) -> Dict[int, Optional[str]]:
+        """Activar/desactivar por lotes; id -> None si se aplicó o el motivo si no"""
+        pass
+
+    @abstractmethod
+    def eliminar_informaciones(self, informacion_ids: List[int]) -> Dict[int, Optional[str]]:
+        pass
+
     @abstractmethod
     def obtener_estadisticas(self) -> InformacionStatsResponse:
         pass
\ No newline at end of file
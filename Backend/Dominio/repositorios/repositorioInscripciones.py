@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Iterator
+from datetime import datetime
 from models.inscripcion import Inscripcion, EstadoInscripcion, InscripcionRead
 
+
+class CupoAgotadoError(ValueError):
+    """La clase ya tiene ocupados todos sus lugares"""
+
+    def __init__(self, clase_id: int, cupo_maximo: int):
+        super().__init__("La clase no tiene cupos disponibles")
+        self.clase_id = clase_id
+        self.cupo_maximo = cupo_maximo
+
+
 class RepositorioInscripciones(ABC):
     @abstractmethod
     def crear_inscripcion(self, inscripcion: Inscripcion) -> Inscripcion:
         pass
 
+    @abstractmethod
+    def crear_inscripcion_con_cupo(self, inscripcion: Inscripcion) -> Inscripcion:
+        """Insertar solo si queda lugar; CupoAgotadoError si la clase está llena"""
+        pass
+
     @abstractmethod
     def consultar_inscripcion(self, inscripcion_id: int) -> Optional[Inscripcion]:
         pass
@@ -61,5 +77,44 @@ class RepositorioInscripciones(ABC):
     
 
     @abstractmethod
-    def obtener_estadisticas(self) -> dict:
-        pass
\ No newline at end of file
+    def obtener_estadisticas(self, dias: int = 30) -> dict:
+        pass
+
+    @abstractmethod
+    def obtener_clases_populares(
+        self,
+        limite: int = 10,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        estado: Optional[EstadoInscripcion] = None,
+    ) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def obtener_clientes_activos(
+        self,
+        limite: int = 10,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        estado: Optional[EstadoInscripcion] = None,
+    ) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def obtener_clases_cupo_critico(self, porcentaje_alerta: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def exportar_inscripciones(
+        self,
+        estado: Optional[EstadoInscripcion] = None,
+        cliente_dni: Optional[str] = None,
+        clase_id: Optional[int] = None,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def obtener_clases_cronograma(self, cliente_dni: str) -> List[Dict[str, Any]]:
+        pass
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from models.inscripcion import Inscripcion
+from models.lista_espera import ListaEspera
+
+
+class RepositorioListaEspera(ABC):
+    @abstractmethod
+    def anotar(self, clase_id: int, cliente_dni: str) -> ListaEspera:
+        """Agregar al cliente al final de la cola de una clase llena"""
+        pass
+
+    @abstractmethod
+    def consultar_posicion(self, clase_id: int, cliente_dni: str) -> Optional[int]:
+        """Posición (1 = próximo) o None si el cliente no está en la cola"""
+        pass
+
+    @abstractmethod
+    def quitar(self, clase_id: int, cliente_dni: str) -> bool:
+        pass
+
+    @abstractmethod
+    def promover_siguiente(self, clase_id: int) -> Optional[Inscripcion]:
+        """Inscribir a la cabeza de la cola si hay lugar, sin confirmar la transacción"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from models.pago import Pago, EstadoPago
+from models.transaccion import Transaccion
 from datetime import datetime
 
 class RepositorioPago(ABC):
@@ -8,6 +9,10 @@ class RepositorioPago(ABC):
     def crear_pago(self, pago: Pago) -> Pago:
         pass
 
+    @abstractmethod
+    def crear_pago_con_transaccion(self, pago: Pago, transaccion: Transaccion) -> Dict[str, int]:
+        pass
+
     @abstractmethod
     def consultar_pago(self, pago_id: int) -> Optional[Pago]:
         pass
@@ -16,6 +21,10 @@ class RepositorioPago(ABC):
     def consultar_pago_por_referencia(self, referencia: str) -> Optional[Pago]:
         pass
 
+    @abstractmethod
+    def consultar_pago_por_referencia_mp(self, referencia_mp: str) -> Optional[Pago]:
+        pass
+
     @abstractmethod
     def actualizar_pago(self, pago_id: int, datos_actualizacion: Dict[str, Any]) -> Optional[Pago]:
         pass
@@ -43,6 +52,13 @@ class RepositorioPago(ABC):
                    transaccion_id: Optional[int] = None) -> List[Pago]:
         pass
 
+    @abstractmethod
+    def listar_pagos_paginados(self,
+                               limit: int = 100,
+                               cursor: Optional[str] = None,
+                               **filtros) -> Dict[str, Any]:
+        pass
+
     @abstractmethod
     def obtener_pagos_usuario(self, usuario_dni: str) -> List[Pago]:
         pass
@@ -53,4 +69,26 @@ class RepositorioPago(ABC):
 
     @abstractmethod
     def obtener_estadisticas_totales(self) -> Dict[str, Any]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def exportar_pagos(self, **filtros) -> Iterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def eliminar_pagos_permanentemente(self, pago_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Eliminar por lotes; id -> None si se eliminó o el motivo si no"""
+        pass
+
+    @abstractmethod
+    def listar_pendientes_vencidos(self, antes_de: datetime, desde: datetime,
+                                   revisados_antes_de: datetime, limite: int) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def marcar_conciliados(self, pago_ids: List[int], momento: datetime) -> None:
+        pass
+
+    @abstractmethod
+    def aplicar_estados_pendientes(self, cambios: Dict[EstadoPago, List[int]], observaciones: str) -> int:
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from models.transaccion import Transaccion, EstadoPago, MetodoPago
 from datetime import datetime
 
@@ -49,6 +49,13 @@ class RepositorioTransaccion(ABC):
                            fecha_fin: Optional[datetime] = None) -> List[Transaccion]:
         pass
 
+    @abstractmethod
+    def listar_transacciones_paginadas(self,
+                                       limit: int = 100,
+                                       cursor: Optional[str] = None,
+                                       **filtros) -> Dict[str, Any]:
+        pass
+
     @abstractmethod
     def obtener_estadisticas_totales(self) -> Dict[str, Any]:
         pass
@@ -59,4 +66,13 @@ class RepositorioTransaccion(ABC):
 
     @abstractmethod
     def ver_transacciones_ultimo_mes(self, cliente_dni: str) -> List[Transaccion]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def exportar_transacciones(self, **filtros) -> Iterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def eliminar_transacciones_permanentemente(self, transaccion_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Eliminar por lotes; id -> None si se eliminó o el motivo si no"""
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+class RepositorioWebhook(ABC):
+    @abstractmethod
+    def registrar(self, tipo: str, recurso_id: str) -> bool:
+        """Guardar la notificación en la bandeja; False si fue un reenvío fusionado con otra"""
+        pass
+
+    @abstractmethod
+    def tomar_pendientes(self, limite: int, reserva_segundos: float) -> List[Dict[str, Any]]:
+        """Reservar hasta `limite` entradas cuyo turno llegó, para procesarlas fuera de la transacción"""
+        pass
+
+    @abstractmethod
+    def marcar_procesada(self, entrada: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    def registrar_fallo(self, entrada: Dict[str, Any], error: str, max_intentos: int, espera_segundos: float) -> bool:
+        pass
+
+    @abstractmethod
+    def resumen(self) -> Dict[str, Any]:
+        pass
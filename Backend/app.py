@@ -4,6 +4,7 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from sqlalchemy import text
+import asyncio
 import sys
 import os
 from dotenv import load_dotenv  # ✅ Nuevo import
@@ -17,6 +18,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Lifespan events
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    tarea_sesiones = None
+    tarea_webhooks = None
+    tarea_conciliacion = None
     # Startup - crear tablas
     try:
         from database import engine
@@ -25,6 +29,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         print("🔄 Creando tablas en la base de datos...")
         SQLModel.metadata.create_all(engine)
         print("✅ Tablas creadas exitosamente")
+
+        from migraciones import aplicar_migraciones
+        aplicar_migraciones(engine)
+
+        # Job de fondo que mantiene materializado el horizonte de clase_sesion
+        if os.getenv("SESIONES_AUTOGENERAR", "True").lower() in ("1", "true", "yes"):
+            from servicios.sesiones import tarea_generacion_sesiones
+            tarea_sesiones = asyncio.create_task(tarea_generacion_sesiones(engine))
+
+        # Workers que drenan la bandeja de webhooks de Mercado Pago
+        if os.getenv("WEBHOOKS_WORKERS", "True").lower() in ("1", "true", "yes"):
+            from servicios.webhooks import tarea_procesar_webhooks
+            tarea_webhooks = asyncio.create_task(tarea_procesar_webhooks(engine))
+
+        # Conciliación periódica de pagos que quedaron pendientes
+        if os.getenv("RECONCILIACION_PAGOS", "True").lower() in ("1", "true", "yes"):
+            from servicios.reconciliacion_pagos import tarea_reconciliacion_pagos
+            tarea_conciliacion = asyncio.create_task(tarea_reconciliacion_pagos(engine))
         
         # ✅ Verificar variables de entorno críticas
         required_vars = ["MERCADOPAGO_ACCESS_TOKEN"]
@@ -40,6 +62,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     
     # Shutdown
+    if tarea_sesiones:
+        tarea_sesiones.cancel()
+    if tarea_webhooks:
+        tarea_webhooks.cancel()
+    if tarea_conciliacion:
+        tarea_conciliacion.cancel()
     print("🛑 Apagando aplicación")
 
 # Crear aplicación FastAPI
@@ -65,6 +93,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # IMPORTAR routers reales DESPUÉS de crear la app
@@ -165,6 +194,36 @@ async def health_check():
     except Exception as e:
         return {"status": "ERROR", "database": "disconnected", "error": str(e)}
 
+@app.get("/health/pool")
+async def pool_diagnostics():
+    """Uso del pool de conexiones: checkouts, esperas, timeouts y overflow"""
+    from database import obtener_estado_pool
+    return obtener_estado_pool()
+
+@app.get("/health/cache")
+async def cache_diagnostics():
+    """Aciertos, fallos y expulsiones de la cache del catálogo de clases"""
+    from servicios.cache_clases import cache_clases
+    return cache_clases.estadisticas()
+
+@app.get("/health/mercado-pago")
+async def mercado_pago_diagnostics():
+    """Latencias por operación, reintentos y estado del corta circuitos hacia Mercado Pago"""
+    from servicios.cliente_mercado_pago import obtener_cliente_http
+    return obtener_cliente_http().estadisticas()
+
+@app.get("/health/webhooks")
+async def webhooks_diagnostics():
+    """Bandeja de webhooks: pendientes, retraso de la cola, ritmo y retraso de procesamiento"""
+    from database import engine
+    from servicios.webhooks import metricas_webhooks, resumen_bandeja
+    datos = metricas_webhooks.estadisticas()
+    try:
+        datos.update(await asyncio.to_thread(resumen_bandeja, engine))
+    except Exception as e:
+        datos["error_bandeja"] = str(e)
+    return datos
+
 # ✅ Endpoint para verificar configuración
 @app.get("/config")
 async def show_config():
@@ -0,0 +1,119 @@
+# benchmarks/bench_async.py
+"""
+Prueba de carga del listado de clases: camino sync (def + Session en el
+threadpool de FastAPI) contra camino async (async def + AsyncSession en el
+event loop).
+
+Uso:
+    python benchmarks/bench_async.py [peticiones] [concurrencia] [DATABASE_URL]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal. Con MySQL se necesita
+aiomysql instalado; la URL se da con el driver sync (mysql+pymysql://...).
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlmodel import SQLModel, Session, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import crear_engine, crear_engine_async
+from models.cliente import Cliente  # noqa: F401 - registra las tablas relacionadas
+from models.inscripcion import Inscripcion  # noqa: F401
+from models.transaccion import Transaccion  # noqa: F401
+from models.pago import Pago  # noqa: F401
+from models.clase import Clase
+from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseAsyncSQL import AdaptadorClaseAsyncSQL
+
+CLASES = 50
+
+
+def crear_app(engine, engine_async) -> FastAPI:
+    app = FastAPI()
+
+    def sesion_sync():
+        with Session(engine) as session:
+            yield session
+
+    async def sesion_async():
+        async with AsyncSession(engine_async, expire_on_commit=False) as session:
+            yield session
+
+    @app.get("/sync/clases")
+    def clases_sync(session: Session = Depends(sesion_sync)):
+        return [c.dict() for c in AdaptadorClaseSQL(session).listar_todas_las_clases()]
+
+    @app.get("/async/clases")
+    async def clases_async(session: AsyncSession = Depends(sesion_async)):
+        return [c.dict() for c in await AdaptadorClaseAsyncSQL(session).listar_clases()]
+
+    return app
+
+
+def poblar(engine) -> None:
+    with Session(engine) as session:
+        session.exec(delete(Clase))
+        session.add_all([
+            Clase(nombre=f"Clase {i}", instructor=f"Instructor {i % 12}", hora=f"{8 + i % 12:02d}:00",
+                  dias_semana=["lunes", "miercoles"])
+            for i in range(CLASES)
+        ])
+        session.commit()
+
+
+async def cargar(cliente: httpx.AsyncClient, ruta: str, peticiones: int, concurrencia: int) -> dict:
+    limite = asyncio.Semaphore(concurrencia)
+    latencias = []
+
+    async def una():
+        async with limite:
+            inicio = time.perf_counter()
+            respuesta = await cliente.get(ruta)
+            respuesta.raise_for_status()
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(una() for _ in range(peticiones)))
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "rps": peticiones / total,
+        "p50_ms": latencias[len(latencias) // 2] * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95) - 1] * 1000,
+    }
+
+
+async def main() -> None:
+    peticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[3] if len(sys.argv) > 3 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+
+        engine = crear_engine(url)
+        engine_async = crear_engine_async(url)
+        SQLModel.metadata.create_all(engine)
+        poblar(engine)
+
+        transporte = httpx.ASGITransport(app=crear_app(engine, engine_async))
+        async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+            print(f"{peticiones} peticiones, concurrencia {concurrencia}, {CLASES} clases")
+            print(f"{'camino':>8} {'req/s':>9} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+            for camino in ("sync", "async"):
+                await cargar(cliente, f"/{camino}/clases", min(peticiones, 100), concurrencia)  # calentamiento
+                r = await cargar(cliente, f"/{camino}/clases", peticiones, concurrencia)
+                print(f"{camino:>8} {r['rps']:>9.1f} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f}")
+
+        await engine_async.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+# benchmarks/bench_cache_clases.py
+"""
+Lecturas del catálogo de clases con y sin la cache del repositorio:
+cuenta las consultas que llegan a la base y mide el tiempo por lectura,
+con una escritura (actualizar_clase) cada `cada_escritura` lecturas.
+
+Uso:
+    python benchmarks/bench_cache_clases.py [lecturas] [cada_escritura] [DATABASE_URL]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session
+
+from database import crear_engine
+from models.cliente import Cliente  # noqa: F401 - registra las tablas relacionadas
+from models.inscripcion import Inscripcion  # noqa: F401
+from models.transaccion import Transaccion  # noqa: F401
+from models.pago import Pago  # noqa: F401
+from models.clase import Clase
+from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
+from servicios.cache_clases import CacheCatalogoClases, CacheMemoria
+
+CLASES = 200
+
+
+def correr(engine, repositorio_de, lecturas: int, cada_escritura: int):
+    consultas = {"total": 0}
+
+    def contar(*_):
+        consultas["total"] += 1
+
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        inicio = time.perf_counter()
+        with Session(engine) as session:
+            repositorio = repositorio_de(session)
+            for i in range(lecturas):
+                if cada_escritura and i and i % cada_escritura == 0:
+                    repositorio.actualizar_clase(1, {"descripcion": f"rev {i}"})
+                repositorio.listar_clases(activas=True)
+                session.expunge_all()
+        return time.perf_counter() - inicio, consultas["total"]
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+
+
+def main() -> None:
+    lecturas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cada_escritura = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[3] if len(sys.argv) > 3 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        os.environ.setdefault("SESIONES_HORIZONTE_DIAS", "0")
+
+        engine = crear_engine(url)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all([Clase(nombre=f"Clase {i}", hora=f"{8 + i % 12:02d}:00", instructor=f"Instr {i % 10}",
+                                   dias_semana=["lunes", "jueves"]) for i in range(CLASES)])
+            session.commit()
+
+        cache = CacheCatalogoClases(CacheMemoria())
+        t_sin, q_sin = correr(engine, AdaptadorClaseSQL, lecturas, cada_escritura)
+        t_con, q_con = correr(engine, lambda s: AdaptadorClaseCache(AdaptadorClaseSQL(s), cache), lecturas, cada_escritura)
+
+        print(f"{'':>10} {'consultas':>10} {'ms/lectura':>11}")
+        print(f"{'sin cache':>10} {q_sin:>10} {t_sin * 1000 / lecturas:>11.3f}")
+        print(f"{'con cache':>10} {q_con:>10} {t_con * 1000 / lecturas:>11.3f}")
+        print(cache.estadisticas())
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
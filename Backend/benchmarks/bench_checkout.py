@@ -0,0 +1,136 @@
+# benchmarks/bench_checkout.py
+"""
+Checkout con Mercado Pago: el flujo anterior de ProcesarPagoMercadoPagoCase
+(transacción con COMMIT y REFRESH, pago con COMMIT y REFRESH, preferencia,
+y un UPDATE con COMMIT y REFRESH más para anotar la preferencia) contra el
+actual (preferencia primero y después los dos INSERT en un solo COMMIT).
+
+Uso:
+    python benchmarks/bench_checkout.py [checkouts] [DATABASE_URL] [latencia_mp_ms]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal. Mercado Pago se
+reemplaza por una preferencia armada en el proceso que tarda
+latencia_mp_ms (0 por defecto), así se mide solo el costo en la base.
+Se informan milisegundos por checkout, sentencias y COMMIT por checkout.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, delete
+
+from database import crear_engine
+from models.inscripcion import Inscripcion  # noqa: F401 - registra las tablas relacionadas
+from models.cliente import Cliente
+from models.pago import Pago, EstadoPago
+from models.transaccion import Transaccion, MetodoPago
+from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
+from Casos_de_uso.Pagos.procesar_pago_mercadopago import ProcesarPagoMercadoPagoCase
+
+DNI = "bench-checkout"
+
+
+class MercadoPagoLocal:
+    """Preferencia armada en el proceso, con una demora fija opcional"""
+
+    def __init__(self, latencia_ms: float):
+        self.latencia = latencia_ms / 1000
+
+    def crear_preferencia_pago(self, pago_data: dict) -> dict:
+        time.sleep(self.latencia)
+        return {"preference_id": f"pref-{uuid.uuid4().hex[:8]}", "init_point": "https://mp.test/checkout",
+                "sandbox_init_point": None, "referencia_interna": pago_data["referencia"]}
+
+
+def checkout_anterior(session: Session, servicio: MercadoPagoLocal, datos: dict) -> dict:
+    """El flujo tal como estaba: tres COMMIT, con un REFRESH después de cada uno"""
+    transaccion = AdaptadorTransaccionSQL(session).crear_transaccion(Transaccion(
+        cliente_dni=datos["cliente_dni"], monto=datos["monto"], metodo_pago=MetodoPago.MERCADO_PAGO,
+        concepto=datos["concepto"], referencia=f"TRX-MP-{uuid.uuid4().hex[:8].upper()}"))
+    repositorio = AdaptadorPagoSQL(session)
+    pago = repositorio.crear_pago(Pago(
+        id_usuario=datos["cliente_dni"], transaccion_id=transaccion.id, monto=datos["monto"],
+        concepto=datos["concepto"], metodo_pago="Mercado Pago", estado_pago=EstadoPago.PENDIENTE,
+        referencia=f"PAGO-MP-{uuid.uuid4().hex[:8].upper()}"))
+    resultado = servicio.crear_preferencia_pago({"referencia": pago.referencia})
+    repositorio.actualizar_pago(pago.id, {"preference_id": resultado["preference_id"],
+                                          "referencia_mp": pago.referencia})
+    return {"pago_id": pago.id, "transaccion_id": transaccion.id}
+
+
+def limpiar(engine) -> None:
+    with Session(engine) as session:
+        for modelo, columna in ((Pago, Pago.id_usuario), (Transaccion, Transaccion.cliente_dni), (Cliente, Cliente.dni)):
+            session.exec(delete(modelo).where(columna == DNI), execution_options={"synchronize_session": False})
+        session.commit()
+
+
+def medir(engine, nombre: str, checkout, checkouts: int) -> dict:
+    contadores = {"sentencias": 0, "commits": 0}
+
+    def contar_sentencia(*args):
+        contadores["sentencias"] += 1
+
+    def contar_commit(*args):
+        contadores["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", contar_sentencia)
+    event.listen(engine, "commit", contar_commit)
+    tiempos = []
+    try:
+        with Session(engine) as session:
+            for i in range(checkouts):
+                inicio = time.perf_counter()
+                checkout(session, {"cliente_dni": DNI, "monto": 100.0, "concepto": f"Cuota {nombre} {i}"})
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", contar_sentencia)
+        event.remove(engine, "commit", contar_commit)
+
+    tiempos.sort()
+    return {
+        "ms_promedio": round(statistics.mean(tiempos), 3),
+        "ms_p95": round(tiempos[int(len(tiempos) * 0.95) - 1], 3),
+        "sentencias_por_checkout": round(contadores["sentencias"] / checkouts, 2),
+        "commits_por_checkout": round(contadores["commits"] / checkouts, 2),
+    }
+
+
+def main() -> None:
+    checkouts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        latencia_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+        engine = crear_engine(url)
+        SQLModel.metadata.create_all(engine)
+        limpiar(engine)
+        with Session(engine) as session:
+            session.add(Cliente(dni=DNI, nombre="Bench", fecha_nacimiento=date(1990, 1, 1), telefono="0",
+                                correo="bench-checkout@gimnasio.test", password="bench"))
+            session.commit()
+
+        servicio = MercadoPagoLocal(latencia_ms)
+        print(f"{checkouts} checkouts (Mercado Pago simulado: {latencia_ms} ms)")
+        anterior = medir(engine, "anterior", lambda session, datos: checkout_anterior(session, servicio, datos), checkouts)
+        print(f"{'anterior':>10}: {anterior}")
+        actual = medir(engine, "actual", lambda session, datos: ProcesarPagoMercadoPagoCase(
+            session, mercado_pago_service=servicio).ejecutar(datos), checkouts)
+        print(f"{'actual':>10}: {actual}")
+
+        limpiar(engine)
+        assert actual["commits_por_checkout"] <= 1, "El checkout debe guardar todo en un solo COMMIT"
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
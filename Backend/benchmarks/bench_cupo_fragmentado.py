@@ -0,0 +1,170 @@
+# benchmarks/bench_cupo_fragmentado.py
+"""
+Contador de cupo en una sola fila contra el cupo fragmentado en N filas,
+con muchas inscripciones simultáneas sobre la misma clase.
+
+Uso:
+    python benchmarks/bench_cupo_fragmentado.py [intentos] [cupo] [hilos] [fragmentos] [DATABASE_URL]
+
+Con DATABASE_URL (MySQL) se corre crear_inscripcion_con_cupo contra la base
+real, con la clase sin fragmentar y fragmentada.
+
+Sin DATABASE_URL no hay locks por fila con qué medir (SQLite bloquea la base
+entera), así que se usa un sustituto local: cada fila es un lock que la
+reserva mantiene tomado `LATENCIA_MS` milisegundos, lo que tarda la
+transacción en llegar al COMMIT. Se verifica además, sobre SQLite, que el
+camino fragmentado real no sobrevende.
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, Session, delete, func, select
+
+from database import crear_engine
+from models.transaccion import Transaccion  # noqa: F401 - registra las tablas relacionadas
+from models.pago import Pago  # noqa: F401
+from models.cliente import Cliente
+from models.clase import Clase
+from models.cupo_fragmento import CupoFragmento, repartir_capacidad
+from models.inscripcion import Inscripcion, EstadoInscripcion
+from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
+from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+
+NOMBRE_CLASE = "Clase muy pedida (benchmark)"
+LATENCIA_MS = float(os.getenv("BENCH_LATENCIA_MS", "2"))
+
+
+# ---- sustituto local: filas con lock propio ----
+class FilaSimulada:
+    def __init__(self, capacidad: int):
+        self.lock = threading.Lock()
+        self.capacidad = capacidad
+        self.activos = 0
+
+
+def reservar_simulado(filas, latencia: float) -> bool:
+    """Mismo protocolo que reservar_lugar: fragmentos en orden aleatorio, UPDATE condicional por fila"""
+    for fila in random.sample(filas, len(filas)):
+        with fila.lock:
+            if fila.activos < fila.capacidad:
+                fila.activos += 1
+                time.sleep(latencia)  # el lock de fila dura hasta el COMMIT
+                return True
+    return False
+
+
+def avalancha_simulada(intentos: int, cupo: int, hilos: int, fragmentos: int) -> dict:
+    filas = [FilaSimulada(c) for c in repartir_capacidad(cupo, [0] * max(fragmentos, 1))]
+    latencia = LATENCIA_MS / 1000
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        reservas = list(pool.map(lambda _: reservar_simulado(filas, latencia), range(intentos)))
+    segundos = time.perf_counter() - inicio
+    return {"inscriptos": sum(reservas), "llena": reservas.count(False),
+            "segundos": round(segundos, 3), "intentos_por_segundo": round(intentos / segundos)}
+
+
+# ---- base real ----
+def preparar(engine, intentos: int, cupo: int, fragmentos: int) -> int:
+    with Session(engine) as session:
+        sin_sincronizar = {"synchronize_session": False}
+        clases = select(Clase.id).where(Clase.nombre == NOMBRE_CLASE)
+        session.exec(delete(Inscripcion).where(Inscripcion.cliente_dni.like("bench-%")), execution_options=sin_sincronizar)
+        session.exec(delete(CupoFragmento).where(CupoFragmento.clase_id.in_(clases)), execution_options=sin_sincronizar)
+        session.exec(delete(Clase).where(Clase.nombre == NOMBRE_CLASE), execution_options=sin_sincronizar)
+        session.exec(delete(Cliente).where(Cliente.dni.like("bench-%")), execution_options=sin_sincronizar)
+        session.add_all([
+            Cliente(dni=f"bench-{i}", nombre=f"Cliente {i}", fecha_nacimiento=date(1990, 1, 1),
+                    telefono="0", correo=f"bench{i}@gimnasio.test", password="x")
+            for i in range(intentos)
+        ])
+        clase = Clase(nombre=NOMBRE_CLASE, cupo_maximo=cupo, hora="19:00")
+        session.add(clase)
+        session.commit()
+        AdaptadorCupoFragmentoSQL(session).fragmentar(clase.id, fragmentos)
+        return clase.id
+
+
+def avalancha_base(engine, intentos: int, cupo: int, hilos: int, fragmentos: int) -> dict:
+    clase_id = preparar(engine, intentos, cupo, fragmentos)
+    resultado = {"inscriptos": 0, "llena": 0, "errores": 0}
+    lock = threading.Lock()
+
+    def intento(i: int) -> None:
+        with Session(engine) as session:
+            try:
+                AdaptadorInscripcionesSQL(session).crear_inscripcion_con_cupo(
+                    Inscripcion(cliente_dni=f"bench-{i}", clase_id=clase_id))
+                clave = "inscriptos"
+            except CupoAgotadoError:
+                clave = "llena"
+            except Exception as e:
+                print(f"❌ intento {i}: {e}")
+                clave = "errores"
+        with lock:
+            resultado[clave] += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        list(pool.map(intento, range(intentos)))
+    segundos = time.perf_counter() - inicio
+    resultado.update(segundos=round(segundos, 3), intentos_por_segundo=round(intentos / segundos))
+
+    with Session(engine) as session:
+        resultado["activas_en_base"] = session.exec(select(func.count(Inscripcion.id)).where(
+            Inscripcion.clase_id == clase_id, Inscripcion.estado == EstadoInscripcion.ACTIVO)).one()
+        resultado["contador"] = AdaptadorCupoFragmentoSQL(session).inscritos_activos(clase_id)
+    return resultado
+
+
+def main() -> None:
+    intentos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cupo = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    hilos = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    fragmentos = int(sys.argv[4]) if len(sys.argv) > 4 else 16
+    url = sys.argv[5] if len(sys.argv) > 5 else None
+
+    print(f"{intentos} intentos, cupo {cupo}, {hilos} hilos, {fragmentos} fragmentos")
+    caminos = [("una fila", 0), (f"{fragmentos} fragmentos", fragmentos)]
+
+    if url is None:
+        print(f"Sustituto local: locks de fila de {LATENCIA_MS} ms")
+        for nombre, n in caminos:
+            resultado = avalancha_simulada(intentos, cupo, hilos, n)
+            print(f"{nombre:>15}: {resultado}")
+            assert resultado["inscriptos"] == min(cupo, intentos), "El cupo debe ser exacto"
+
+        # Exactitud del camino real (SQLite serializa todo: no mide contención),
+        # en un directorio temporal que se borra al terminar
+        intentos, cupo, hilos = 300, 100, 16
+        print(f"SQLite, exactitud: {intentos} intentos, cupo {cupo}, {hilos} hilos")
+        with tempfile.TemporaryDirectory() as directorio:
+            engine = crear_engine(f"sqlite:///{os.path.join(directorio, 'bench.db')}",
+                                  connect_args={"check_same_thread": False, "timeout": 60})
+            exactitud(engine, intentos, cupo, hilos, [(f"{fragmentos} fragmentos", fragmentos)])
+            engine.dispose()
+    else:
+        engine = crear_engine(url, pool_size=hilos, max_overflow=0)
+        exactitud(engine, intentos, cupo, hilos, caminos)
+
+
+def exactitud(engine, intentos: int, cupo: int, hilos: int, caminos) -> None:
+    SQLModel.metadata.create_all(engine)
+    for nombre, n in caminos:
+        resultado = avalancha_base(engine, intentos, cupo, hilos, n)
+        print(f"{nombre:>15}: {resultado}")
+        assert resultado["activas_en_base"] == resultado["contador"] == min(cupo, intentos), \
+            "El cupo debe ser exacto y el contador coincidir con las inscripciones"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_cupos.py
+"""
+Avalancha de inscripciones sobre una clase con cupo limitado: N hilos
+intentan inscribirse a la vez, primero con el chequeo ingenuo (contar y
+después insertar) y luego con crear_inscripcion_con_cupo (UPDATE condicional
+sobre el contador de la clase). Verifica que la reserva nunca supere el cupo
+y que el contador coincida con las inscripciones guardadas.
+
+Uso:
+    python benchmarks/bench_cupos.py [intentos] [cupo] [hilos] [DATABASE_URL]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal (lock de base completa);
+con MySQL se ejercita el lock de fila del UPDATE.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, Session, delete, func, select
+
+from database import crear_engine
+from models.transaccion import Transaccion  # noqa: F401 - registra las tablas relacionadas
+from models.pago import Pago  # noqa: F401
+from models.cliente import Cliente
+from models.clase import Clase
+from models.inscripcion import Inscripcion, EstadoInscripcion
+from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+
+NOMBRE_CLASE = "Clase popular (benchmark)"
+
+
+def preparar(engine, intentos: int, cupo: int) -> int:
+    with Session(engine) as session:
+        # Solo se borran los datos del benchmark: se puede correr contra una base de desarrollo
+        sin_sincronizar = {"synchronize_session": False}
+        session.exec(delete(Inscripcion).where(Inscripcion.cliente_dni.like("bench-%")), execution_options=sin_sincronizar)
+        session.exec(delete(Clase).where(Clase.nombre == NOMBRE_CLASE), execution_options=sin_sincronizar)
+        session.exec(delete(Cliente).where(Cliente.dni.like("bench-%")), execution_options=sin_sincronizar)
+        session.add_all([
+            Cliente(dni=f"bench-{i}", nombre=f"Cliente {i}", fecha_nacimiento=date(1990, 1, 1),
+                    telefono="0", correo=f"bench{i}@gimnasio.test", password="x")
+            for i in range(intentos)
+        ])
+        clase = Clase(nombre=NOMBRE_CLASE, cupo_maximo=cupo, hora="19:00")
+        session.add(clase)
+        session.commit()
+        return clase.id
+
+
+def inscribir_ingenuo(session: Session, inscripcion: Inscripcion) -> Inscripcion:
+    """El chequeo previo sin bloqueo: dos hilos pueden contar el mismo lugar libre"""
+    clase = session.get(Clase, inscripcion.clase_id)
+    ocupadas = session.exec(select(func.count(Inscripcion.id)).where(
+        Inscripcion.clase_id == inscripcion.clase_id,
+        Inscripcion.estado == EstadoInscripcion.ACTIVO)).one()
+    if ocupadas >= clase.cupo_maximo:
+        raise CupoAgotadoError(inscripcion.clase_id, clase.cupo_maximo)
+    time.sleep(0.001)  # el tiempo de validar/armar la respuesta agranda la ventana de carrera
+    return AdaptadorInscripcionesSQL(session).crear_inscripcion(inscripcion)
+
+
+def avalancha(engine, clase_id: int, intentos: int, hilos: int, inscribir) -> dict:
+    resultado = {"inscriptos": 0, "llena": 0, "errores": 0}
+    lock = threading.Lock()
+    largada = threading.Barrier(hilos)
+
+    def intento(i: int) -> None:
+        if i < hilos:
+            largada.wait()
+        with Session(engine) as session:
+            try:
+                inscribir(session, Inscripcion(cliente_dni=f"bench-{i}", clase_id=clase_id))
+                clave = "inscriptos"
+            except CupoAgotadoError:
+                clave = "llena"
+            except Exception as e:
+                print(f"❌ intento {i}: {e}")
+                clave = "errores"
+        with lock:
+            resultado[clave] += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        list(pool.map(intento, range(intentos)))
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+
+    with Session(engine) as session:
+        resultado["activas_en_base"] = session.exec(select(func.count(Inscripcion.id)).where(
+            Inscripcion.clase_id == clase_id, Inscripcion.estado == EstadoInscripcion.ACTIVO)).one()
+        resultado["contador_clase"] = session.get(Clase, clase_id).inscritos_activos
+    return resultado
+
+
+def main() -> None:
+    intentos = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    cupo = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    hilos = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[4] if len(sys.argv) > 4 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+
+        opciones = {"pool_size": hilos, "max_overflow": 0}
+        if url.startswith("sqlite"):
+            opciones = {"connect_args": {"check_same_thread": False, "timeout": 60}}
+        engine = crear_engine(url, **opciones)
+        SQLModel.metadata.create_all(engine)
+
+        caminos = [
+            ("chequeo sin bloqueo", inscribir_ingenuo),
+            ("con reserva", lambda s, i: AdaptadorInscripcionesSQL(s).crear_inscripcion_con_cupo(i)),
+        ]
+        print(f"{intentos} intentos, cupo {cupo}, {hilos} hilos")
+        for nombre, inscribir in caminos:
+            clase_id = preparar(engine, intentos, cupo)
+            resultado = avalancha(engine, clase_id, intentos, hilos, inscribir)
+            estado = "OK" if resultado["activas_en_base"] <= cupo else "SOBREVENTA"
+            print(f"{nombre:>20}: {resultado} -> {estado}")
+
+        assert resultado["activas_en_base"] == cupo, "La reserva no debe sobrevender"
+        assert resultado["contador_clase"] == cupo, "El contador debe coincidir con las inscripciones"
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_estadisticas.py
+"""
+Compara las estadísticas de pagos calculadas en Python (materializando
+todas las filas) contra la consulta agrupada por estado del adaptador.
+
+Uso:
+    python benchmarks/bench_estadisticas.py [10000,100000,1000000] [DATABASE_URL]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, Session, create_engine, select, delete
+
+from models.cliente import Cliente  # noqa: F401 - registra las tablas relacionadas
+from models.clase import Clase  # noqa: F401
+from models.inscripcion import Inscripcion  # noqa: F401
+from models.transaccion import Transaccion  # noqa: F401
+from models.pago import Pago, EstadoPago
+from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+
+LOTE = 10_000
+
+
+def poblar(engine, cantidad: int) -> None:
+    estados = list(EstadoPago)
+    base = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        session.exec(delete(Pago))
+        session.commit()
+        for inicio in range(0, cantidad, LOTE):
+            filas = [{
+                "id_usuario": str(10_000_000 + i % 5_000),
+                "estado_pago": random.choice(estados),
+                "fecha_creacion": base + timedelta(seconds=i),
+                "fecha_actualizacion": base + timedelta(seconds=i),
+                "monto": round(random.uniform(1, 50_000), 2),
+                "concepto": "Cuota",
+                "metodo_pago": "efectivo",
+            } for i in range(inicio, min(inicio + LOTE, cantidad))]
+            session.execute(Pago.__table__.insert(), filas)
+            session.commit()
+
+
+def estadisticas_en_python(session: Session) -> dict:
+    """Implementación anterior: trae todas las filas y las recorre varias veces"""
+    pagos = session.exec(select(Pago)).all()
+    return {
+        "total": len(pagos),
+        "pendientes": len([p for p in pagos if p.estado_pago == EstadoPago.PENDIENTE]),
+        "completados": len([p for p in pagos if p.estado_pago == EstadoPago.COMPLETADO]),
+        "rechazados": len([p for p in pagos if p.estado_pago == EstadoPago.RECHAZADO]),
+        "reembolsados": len([p for p in pagos if p.estado_pago == EstadoPago.REEMBOLSADO]),
+        "monto_total": sum(p.monto for p in pagos),
+        "monto_pendiente": sum(p.monto for p in pagos if p.estado_pago == EstadoPago.PENDIENTE),
+        "monto_completado": sum(p.monto for p in pagos if p.estado_pago == EstadoPago.COMPLETADO),
+    }
+
+
+def medir(funcion, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main() -> None:
+    tamanios = [int(t) for t in (sys.argv[1] if len(sys.argv) > 1 else "10000,100000,1000000").split(",")]
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+        engine = create_engine(url)
+        SQLModel.metadata.create_all(engine)
+
+        print(f"{'filas':>10} {'python (s)':>12} {'group by (s)':>13} {'mejora':>8}")
+        for cantidad in tamanios:
+            poblar(engine, cantidad)
+            with Session(engine) as session:
+                repositorio = AdaptadorPagoSQL(session)
+                esperado = estadisticas_en_python(session)
+                obtenido = repositorio.obtener_estadisticas_avanzadas()
+                assert esperado["total"] == obtenido["total"]
+                assert esperado["completados"] == obtenido["completados"]
+
+                def en_python():
+                    session.expunge_all()
+                    estadisticas_en_python(session)
+
+                t_python = medir(en_python)
+                t_sql = medir(repositorio.obtener_estadisticas_avanzadas)
+            print(f"{cantidad:>10} {t_python:>12.3f} {t_sql:>13.3f} {t_python / t_sql:>7.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_importacion.py
+"""
+Importación masiva de clientes: alta fila por fila con RegistrarUsuarioCase
+(dos SELECT, INSERT, COMMIT y REFRESH por cliente) contra el camino de
+/masivo/importar (CSV leído en streaming, una consulta IN y un INSERT
+multi-fila por lote).
+
+Uso:
+    python benchmarks/bench_importacion.py [filas] [DATABASE_URL]
+
+Sin DATABASE_URL se usa un archivo SQLite temporal. El alta fila por fila
+se mide sobre una muestra y se informa en filas por segundo.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, Session, delete, func, select
+
+from database import crear_engine
+from models.transaccion import Transaccion  # noqa: F401 - registra las tablas relacionadas
+from models.pago import Pago  # noqa: F401
+from models.inscripcion import Inscripcion  # noqa: F401
+from models.cliente import Cliente
+from Adaptadores.adaptadorClienteSQL import AdaptadorClienteSQL
+from Casos_de_uso.Usuarios.registrar_usuario import RegistrarUsuarioCase
+from routers.importacion import lotes_de_filas
+
+MUESTRA_FILA_POR_FILA = 500
+BYTES_POR_BLOQUE = 64 * 1024
+
+
+def limpiar(engine) -> None:
+    with Session(engine) as session:
+        session.exec(delete(Cliente).where(Cliente.dni.like("bench-%")),
+                     execution_options={"synchronize_session": False})
+        session.commit()
+
+
+def datos_cliente(i: int, prefijo: str) -> dict:
+    return {"dni": f"bench-{prefijo}{i}", "nombre": f"Cliente {i}", "fecha_nacimiento": "1990-01-01",
+            "telefono": "0", "correo": f"bench{prefijo}{i}@gimnasio.test", "ciudad": "Rosario"}
+
+
+def csv_clientes(filas: int) -> bytes:
+    lineas = ["dni,nombre,fecha_nacimiento,telefono,correo,ciudad"]
+    lineas += [",".join(datos_cliente(i, "csv").values()) for i in range(filas)]
+    return ("\n".join(lineas) + "\n").encode()
+
+
+async def subida(cuerpo: bytes):
+    """El cuerpo en bloques, como llega de request.stream()"""
+    for inicio in range(0, len(cuerpo), BYTES_POR_BLOQUE):
+        yield cuerpo[inicio:inicio + BYTES_POR_BLOQUE]
+
+
+def fila_por_fila(engine, filas: int) -> dict:
+    with Session(engine) as session:
+        caso_uso = RegistrarUsuarioCase(session)
+        inicio = time.perf_counter()
+        for i in range(filas):
+            caso_uso.ejecutar(datos_cliente(i, "uno"))
+        segundos = time.perf_counter() - inicio
+    return {"filas": filas, "segundos": round(segundos, 3), "filas_por_segundo": round(filas / segundos)}
+
+
+def por_lotes(engine, filas: int) -> dict:
+    cuerpo = csv_clientes(filas)
+
+    async def importar() -> dict:
+        creados, errores = 0, 0
+        with Session(engine) as session:
+            repositorio = AdaptadorClienteSQL(session)
+            async for lote in lotes_de_filas(subida(cuerpo), "csv"):
+                resultado = repositorio.importar_clientes(lote)
+                creados += resultado["creados"]
+                errores += len(resultado["errores"])
+        return {"creados": creados, "errores": errores}
+
+    inicio = time.perf_counter()
+    resultado = asyncio.run(importar())
+    segundos = time.perf_counter() - inicio
+    resultado.update(segundos=round(segundos, 3), filas_por_segundo=round(filas / segundos))
+    return resultado
+
+
+def main() -> None:
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Sin URL, una base SQLite en un directorio temporal que se borra al terminar
+    with tempfile.TemporaryDirectory() as directorio:
+        url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{os.path.join(directorio, 'bench.db')}"
+
+        engine = crear_engine(url)
+        SQLModel.metadata.create_all(engine)
+        limpiar(engine)
+
+        muestra = min(filas, MUESTRA_FILA_POR_FILA)
+        print(f"{filas} filas (fila por fila: muestra de {muestra})")
+        print(f"{'fila por fila':>15}: {fila_por_fila(engine, muestra)}")
+        resultado = por_lotes(engine, filas)
+        print(f"{'por lotes':>15}: {resultado}")
+
+        with Session(engine) as session:
+            importados = session.exec(select(func.count(Cliente.id)).where(Cliente.dni.like("bench-csv%"))).one()
+        limpiar(engine)
+        assert resultado["creados"] == importados == filas, "Todas las filas deben quedar importadas"
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# migraciones.py
+from sqlalchemy import Time, bindparam, inspect, text
+from sqlmodel import SQLModel
+
+
+def _rellenar_dias_mask(conexion) -> None:
+    """Calcular dias_mask para las clases creadas antes de existir la columna"""
+    from models.clase import Clase, calcular_dias_mask
+
+    tabla = Clase.__table__
+    filas = conexion.execute(tabla.select().with_only_columns(tabla.c.id, tabla.c.dias_semana)).all()
+    valores = [
+        {"_id": fila.id, "_mask": calcular_dias_mask(fila.dias_semana)}
+        for fila in filas
+    ]
+    if valores:
+        conexion.execute(
+            tabla.update().where(tabla.c.id == bindparam("_id")).values(dias_mask=bindparam("_mask")),
+            valores,
+        )
+
+
+def _rellenar_ocupacion(conexion):
+    from servicios.ocupacion import reconciliar_ocupacion
+    reconciliar_ocupacion(conexion)
+
+
+# Columnas que, al agregarse a una tabla existente, necesitan calcular su valor inicial
+RELLENOS = {
+    "clase.dias_mask": _rellenar_dias_mask,
+    # Se agrega después de inscritos_activos: recién ahí están las dos columnas
+    "clase.inscritos_historicos": _rellenar_ocupacion,
+}
+
+
+def _default_sql(columna):
+    default = columna.default.arg if columna.default is not None else None
+    if isinstance(default, bool):
+        return "1" if default else "0"
+    if isinstance(default, (int, float)):
+        return str(default)
+    return None
+
+
+def agregar_columnas_faltantes(engine) -> list:
+    """
+    create_all no modifica tablas ya existentes; agregamos aquí las
+    columnas declaradas en los modelos que todavía no están en la base.
+    """
+    inspector = inspect(engine)
+    tablas_existentes = set(inspector.get_table_names())
+    agregadas = []
+
+    with engine.begin() as conexion:
+        for tabla in SQLModel.metadata.sorted_tables:
+            if tabla.name not in tablas_existentes:
+                continue
+            existentes = {col["name"] for col in inspector.get_columns(tabla.name)}
+            for columna in tabla.columns:
+                if columna.name in existentes:
+                    continue
+                ddl = f"ALTER TABLE {tabla.name} ADD COLUMN {columna.name} {columna.type.compile(dialect=engine.dialect)}"
+                default = _default_sql(columna)
+                if default is not None:
+                    ddl += f" NOT NULL DEFAULT {default}" if not columna.nullable else f" DEFAULT {default}"
+                conexion.execute(text(ddl))
+
+                nombre = f"{tabla.name}.{columna.name}"
+                if nombre in RELLENOS:
+                    RELLENOS[nombre](conexion)
+                agregadas.append(nombre)
+
+    return agregadas
+
+
+def convertir_hora_clase_a_time(engine) -> bool:
+    """
+    clase.hora era un VARCHAR 'HH:MM'. Se pasa a TIME con una columna
+    auxiliar: se parsea cada valor en Python (los que no son una hora
+    válida quedan en NULL y se informan), se descarta la columna vieja y
+    se renombra la nueva. Los índices sobre hora se recrean después.
+
+    En MySQL cada ALTER confirma por su cuenta, así que una corrida cortada
+    puede dejar hora_nueva a medias: se descarta y se rehace, o si la vieja
+    ya no está, solo falta renombrarla.
+    """
+    from models.clase import parsear_hora
+
+    inspector = inspect(engine)
+    if "clase" not in inspector.get_table_names():
+        return False
+    columnas = {col["name"]: col["type"] for col in inspector.get_columns("clase")}
+    if "hora" not in columnas and "hora_nueva" in columnas:
+        with engine.begin() as conexion:
+            conexion.execute(text("ALTER TABLE clase RENAME COLUMN hora_nueva TO hora"))
+        return True
+    if "hora" not in columnas or isinstance(columnas["hora"], Time):
+        return False
+
+    indices_hora = [ix["name"] for ix in inspector.get_indexes("clase") if "hora" in ix["column_names"]]
+    with engine.begin() as conexion:
+        valores = []
+        for clase_id, hora in conexion.execute(text("SELECT id, hora FROM clase WHERE hora IS NOT NULL")).all():
+            try:
+                valores.append({"_id": clase_id, "_hora": parsear_hora(hora)})
+            except ValueError:
+                print(f"⚠️  Clase {clase_id}: hora '{hora}' inválida, queda sin hora")
+
+        if "hora_nueva" in columnas:
+            conexion.execute(text("ALTER TABLE clase DROP COLUMN hora_nueva"))
+        tipo = Time().compile(dialect=engine.dialect)
+        conexion.execute(text(f"ALTER TABLE clase ADD COLUMN hora_nueva {tipo}"))
+        if valores:
+            actualizar = text("UPDATE clase SET hora_nueva = :_hora WHERE id = :_id").bindparams(
+                bindparam("_hora", type_=Time()))
+            conexion.execute(actualizar, valores)
+        for nombre in indices_hora:
+            conexion.execute(text(f"DROP INDEX {nombre} ON clase" if engine.dialect.name == "mysql" else f"DROP INDEX {nombre}"))
+        conexion.execute(text("ALTER TABLE clase DROP COLUMN hora"))
+        conexion.execute(text("ALTER TABLE clase RENAME COLUMN hora_nueva TO hora"))
+    return True
+
+
+def crear_indices_faltantes(engine) -> list:
+    """
+    create_all solo crea índices junto con tablas nuevas; en bases ya
+    existentes agregamos aquí los índices declarados en los modelos.
+    """
+    inspector = inspect(engine)
+    tablas_existentes = set(inspector.get_table_names())
+    creados = []
+
+    for tabla in SQLModel.metadata.sorted_tables:
+        if tabla.name not in tablas_existentes:
+            continue
+        existentes = {ix["name"] for ix in inspector.get_indexes(tabla.name)}
+        for indice in tabla.indexes:
+            if indice.name not in existentes:
+                indice.create(bind=engine)
+                creados.append(indice.name)
+
+    return creados
+
+
+# Índices que ya no declaran los modelos y quedan en bases existentes
+INDICES_OBSOLETOS = {
+    # dias_mask se filtra siempre junto con hora (ix_clase_hora_dias_mask)
+    "clase": ["ix_clase_dias_mask"],
+}
+
+
+def eliminar_indices_obsoletos(engine) -> list:
+    inspector = inspect(engine)
+    tablas_existentes = set(inspector.get_table_names())
+    eliminados = []
+
+    with engine.begin() as conexion:
+        for tabla, nombres in INDICES_OBSOLETOS.items():
+            if tabla not in tablas_existentes:
+                continue
+            existentes = {ix["name"] for ix in inspector.get_indexes(tabla)}
+            for nombre in nombres:
+                if nombre in existentes:
+                    conexion.execute(text(f"DROP INDEX {nombre} ON {tabla}" if engine.dialect.name == "mysql"
+                                          else f"DROP INDEX {nombre}"))
+                    eliminados.append(nombre)
+
+    return eliminados
+
+
+def aplicar_migraciones(engine) -> None:
+    """Aplicar los cambios de esquema que create_all no cubre"""
+    # La conversión de hora va antes de agregar columnas: si una corrida
+    # cortada dejó solo hora_nueva, no hay que crear una hora vacía.
+    # Después las columnas: algunos índices nuevos dependen de ellas
+    if convertir_hora_clase_a_time(engine):
+        print("✅ Columna clase.hora convertida a TIME")
+    for nombre in agregar_columnas_faltantes(engine):
+        print(f"✅ Columna agregada: {nombre}")
+    creados = crear_indices_faltantes(engine)
+    for nombre in creados:
+        print(f"✅ Índice creado: {nombre}")
+    for nombre in eliminar_indices_obsoletos(engine):
+        print(f"✅ Índice eliminado: {nombre}")
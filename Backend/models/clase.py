@@ -1,6 +1,8 @@
 from sqlmodel import Relationship, SQLModel, Field, Column, JSON
-from typing import Optional, List
-from datetime import datetime
+from sqlalchemy import Index, Time, event, or_
+from sqlalchemy.types import TypeDecorator
+from typing import Optional, List, Tuple
+from datetime import datetime, time
 from pydantic import BaseModel
 from enum import Enum
 
@@ -14,8 +16,81 @@ class DiaSemana(str, Enum):
     sabado = "sabado"
     domingo = "domingo"
 
+# Bit de cada día en Clase.dias_mask: lunes = 1, martes = 2, ... domingo = 64
+BIT_DIA = {dia.value: 1 << posicion for posicion, dia in enumerate(DiaSemana)}
+BIT_DIA.update({"miércoles": BIT_DIA["miercoles"], "sábado": BIT_DIA["sabado"]})
+
+
+def bit_dia(dia: str) -> int:
+    """Bit de un día de la semana; ValueError si el nombre no es válido"""
+    bit = BIT_DIA.get(str(getattr(dia, "value", dia)).strip().lower())
+    if bit is None:
+        raise ValueError(f"Día de la semana inválido: {dia}")
+    return bit
+
+
+def calcular_dias_mask(dias: Optional[List[str]]) -> int:
+    mask = 0
+    for dia in dias or []:
+        mask |= BIT_DIA.get(str(getattr(dia, "value", dia)).strip().lower(), 0)
+    return mask
+
+
+def weekdays_de_mask(mask: int) -> List[int]:
+    """Weekdays (lunes = 0) presentes en una máscara"""
+    return [weekday for weekday in range(7) if mask & (1 << weekday)]
+
+
+def parsear_hora(valor) -> Optional[time]:
+    """'HH:MM' o 'HH:MM:SS' a time; ValueError si el texto no es una hora"""
+    if valor is None or isinstance(valor, time):
+        return valor
+    texto = str(valor).strip()
+    if not texto:
+        return None
+    for formato in ("%H:%M", "%H:%M:%S"):
+        try:
+            return datetime.strptime(texto, formato).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Hora inválida: {valor}. Use HH:MM")
+
+
+def formatear_hora(hora: Optional[time]) -> Optional[str]:
+    """Formato 'HH:MM' que siempre devolvió la API"""
+    hora = parsear_hora(hora)
+    return hora.strftime("%H:%M") if hora else None
+
+
+def rango_horario(horario: str) -> Tuple[time, time]:
+    """'19' -> 19:00..19:59:59 y '19:30' -> 19:30..19:30:59, para filtrar por rango"""
+    partes = str(horario).strip().split(":")
+    try:
+        horas = int(partes[0])
+        if len(partes) == 1:
+            return time(horas, 0), time(horas, 59, 59)
+        minutos = int(partes[1])
+        return time(horas, minutos), time(horas, minutos, 59)
+    except (ValueError, IndexError):
+        raise ValueError(f"Horario inválido: {horario}. Use HH o HH:MM")
+
+
+class Hora(TypeDecorator):
+    """TIME que también acepta el texto 'HH:MM' que usaba la columna anterior"""
+    impl = Time
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return parsear_hora(value)
+
+
 # Modelo de tabla Clase
 class Clase(SQLModel, table=True):
+    __table_args__ = (
+        # "¿Qué se dicta el martes a las 19:00?" se resuelve recorriendo solo este índice
+        Index("ix_clase_hora_dias_mask", "hora", "dias_mask"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     nombre: str = Field(index=True)
     descripcion: Optional[str] = None
@@ -31,7 +106,18 @@ class Clase(SQLModel, table=True):
         sa_column=Column(JSON),
         default_factory=list, 
         description="Días de la semana en los que se repite la clase")
-    hora: Optional[str] = Field(default=None, description="Hora de la clase en formato 'HH:MM'")
+    hora: Optional[time] = Field(
+        sa_column=Column(Hora, index=True),
+        default=None,
+        description="Hora de la clase")
+    # Copia de dias_semana como bitmask entero, para filtrar por día en SQL
+    # (se consulta junto con hora: lo cubre ix_clase_hora_dias_mask)
+    dias_mask: int = Field(default=0)
+
+    # Ocupación desnormalizada; la mantienen los eventos de Inscripcion
+    # (models/inscripcion.py) y se reconstruye con servicios/ocupacion.py
+    inscritos_activos: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    inscritos_historicos: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     # Relación con inscripciones
     inscripciones: List["Inscripcion"] = Relationship(back_populates="clase")
@@ -58,6 +144,34 @@ class Clase(SQLModel, table=True):
     def materiales_necesarios(self) -> Optional[str]:
         return getattr(self, '_materiales_necesarios', None)
 
+@event.listens_for(Clase, "before_insert")
+@event.listens_for(Clase, "before_update")
+def _sincronizar_dias_mask(mapper, connection, clase: Clase) -> None:
+    """Mantener dias_mask al día con dias_semana en cualquier escritura por ORM"""
+    clase.dias_mask = calcular_dias_mask(clase.dias_semana)
+
+
+def condicion_dia(dia_semana: str):
+    """Condición SQL 'la clase se dicta este día' sobre la máscara"""
+    return Clase.dias_mask.op("&")(bit_dia(dia_semana)) != 0
+
+
+def condicion_rango_hora(hora_desde: Optional[time] = None, hora_hasta: Optional[time] = None):
+    """Condición SQL sobre el índice de hora; desde > hasta cruza la medianoche (22:00 a 02:00)"""
+    if hora_desde is not None and hora_hasta is not None and hora_desde > hora_hasta:
+        return or_(Clase.hora >= hora_desde, Clase.hora <= hora_hasta)
+    if hora_hasta is None:
+        return Clase.hora >= hora_desde
+    if hora_desde is None:
+        return Clase.hora <= hora_hasta
+    return Clase.hora.between(hora_desde, hora_hasta)
+
+
+def condicion_horario(horario: str):
+    """Filtro ?horario= de los listados (sync y async): "19" es 19:00 a 19:59, "19:30" esa hora exacta"""
+    return condicion_rango_hora(*rango_horario(horario))
+
+
 # ---------------------------
 # MODELOS PYDANTIC
 # ---------------------------
@@ -70,7 +184,7 @@ class ClaseBase(BaseModel):
     duracion_minutos: Optional[int] = 60
     dificultad: Optional[str] = "Media"
     dias_semana: Optional[List[DiaSemana]] = None
-    hora: Optional[str] = None  # NUEVO ATRIBUTO
+    hora: Optional[time] = None  # NUEVO ATRIBUTO
 
 class ClaseCreate(ClaseBase):
     pass
@@ -80,12 +194,13 @@ class ClaseRead(ClaseBase):
     nombre: str
     instructor: Optional[str]
     dificultad: Optional[str]
-    hora: Optional[str]  
+    hora: Optional[time]
     dias_semana: List[str]
     activa: bool
 
     class Config:
         orm_mode = True
+        json_encoders = {time: formatear_hora}
 
 class ClaseUpdate(BaseModel):
     nombre: Optional[str] = None
@@ -96,7 +211,7 @@ class ClaseUpdate(BaseModel):
     duracion_minutos: Optional[int] = None
     dificultad: Optional[str] = None
     dias_semana: Optional[List[DiaSemana]] = None
-    hora: Optional[str] = None
+    hora: Optional[time] = None
 
 class ClaseInscripcionResponse(BaseModel):
     mensaje: str
@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+# Ocurrencia concreta de una Clase, materializada desde dias_semana + hora
+class ClaseSesion(SQLModel, table=True):
+    __tablename__ = "clase_sesion"
+    __table_args__ = (
+        # Calendario por rango de fechas; único para que dos generaciones no dupliquen
+        Index("ix_clase_sesion_fecha_clase", "fecha_hora", "clase_id", unique=True),
+        # Agenda de un instructor
+        Index("ix_clase_sesion_instructor_fecha", "instructor", "fecha_hora"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    clase_id: int = Field(foreign_key="clase.id", index=True)
+    fecha_hora: datetime
+    instructor: Optional[str] = None
+    duracion_minutos: Optional[int] = Field(default=60)
+
+
+class ClaseSesionRead(BaseModel):
+    id: int
+    clase_id: int
+    nombre: str
+    instructor: Optional[str] = None
+    fecha_hora: datetime
+    duracion_minutos: Optional[int] = None
+    cupo_maximo: Optional[int] = None
+    inscritos: int = 0
@@ -0,0 +1,52 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, func, select
+from typing import List, Optional
+
+from models.clase import Clase
+
+
+# Contador de ocupación fragmentado: el cupo de una clase muy pedida se
+# reparte en N filas y cada alta bloquea solo la fila que le tocó. Las
+# inscripciones anotan su fragmento (Inscripcion.cupo_fragmento) para
+# devolver el lugar a esa misma fila.
+class CupoFragmento(SQLModel, table=True):
+    __tablename__ = "clase_cupo_fragmento"
+    __table_args__ = (
+        Index("ix_clase_cupo_fragmento_clase_fragmento", "clase_id", "fragmento", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    clase_id: int = Field(foreign_key="clase.id")
+    fragmento: int
+    # La suma de las capacidades de una clase es su cupo_maximo menos los
+    # activos que cuentan en la clase misma (inscripciones sin fragmento)
+    capacidad: int = Field(default=0)
+    activos: int = Field(default=0)
+    historicos: int = Field(default=0)
+
+
+def repartir_capacidad(cupo_maximo: int, activos: List[int], fuera_de_fragmentos: int = 0) -> List[int]:
+    """
+    Capacidad de cada fragmento: lo que ya ocupa más una parte pareja de los
+    lugares libres. Nunca queda un fragmento con más capacidad libre que la
+    que tiene la clase, así que la suma de reservas no puede pasar el cupo.
+    Los lugares ocupados por inscripciones sin fragmento (contador de la
+    clase) se descuentan antes de repartir.
+    """
+    libres = max(cupo_maximo - fuera_de_fragmentos - sum(activos), 0)
+    base, resto = divmod(libres, len(activos))
+    return [ocupados + base + (1 if i < resto else 0) for i, ocupados in enumerate(activos)]
+
+
+def _suma_fragmentos(columna):
+    return func.coalesce(
+        select(func.sum(columna)).where(CupoFragmento.clase_id == Clase.id).scalar_subquery(), 0)
+
+
+def inscritos_activos_total():
+    """Inscritos activos de la clase: su contador más el de sus fragmentos, si los tiene"""
+    return Clase.inscritos_activos + _suma_fragmentos(CupoFragmento.activos)
+
+
+def inscritos_historicos_total():
+    return Clase.inscritos_historicos + _suma_fragmentos(CupoFragmento.historicos)
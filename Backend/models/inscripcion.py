@@ -1,9 +1,12 @@
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, event, inspect
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
 
+from models.cupo_fragmento import CupoFragmento
+
 class EstadoInscripcion(str, Enum):
     ACTIVO = "activo"
     CANCELADO = "cancelado"
@@ -12,6 +15,10 @@ class EstadoInscripcion(str, Enum):
 
 # Entidad SQLModel (mantener igual)
 class Inscripcion(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_inscripcion_clase_estado", "clase_id", "estado"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     cliente_dni: str = Field(foreign_key="cliente.dni", index=True)
     clase_id: int = Field(foreign_key="clase.id", index=True)
@@ -21,12 +28,93 @@ class Inscripcion(SQLModel, table=True):
     transaccion_id: Optional[int] = Field(default=None, foreign_key="transaccion.id")
     fecha_cancelacion: Optional[datetime] = None
     motivo_cancelacion: Optional[str] = None
+    # Fragmento de cupo que ocupa, si la clase tiene el cupo fragmentado
+    cupo_fragmento: Optional[int] = None
 
     # Relaciones
     cliente: Optional["Cliente"] = Relationship(back_populates="inscripciones")
     clase: Optional["Clase"] = Relationship(back_populates="inscripciones")
     transaccion: Optional["Transaccion"] = Relationship(back_populates="inscripciones")
 
+def _ajustar_ocupacion(connection, clase_id: Optional[int], fragmento: Optional[int],
+                       activos: int, historicos: int) -> None:
+    if clase_id is None or not (activos or historicos):
+        return
+    if fragmento is None:
+        tabla = Inscripcion.metadata.tables["clase"]
+        connection.execute(
+            tabla.update()
+            .where(tabla.c.id == clase_id)
+            .values(
+                inscritos_activos=tabla.c.inscritos_activos + activos,
+                inscritos_historicos=tabla.c.inscritos_historicos + historicos,
+            )
+        )
+    else:
+        tabla = CupoFragmento.__table__
+        connection.execute(
+            tabla.update()
+            .where(tabla.c.clase_id == clase_id, tabla.c.fragmento == fragmento)
+            .values(activos=tabla.c.activos + activos, historicos=tabla.c.historicos + historicos)
+        )
+
+
+# Los contadores de Clase (o de su fragmento) se actualizan en el mismo
+# flush y transacción que la inscripción, por cualquier camino que escriba por ORM
+@event.listens_for(Inscripcion, "after_insert")
+def _ocupacion_alta(mapper, connection, inscripcion: Inscripcion) -> None:
+    # crear_inscripcion_con_cupo ya sumó el lugar al reservarlo
+    if inspect(inscripcion).info.pop("ocupacion_contada", False):
+        return
+    _ajustar_ocupacion(connection, inscripcion.clase_id, inscripcion.cupo_fragmento,
+                       int(inscripcion.estado == EstadoInscripcion.ACTIVO), 1)
+
+
+@event.listens_for(Inscripcion, "after_delete")
+def _ocupacion_baja(mapper, connection, inscripcion: Inscripcion) -> None:
+    _ajustar_ocupacion(connection, inscripcion.clase_id, inscripcion.cupo_fragmento,
+                       -int(inscripcion.estado == EstadoInscripcion.ACTIVO), -1)
+
+
+# active_history: al asignar estado/clase_id/fragmento sobre una instancia
+# expirada se carga antes el valor anterior, que after_update necesita para el delta
+@event.listens_for(Inscripcion.estado, "set", active_history=True)
+@event.listens_for(Inscripcion.clase_id, "set", active_history=True)
+@event.listens_for(Inscripcion.cupo_fragmento, "set", active_history=True)
+def _conservar_valor_anterior(inscripcion, valor, anterior, iniciador) -> None:
+    pass
+
+
+@event.listens_for(Inscripcion, "before_update")
+def _soltar_fragmento(mapper, connection, inscripcion: Inscripcion) -> None:
+    # Los fragmentos son de la clase: al cambiar de clase se cuenta en la nueva directamente
+    # (salvo que reservar_lugar ya le haya asignado un fragmento de la nueva)
+    estado = inspect(inscripcion)
+    if estado.attrs.clase_id.history.deleted and not estado.info.get("ocupacion_contada"):
+        inscripcion.cupo_fragmento = None
+
+
+@event.listens_for(Inscripcion, "after_update")
+def _ocupacion_cambio(mapper, connection, inscripcion: Inscripcion) -> None:
+    # Si reservar_lugar ya ocupó el lugar (reactivación o cambio de clase), acá solo se libera el anterior
+    contada = inspect(inscripcion).info.pop("ocupacion_contada", False)
+    estado = inspect(inscripcion).attrs.estado.history
+    clase = inspect(inscripcion).attrs.clase_id.history
+    fragmento = inspect(inscripcion).attrs.cupo_fragmento.history
+    estado_anterior = estado.deleted[0] if estado.deleted else inscripcion.estado
+    clase_anterior = clase.deleted[0] if clase.deleted else inscripcion.clase_id
+    fragmento_anterior = fragmento.deleted[0] if fragmento.deleted else inscripcion.cupo_fragmento
+    era_activa = int(estado_anterior == EstadoInscripcion.ACTIVO)
+    es_activa = int(inscripcion.estado == EstadoInscripcion.ACTIVO)
+
+    if clase_anterior != inscripcion.clase_id:
+        _ajustar_ocupacion(connection, clase_anterior, fragmento_anterior, -era_activa, -1)
+        if not contada:
+            _ajustar_ocupacion(connection, inscripcion.clase_id, inscripcion.cupo_fragmento, es_activa, 1)
+    elif not contada:
+        _ajustar_ocupacion(connection, inscripcion.clase_id, inscripcion.cupo_fragmento, es_activa - era_activa, 0)
+
+
 # Modelos Pydantic para request/response
 class InscripcionBase(BaseModel):
     cliente_dni: str
@@ -67,9 +155,24 @@ class InscripcionUpdate(BaseModel):
 class InscripcionCancelacion(BaseModel):
     motivo: str = Field(..., min_length=1, max_length=500)
 
+class InscripcionesPorClase(BaseModel):
+    clase_id: int
+    clase_nombre: Optional[str] = None
+    total: int
+    activas: int
+
+class InscripcionesPorDia(BaseModel):
+    fecha: str
+    total: int
+    activas: int
+
 class InscripcionStatsResponse(BaseModel):
     total_inscripciones: int
     activas: int
     canceladas: int
     completadas: int
-    pendientes: int
\ No newline at end of file
+    pendientes: int
+    pagadas: int = 0
+    no_pagadas: int = 0
+    por_clase: List[InscripcionesPorClase] = []
+    por_dia: List[InscripcionesPorDia] = []
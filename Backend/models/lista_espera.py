@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+# Cola FIFO de clientes esperando un lugar en una clase llena
+class ListaEspera(SQLModel, table=True):
+    __tablename__ = "lista_espera"
+    __table_args__ = (
+        # Cabeza de la cola y posición de un cliente: rangos sobre este índice
+        Index("ix_lista_espera_clase_posicion", "clase_id", "posicion", unique=True),
+        # Un cliente espera una sola vez por clase
+        Index("ix_lista_espera_clase_cliente", "clase_id", "cliente_dni", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    clase_id: int = Field(foreign_key="clase.id")
+    cliente_dni: str = Field(foreign_key="cliente.dni")
+    # Creciente dentro de cada clase; los huecos que dejan las salidas no importan
+    posicion: int
+    fecha_alta: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ListaEsperaCreate(BaseModel):
+    cliente_dni: str
+
+
+class ListaEsperaPosicion(BaseModel):
+    clase_id: int
+    cliente_dni: str
+    posicion: int
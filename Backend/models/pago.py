@@ -1,5 +1,6 @@
 # models/pago.py (corregido)
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 from enum import Enum
@@ -17,6 +18,13 @@ class EstadoPago(str, Enum):
     REEMBOLSADO = "reembolsado"
 
 class Pago(SQLModel, table=True):
+    __table_args__ = (
+        # Índice para la paginación por (fecha_creacion, id) del listado administrativo
+        Index("ix_pago_fecha_creacion_id", "fecha_creacion", "id"),
+        # Pendientes más viejos que un corte, para la conciliación con Mercado Pago
+        Index("ix_pago_estado_fecha_creacion", "estado_pago", "fecha_creacion"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     id_usuario: str = Field(foreign_key="cliente.dni", index=True)
     estado_pago: EstadoPago = Field(default=EstadoPago.PENDIENTE, index=True)
@@ -28,6 +36,12 @@ class Pago(SQLModel, table=True):
     referencia: Optional[str] = Field(default=None, unique=True, index=True)
     metodo_pago: str  # Quitar Optional
     observaciones: Optional[str] = None
+    # Última consulta a Mercado Pago en la conciliación sin cambio de estado
+    ultima_conciliacion: Optional[datetime] = None
+    # Preferencia de checkout y external_reference enviada a Mercado Pago;
+    # se guardan con el alta, que ocurre después de crear la preferencia
+    preference_id: Optional[str] = Field(default=None, index=True)
+    referencia_mp: Optional[str] = Field(default=None, index=True)
  
 
     # Relaciones (usando string para evitar import circular)
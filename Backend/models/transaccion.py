@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -11,6 +12,7 @@ class MetodoPago(str, Enum):
     TARJETA_DEBITO = "tarjeta de débito"
     BILLETERA_VIRTUAL = "billetera virtual"
     EFECTIVO = "efectivo"
+    MERCADO_PAGO = "mercado pago"
 
 class EstadoPago(str, Enum):
     PENDIENTE = "pendiente"
@@ -21,6 +23,13 @@ class EstadoPago(str, Enum):
 
 # Entidad SQLModel
 class Transaccion(SQLModel, table=True):
+    # Índices compuestos para los filtros y la paginación del listado administrativo
+    __table_args__ = (
+        Index("ix_transaccion_estado_fecha", "estado", "fecha"),
+        Index("ix_transaccion_cliente_dni_fecha", "cliente_dni", "fecha"),
+        Index("ix_transaccion_fecha_id", "fecha", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     cliente_dni: str = Field(foreign_key="cliente.dni", index=True)
     monto: float = Field(ge=0.0)
@@ -0,0 +1,37 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+
+class EstadoWebhook(str, Enum):
+    PENDIENTE = "pendiente"
+    PROCESADA = "procesada"
+    FALLIDA = "fallida"
+
+
+# Bandeja de entrada de notificaciones de Mercado Pago: el webhook solo
+# inserta y responde; un pool de workers la procesa después
+class WebhookEntrada(SQLModel, table=True):
+    __tablename__ = "webhook_entrada"
+    __table_args__ = (
+        # Una fila por recurso notificado: los reenvíos se fusionan en ella
+        Index("ix_webhook_entrada_tipo_recurso", "tipo", "recurso_id", unique=True),
+        # Lo que buscan los workers: pendientes cuyo turno ya llegó
+        Index("ix_webhook_entrada_estado_proximo", "estado", "proximo_intento"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    tipo: str = Field(max_length=50)
+    recurso_id: str = Field(max_length=100)
+    estado: EstadoWebhook = Field(default=EstadoWebhook.PENDIENTE)
+    # Se incrementa con cada reenvío: un worker solo cierra la entrada si
+    # no llegó otra notificación mientras la procesaba
+    notificaciones: int = Field(default=1)
+    intentos: int = Field(default=0)
+    # Turno del próximo intento; mientras un worker la procesa es el vencimiento de su reserva
+    proximo_intento: datetime = Field(default_factory=datetime.utcnow)
+    recibida: datetime = Field(default_factory=datetime.utcnow)
+    procesada: Optional[datetime] = None
+    ultimo_error: Optional[str] = None
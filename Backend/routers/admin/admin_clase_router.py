@@ -1,12 +1,18 @@
 # routers/admin_clase_router.py
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
-from database import get_session
-from models.clase import Clase, ClaseCreate, ClaseRead, ClaseUpdate
+from database import get_session, get_async_session
+from models.clase import Clase, ClaseCreate, ClaseRead, ClaseUpdate, DiaSemana, formatear_hora, rango_horario
 from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+from Adaptadores.adaptadorClaseAsyncSQL import AdaptadorClaseAsyncSQL
+from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache, AdaptadorClaseCacheAsync
+from Adaptadores.adaptadorClaseSesionSQL import AdaptadorClaseSesionSQL
+from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
+from models.clase_sesion import ClaseSesionRead
 from Dominio.repositorios.repositorioClase import RepositorioClase
 
 # Importar casos de uso
@@ -17,23 +23,20 @@ from Casos_de_uso.Clases.eliminar_clase import EliminarClaseCase
 admin_clase_router = APIRouter(prefix="/api/admin/clases", tags=["admin-clases"])
 
 def get_clase_repository(session: Session = Depends(get_session)) -> RepositorioClase:
-    return AdaptadorClaseSQL(session)
+    return AdaptadorClaseCache(AdaptadorClaseSQL(session))
 
 @admin_clase_router.get("/", response_model=List[ClaseRead])
-def listar_todas_las_clases(
+async def listar_todas_las_clases(
     solo_activas: bool = Query(False, description="Filtrar solo clases activas"),
     instructor: Optional[str] = Query(None, description="Filtrar por instructor"),
     dificultad: Optional[str] = Query(None, description="Filtrar por nivel de dificultad"),
-    horario: Optional[str] = Query(None, description="Filtrar por horario"),
-    repository: RepositorioClase = Depends(get_clase_repository)
+    horario: Optional[str] = Query(None, description="Filtrar por horario (HH o HH:MM)"),
+    dia_semana: Optional[DiaSemana] = Query(None, description="Filtrar por día de la semana"),
+    hora_desde: Optional[time] = Query(None, description="Clases desde esta hora (HH:MM)"),
+    hora_hasta: Optional[time] = Query(None, description="Clases hasta esta hora inclusive (HH:MM)"),
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Obtener todas las clases (incluyendo inactivas) - Solo para administradores"""
-    if solo_activas:
-        clases = repository.listar_clases(activas=True, instructor=instructor)
-    else:
-        clases = repository.listar_todas_las_clases(instructor=instructor)
-    
-    # Aplicar filtros adicionales
     if dificultad:
         niveles_validos = ["Baja", "Media", "Alta"]
         if dificultad not in niveles_validos:
@@ -41,12 +44,47 @@ def listar_todas_las_clases(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Nivel de dificultad debe ser: {', '.join(niveles_validos)}"
             )
-        clases = [clase for clase in clases if clase.nivel_dificultad == dificultad]
-    
     if horario:
-        clases = [clase for clase in clases if horario.lower() in clase.hora.lower()]
+        try:
+            rango_horario(horario)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    return clases
+    # Endpoint de alto tráfico: corre en el event loop con la sesión async
+    return await AdaptadorClaseCacheAsync(AdaptadorClaseAsyncSQL(session)).listar_clases(
+        activas=solo_activas,
+        instructor=instructor,
+        dificultad=dificultad,
+        horario=horario,
+        dia_semana=dia_semana,
+        hora_desde=hora_desde,
+        hora_hasta=hora_hasta
+    )
+
+@admin_clase_router.get("/sesiones", response_model=List[ClaseSesionRead])
+def listar_sesiones(
+    desde: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD), por defecto ahora"),
+    hasta: Optional[str] = Query(None, description="Fecha fin inclusive (YYYY-MM-DD), por defecto una semana"),
+    clase_id: Optional[int] = Query(None, description="Filtrar por clase"),
+    instructor: Optional[str] = Query(None, description="Filtrar por instructor"),
+    session: Session = Depends(get_session)
+):
+    """Calendario de sesiones materializadas, con cupo e inscritos de cada una"""
+    try:
+        desde_dt = datetime.strptime(desde, "%Y-%m-%d") if desde else datetime.now()
+        hasta_dt = (datetime.strptime(hasta, "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
+                    if hasta else desde_dt + timedelta(days=7))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
+
+    if hasta_dt < desde_dt:
+        raise HTTPException(status_code=400, detail="La fecha 'hasta' no puede ser anterior a 'desde'")
+    if (hasta_dt - desde_dt).days > 366:
+        raise HTTPException(status_code=400, detail="La ventana no puede superar un año")
+
+    return AdaptadorClaseSesionSQL(session).listar_sesiones(
+        desde_dt, hasta_dt, clase_id=clase_id, instructor=instructor
+    )
 
 @admin_clase_router.get("/{clase_id}", response_model=ClaseRead)
 def obtener_clase_detallada(
@@ -123,6 +161,18 @@ def activar_clase_admin(
         raise HTTPException(status_code=404, detail="Clase no encontrada")
     return clase_activada
 
+@admin_clase_router.put("/{clase_id}/cupo-fragmentos")
+def fragmentar_cupo_clase(
+    clase_id: int,
+    fragmentos: int = Query(..., ge=0, le=64, description="Filas en que se reparte el cupo (0 o 1 = contador único)"),
+    session: Session = Depends(get_session)
+):
+    """Repartir el contador de cupo de una clase muy pedida en varias filas - Solo para administradores"""
+    try:
+        return AdaptadorCupoFragmentoSQL(session).fragmentar(clase_id, fragmentos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @admin_clase_router.get("/{clase_id}/estadisticas")
 def obtener_estadisticas_clase(
     clase_id: int,
@@ -169,15 +219,16 @@ def generar_reporte_ocupacion(
 ):
     """Generar reporte de ocupación de todas las clases - Solo para administradores"""
     clases = repository.listar_clases(activas=True)
+    estadisticas = repository.obtener_estadisticas_clases([clase.id for clase in clases])
     
     reporte = []
     for clase in clases:
-        stats = repository.obtener_estadisticas_clase(clase.id)
+        stats = estadisticas.get(clase.id, {})
         reporte.append({
             'clase_id': clase.id,
             'nombre': clase.nombre,
             'instructor': clase.instructor,
-            'horario': clase.hora,
+            'horario': formatear_hora(clase.hora),
             'dias_semana': clase.dias_semana,
             'cupo_maximo': stats.get('cupo_maximo', 0),
             'inscripciones_activas': stats.get('inscripciones_activas', 0),
@@ -193,6 +244,7 @@ def generar_reporte_por_dificultad(
 ):
     """Generar reporte agrupado por nivel de dificultad - Solo para administradores"""
     clases = repository.listar_clases(activas=True)
+    estadisticas = repository.obtener_estadisticas_clases([clase.id for clase in clases])
     
     reporte = {
         "Baja": {"total_clases": 0, "total_inscritos": 0, "clases": []},
@@ -201,7 +253,7 @@ def generar_reporte_por_dificultad(
     }
     
     for clase in clases:
-        stats = repository.obtener_estadisticas_clase(clase.id)
+        stats = estadisticas.get(clase.id, {})
         nivel = clase.nivel_dificultad
         
         if nivel in reporte:
@@ -222,12 +274,13 @@ def generar_reporte_instructores(
 ):
     """Generar reporte de clases por instructor - Solo para administradores"""
     clases = repository.listar_clases(activas=True)
+    estadisticas = repository.obtener_estadisticas_clases([clase.id for clase in clases])
     
     reporte = {}
     
     for clase in clases:
         instructor = clase.instructor
-        stats = repository.obtener_estadisticas_clase(clase.id)
+        stats = estadisticas.get(clase.id, {})
         
         if instructor not in reporte:
             reporte[instructor] = {
@@ -241,7 +294,7 @@ def generar_reporte_instructores(
         reporte[instructor]["clases"].append({
             'id': clase.id,
             'nombre': clase.nombre,
-            'horario': clase.hora,
+            'horario': formatear_hora(clase.hora),
             'dificultad': clase.nivel_dificultad,
             'inscritos': stats.get('inscripciones_activas', 0)
         })
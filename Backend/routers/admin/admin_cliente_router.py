@@ -1,21 +1,27 @@
 
 # routers/admin_cliente_router.py
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta
 # En admin_cliente_router.py - actualizar imports
 from Casos_de_uso.Usuarios.registrar_usuario import RegistrarUsuarioCase
 from Casos_de_uso.Usuarios.editar_perfil import ModificarClienteAdminCase, ModificarClienteCase  # o ModificarClienteAdminCase
 from Casos_de_uso.Usuarios.eliminar_cliente import EliminarClienteAdminCase
+from Casos_de_uso.Usuarios.iniciar_sesion import IniciarSesionAsyncCase
 
-from database import get_session
+from database import get_session, get_async_session
 from models.cliente import (
     Cliente, ClienteCreate, ClienteRead, ClienteUpdate, 
     LoginRequest, VerificacionResponse, ClienteStatsResponse
 )
 from Dominio.repositorios.repositorioCliente import RepositorioCliente
 from Adaptadores.adaptadorClienteSQL import AdaptadorClienteSQL
+from routers.exportacion import PATRON_EXPORTACION, respuesta_exportacion
+from routers.lotes import detalles_lote
+from routers.importacion import PATRON_IMPORTACION, formato_de, lotes_de_filas
 
 admin_cliente_router = APIRouter(prefix="/api/admin/clientes", tags=["admin-clientes"])
 
@@ -28,9 +34,19 @@ def listar_todos_los_clientes(
     estado_membresia: Optional[str] = Query(None, description="Filtrar por estado de membresía"),
     fecha_registro_inicio: Optional[str] = Query(None, description="Fecha registro inicio (YYYY-MM-DD)"),
     fecha_registro_fin: Optional[str] = Query(None, description="Fecha registro fin (YYYY-MM-DD)"),
+    export: Optional[str] = Query(None, regex=PATRON_EXPORTACION, description="ndjson o csv: descarga completa en streaming"),
     repository: RepositorioCliente = Depends(get_cliente_repository)
 ):
     """Obtener todos los clientes (incluyendo inactivos) - Solo para administradores"""
+    if export:
+        try:
+            fecha_ini = datetime.strptime(fecha_registro_inicio, "%Y-%m-%d") if fecha_registro_inicio else None
+            fecha_fin = datetime.strptime(fecha_registro_fin, "%Y-%m-%d") + timedelta(days=1) if fecha_registro_fin else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
+        filas = repository.exportar_clientes(solo_activos, fecha_ini, fecha_fin)
+        return respuesta_exportacion(filas, export, "clientes")
+
     clientes = repository.listar_todos_los_usuarios()
     
     # Aplicar filtros
@@ -94,26 +110,65 @@ def crear_cliente_admin(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear el cliente: {str(e)}")
 
+@admin_cliente_router.post("/login", response_model=ClienteRead)
+async def iniciar_sesion_cliente(
+    credenciales: LoginRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Validar correo y contraseña de un cliente"""
+    try:
+        return await IniciarSesionAsyncCase(session).ejecutar(credenciales.correo, credenciales.password)
+    except ValueError as e:
+        codigo = status.HTTP_403_FORBIDDEN if str(e) == "Cuenta inactiva" else status.HTTP_401_UNAUTHORIZED
+        raise HTTPException(status_code=codigo, detail=str(e))
+
 @admin_cliente_router.post("/masivo", response_model=List[ClienteRead], status_code=status.HTTP_201_CREATED)
 def crear_clientes_masivos(
     clientes_data: List[ClienteCreate],
-    session: Session = Depends(get_session)
+    repository: RepositorioCliente = Depends(get_cliente_repository)
 ):
     """Crear múltiples clientes de forma masiva - Solo para administradores"""
-    caso_uso = RegistrarUsuarioCase(session)
-    clientes_creados = []
-    
-    for data in clientes_data:
-        try:
-            cliente_creado = caso_uso.ejecutar(data.dict())
-            clientes_creados.append(cliente_creado)
-        except Exception as e:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Error al crear cliente {data.nombre}: {str(e)}"
-            )
-    
-    return clientes_creados
+    try:
+        return repository.crear_usuarios(clientes_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@admin_cliente_router.post("/masivo/importar", status_code=status.HTTP_200_OK)
+async def importar_clientes_masivos(
+    request: Request,
+    formato: Optional[str] = Query(None, regex=PATRON_IMPORTACION, description="ndjson o csv; si falta se usa el Content-Type"),
+    repository: RepositorioCliente = Depends(get_cliente_repository)
+):
+    """
+    Importar clientes desde un CSV (con encabezado) o NDJSON enviado como cuerpo
+    crudo. Se procesa a medida que llega, de a lotes; las filas con error se
+    informan y no frenan a las demás - Solo para administradores
+    """
+    formato = formato_de(request.headers.get("content-type"), formato)
+    if formato is None:
+        raise HTTPException(status_code=415, detail="Enviar el archivo como text/csv o application/x-ndjson")
+
+    total, creados, errores = 0, 0, []
+    async for lote in lotes_de_filas(request.stream(), formato):
+        total += len(lote)
+        filas = []
+        for numero, datos in lote:
+            if "_error" in datos:
+                errores.append({"fila": numero, "dni": None, "error": datos["_error"]})
+            else:
+                filas.append((numero, datos))
+        if filas:
+            resultado = await run_in_threadpool(repository.importar_clientes, filas)
+            creados += resultado["creados"]
+            errores.extend(resultado["errores"])
+
+    errores.sort(key=lambda error: error["fila"])
+    return {
+        "total_filas": total,
+        "creados": creados,
+        "rechazados": len(errores),
+        "errores": errores
+    }
 
 @admin_cliente_router.put("/{cliente_id}", response_model=ClienteRead)
 def actualizar_cliente_admin(
@@ -238,31 +293,16 @@ def eliminar_cliente_por_dni_admin(
 @admin_cliente_router.delete("/batch/eliminar", status_code=status.HTTP_200_OK)
 def eliminar_clientes_masivos(
     cliente_ids: List[int] = Query(..., description="Lista de IDs a eliminar"),
-    session: Session = Depends(get_session)
+    repository: RepositorioCliente = Depends(get_cliente_repository)
 ):
     """Eliminar múltiples clientes de forma masiva - Solo para administradores"""
-    caso_uso = EliminarClienteAdminCase(session)
-    resultados = []
-    
-    for cliente_id in cliente_ids:
-        try:
-            eliminado = caso_uso.ejecutar(cliente_id)
-            resultados.append({
-                "id": cliente_id,
-                "eliminado": eliminado,
-                "mensaje": "Eliminado correctamente" if eliminado else "No encontrado"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": cliente_id,
-                "eliminado": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.eliminar_usuarios_permanentemente(cliente_ids)
+    detalles = detalles_lote(cliente_ids, resultados, "eliminado", "Eliminado correctamente")
+
     return {
         "total_solicitados": len(cliente_ids),
-        "eliminados_exitosos": len([r for r in resultados if r.get("eliminado")]),
-        "detalles": resultados
+        "eliminados_exitosos": len([r for r in detalles if r.get("eliminado")]),
+        "detalles": detalles
     }
 
 @admin_cliente_router.get("/estadisticas/totales", response_model=ClienteStatsResponse)
@@ -396,27 +436,13 @@ def activar_clientes_masivos(
     repository: RepositorioCliente = Depends(get_cliente_repository)
 ):
     """Activar múltiples clientes de forma masiva - Solo para administradores"""
-    resultados = []
-    
-    for cliente_id in cliente_ids:
-        try:
-            cliente_activado = repository.activar_usuario(cliente_id)
-            resultados.append({
-                "id": cliente_id,
-                "activado": cliente_activado is not None,
-                "mensaje": "Activado correctamente" if cliente_activado else "No encontrado"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": cliente_id,
-                "activado": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.cambiar_estado_usuarios(cliente_ids, activo=True)
+    detalles = detalles_lote(cliente_ids, resultados, "activado", "Activado correctamente", clave_motivo="mensaje")
+
     return {
         "total_solicitados": len(cliente_ids),
-        "activados_exitosos": len([r for r in resultados if r.get("activado")]),
-        "detalles": resultados
+        "activados_exitosos": len([r for r in detalles if r.get("activado")]),
+        "detalles": detalles
     }
 
 @admin_cliente_router.patch("/batch/desactivar")
@@ -425,27 +451,13 @@ def desactivar_clientes_masivos(
     repository: RepositorioCliente = Depends(get_cliente_repository)
 ):
     """Desactivar múltiples clientes de forma masiva - Solo para administradores"""
-    resultados = []
-    
-    for cliente_id in cliente_ids:
-        try:
-            cliente_desactivado = repository.desactivar_usuario(cliente_id)
-            resultados.append({
-                "id": cliente_id,
-                "desactivado": cliente_desactivado is not None,
-                "mensaje": "Desactivado correctamente" if cliente_desactivado else "No encontrado"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": cliente_id,
-                "desactivado": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.cambiar_estado_usuarios(cliente_ids, activo=False)
+    detalles = detalles_lote(cliente_ids, resultados, "desactivado", "Desactivado correctamente", clave_motivo="mensaje")
+
     return {
         "total_solicitados": len(cliente_ids),
-        "desactivados_exitosos": len([r for r in resultados if r.get("desactivado")]),
-        "detalles": resultados
+        "desactivados_exitosos": len([r for r in detalles if r.get("desactivado")]),
+        "detalles": detalles
     }
 
 @admin_cliente_router.get("/verificaciones/completas")
@@ -8,6 +8,7 @@ from database import get_session
 from models.informacion import Informacion, InformacionCreate, InformacionRead, InformacionStatsResponse, InformacionUpdate, TipoInformacion
 from Dominio.repositorios.repositorioInformacion import RepositorioInformacion
 from Adaptadores.adaptadorInformacionSQL import AdaptadorInformacionSQL
+from routers.lotes import detalles_lote
 
 # Importar casos de uso
 from Casos_de_uso.Informacion.crear_informacion import CrearInformacionCase
@@ -138,31 +139,16 @@ def eliminar_informacion_admin(
 @admin_informacion_router.delete("/batch/eliminar", status_code=status.HTTP_200_OK)
 def eliminar_informaciones_masivas(
     informacion_ids: List[int] = Query(..., description="Lista de IDs a eliminar"),
-    session: Session = Depends(get_session)
+    repository: RepositorioInformacion = Depends(get_informacion_repository)
 ):
     """Eliminar múltiples informaciones de forma masiva - Solo para administradores"""
-    caso_uso = EliminarInformacionCase(session)
-    resultados = []
-    
-    for info_id in informacion_ids:
-        try:
-            eliminada = caso_uso.ejecutar(info_id)
-            resultados.append({
-                "id": info_id,
-                "eliminada": eliminada,
-                "mensaje": "Eliminada correctamente" if eliminada else "No encontrada"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": info_id,
-                "eliminada": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.eliminar_informaciones(informacion_ids)
+    detalles = detalles_lote(informacion_ids, resultados, "eliminada", "Eliminada correctamente")
+
     return {
         "total_solicitadas": len(informacion_ids),
-        "eliminadas_exitosas": len([r for r in resultados if r.get("eliminada")]),
-        "detalles": resultados
+        "eliminadas_exitosas": len([r for r in detalles if r.get("eliminada")]),
+        "detalles": detalles
     }
 
 @admin_informacion_router.get("/estadisticas/avanzadas", response_model=InformacionStatsResponse)
@@ -340,27 +326,13 @@ def activar_informaciones_masivas(
     repository: RepositorioInformacion = Depends(get_informacion_repository)
 ):
     """Activar múltiples informaciones de forma masiva - Solo para administradores"""
-    resultados = []
-    
-    for info_id in informacion_ids:
-        try:
-            informacion_activada = repository.activar_informacion(info_id)
-            resultados.append({
-                "id": info_id,
-                "activada": informacion_activada is not None,
-                "mensaje": "Activada correctamente" if informacion_activada else "No encontrada"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": info_id,
-                "activada": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.cambiar_estado_informaciones(informacion_ids, activa=True)
+    detalles = detalles_lote(informacion_ids, resultados, "activada", "Activada correctamente", clave_motivo="mensaje")
+
     return {
         "total_solicitadas": len(informacion_ids),
-        "activadas_exitosas": len([r for r in resultados if r.get("activada")]),
-        "detalles": resultados
+        "activadas_exitosas": len([r for r in detalles if r.get("activada")]),
+        "detalles": detalles
     }
 
 @admin_informacion_router.patch("/batch/desactivar")
@@ -369,27 +341,13 @@ def desactivar_informaciones_masivas(
     repository: RepositorioInformacion = Depends(get_informacion_repository)
 ):
     """Desactivar múltiples informaciones de forma masiva - Solo para administradores"""
-    resultados = []
-    
-    for info_id in informacion_ids:
-        try:
-            informacion_desactivada = repository.desactivar_informacion(info_id)
-            resultados.append({
-                "id": info_id,
-                "desactivada": informacion_desactivada is not None,
-                "mensaje": "Desactivada correctamente" if informacion_desactivada else "No encontrada"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": info_id,
-                "desactivada": False,
-                "error": str(e)
-            })
-    
+    resultados = repository.cambiar_estado_informaciones(informacion_ids, activa=False)
+    detalles = detalles_lote(informacion_ids, resultados, "desactivada", "Desactivada correctamente", clave_motivo="mensaje")
+
     return {
         "total_solicitadas": len(informacion_ids),
-        "desactivadas_exitosas": len([r for r in resultados if r.get("desactivada")]),
-        "detalles": resultados
+        "desactivadas_exitosas": len([r for r in detalles if r.get("desactivada")]),
+        "detalles": detalles
     }
 
 @admin_informacion_router.get("/cliente/{cliente_dni}/completo")
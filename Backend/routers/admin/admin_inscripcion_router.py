@@ -1,23 +1,29 @@
 # routers/admin/admin_inscripcion_router.py
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from sqlmodel import Session, select
+from sqlmodel import Session
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 
-from database import get_session
+from database import get_session, get_async_session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.inscripcion import (
     Inscripcion, InscripcionCreate, InscripcionRead, InscripcionUpdate,
     InscripcionCancelacion, InscripcionStatsResponse, EstadoInscripcion
 )
 from models.cliente import Cliente
 from models.clase import Clase
+from models.lista_espera import ListaEsperaCreate, ListaEsperaPosicion
 from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
-from Dominio.repositorios.repositorioInscripciones import RepositorioInscripciones
+from Adaptadores.adaptadorListaEsperaSQL import AdaptadorListaEsperaSQL
+from Adaptadores.adaptadorListaEsperaAsyncSQL import AdaptadorListaEsperaAsyncSQL
+from Dominio.repositorios.repositorioInscripciones import RepositorioInscripciones, CupoAgotadoError
+from routers.exportacion import PATRON_EXPORTACION, respuesta_exportacion
 
 # Importar casos de uso
-from Casos_de_uso.Inscripciones.crear_inscripcion import CrearInscripcionAdminCase
+from Casos_de_uso.Inscripciones.crear_inscripcion import CrearInscripcionAdminAsyncCase
 from Casos_de_uso.Inscripciones.modificar_inscripcion import ModificarInscripcionAdminCase
 from Casos_de_uso.Inscripciones.eliminar_inscripcion import EliminarInscripcionAdminCase
+from Casos_de_uso.Inscripciones.ver_cronograma import ver_cronograma
 
 admin_inscripcion_router = APIRouter(prefix="/api/admin/inscripciones", tags=["admin-inscripciones"])
 
@@ -42,6 +48,24 @@ def _parse_estado_inscripcion(valor: str) -> EstadoInscripcion:
     raise ValueError(f"Estado de inscripción desconocido: {valor}")
 
 
+def _parse_filtros_reporte(fecha_inicio: Optional[str], fecha_fin: Optional[str], estado: Optional[str]) -> Dict:
+    """Convierte los filtros de los reportes; fecha_fin incluye el día completo"""
+    filtros = {}
+    try:
+        if fecha_inicio:
+            filtros["fecha_inicio"] = datetime.strptime(fecha_inicio, "%Y-%m-%d")
+        if fecha_fin:
+            filtros["fecha_fin"] = datetime.strptime(fecha_fin, "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
+    if estado:
+        try:
+            filtros["estado"] = _parse_estado_inscripcion(estado)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return filtros
+
+
 # ========================
 # ENDPOINTS CRUD
 # ========================
@@ -54,8 +78,16 @@ def listar_todas_las_inscripciones(
     solo_activas: bool = Query(False, description="Filtrar solo inscripciones activas"),
     fecha_inicio: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD)"),
     fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
+    export: Optional[str] = Query(None, regex=PATRON_EXPORTACION, description="ndjson o csv: descarga completa en streaming"),
     repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
 ):
+    if export:
+        filtros = _parse_filtros_reporte(fecha_inicio, fecha_fin, estado)
+        if solo_activas:
+            filtros["estado"] = EstadoInscripcion.ACTIVO
+        filas = repositorio.exportar_inscripciones(cliente_dni=cliente_dni, clase_id=clase_id, **filtros)
+        return respuesta_exportacion(filas, export, "inscripciones")
+
     inscripciones = repositorio.listar_todas_las_inscripciones()
     
     # Filtros opcionales
@@ -94,100 +126,144 @@ def listar_todas_las_inscripciones(
 
 
 @admin_inscripcion_router.post("/", response_model=InscripcionRead, status_code=status.HTTP_201_CREATED)
-def crear_inscripcion_admin(inscripcion_data: InscripcionCreate, session: Session = Depends(get_session)):
-    caso_uso = CrearInscripcionAdminCase(session)
+async def crear_inscripcion_admin(inscripcion_data: InscripcionCreate, session: AsyncSession = Depends(get_async_session)):
+    caso_uso = CrearInscripcionAdminAsyncCase(session)
     try:
-        inscripcion_creada = caso_uso.ejecutar(inscripcion_data.dict())
+        inscripcion_creada = await caso_uso.ejecutar(inscripcion_data.dict())
         return inscripcion_creada
+    except CupoAgotadoError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear la inscripción: {str(e)}")
 
 
+@admin_inscripcion_router.get("/cliente/{cliente_dni}/cronograma")
+def obtener_cronograma_cliente(
+    cliente_dni: str,
+    desde: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD), por defecto ahora"),
+    hasta: Optional[str] = Query(None, description="Fecha fin inclusive (YYYY-MM-DD), por defecto una semana"),
+    repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
+):
+    """Próximas clases del cliente dentro de la ventana pedida"""
+    try:
+        desde_dt = datetime.strptime(desde, "%Y-%m-%d") if desde else datetime.now()
+        hasta_dt = (datetime.strptime(hasta, "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
+                    if hasta else desde_dt + timedelta(days=7))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
+
+    if (hasta_dt - desde_dt).days > 366:
+        raise HTTPException(status_code=400, detail="La ventana no puede superar un año")
+
+    try:
+        cronograma = ver_cronograma(cliente_dni, repositorio, desde_dt, hasta_dt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "cliente_dni": cliente_dni,
+        "desde": desde_dt,
+        "hasta": hasta_dt,
+        "total": len(cronograma),
+        "clases": cronograma
+    }
+
+
+# ========================
+# LISTA DE ESPERA
+# ========================
+
+@admin_inscripcion_router.post("/espera/{clase_id}", response_model=ListaEsperaPosicion, status_code=status.HTTP_201_CREATED)
+def anotar_en_lista_espera(clase_id: int, datos: ListaEsperaCreate, session: Session = Depends(get_session)):
+    """Anotar a un cliente en la lista de espera de una clase llena"""
+    repositorio = AdaptadorListaEsperaSQL(session)
+    try:
+        repositorio.anotar(clase_id, datos.cliente_dni)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "clase_id": clase_id,
+        "cliente_dni": datos.cliente_dni,
+        "posicion": repositorio.consultar_posicion(clase_id, datos.cliente_dni)
+    }
+
+
+@admin_inscripcion_router.get("/espera/{clase_id}/{cliente_dni}", response_model=ListaEsperaPosicion)
+async def consultar_posicion_lista_espera(clase_id: int, cliente_dni: str,
+                                          session: AsyncSession = Depends(get_async_session)):
+    """Posición en la cola (1 = próximo); solo lectura, pensada para consultarse seguido"""
+    posicion = await AdaptadorListaEsperaAsyncSQL(session).consultar_posicion(clase_id, cliente_dni)
+    if posicion is None:
+        raise HTTPException(status_code=404, detail="El cliente no está en la lista de espera")
+    return {"clase_id": clase_id, "cliente_dni": cliente_dni, "posicion": posicion}
+
+
+@admin_inscripcion_router.delete("/espera/{clase_id}/{cliente_dni}")
+def salir_de_lista_espera(clase_id: int, cliente_dni: str, session: Session = Depends(get_session)):
+    if not AdaptadorListaEsperaSQL(session).quitar(clase_id, cliente_dni):
+        raise HTTPException(status_code=404, detail="El cliente no está en la lista de espera")
+    return {"message": "Cliente quitado de la lista de espera"}
+
+
 # ========================
 # REPORTES Y ESTADÍSTICAS
 # ========================
 
+@admin_inscripcion_router.get("/estadisticas", response_model=InscripcionStatsResponse)
+def obtener_estadisticas_inscripciones(
+    dias: int = Query(30, ge=1, le=365, description="Días hacia atrás para el desglose diario"),
+    repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
+):
+    """Estadísticas por estado, pago, clase y día en una sola consulta"""
+    return repositorio.obtener_estadisticas(dias)
+
+
 @admin_inscripcion_router.get("/reporte/clases-populares")
 def generar_reporte_clases_populares(
+    limite: int = Query(10, ge=1, le=100, description="Cantidad de clases a devolver"),
+    fecha_inicio: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD)"),
+    fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
+    estado: Optional[str] = Query(None),
     repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
 ):
     """Generar reporte de clases más populares"""
-    reporte = repositorio.obtener_clases_populares() or []
-
-    # Asegurar formato consistente
-    for item in reporte:
-        if "total_inscripciones" not in item and "inscripciones" in item:
-            item["total_inscripciones"] = item["inscripciones"]
+    filtros = _parse_filtros_reporte(fecha_inicio, fecha_fin, estado)
+    reporte = repositorio.obtener_clases_populares(limite=limite, **filtros) or []
 
     return {
         "total_clases": len(reporte),
-        "clases_populares": sorted(
-            reporte, 
-            key=lambda x: x.get("total_inscripciones", 0), 
-            reverse=True
-        )[:10]
+        "clases_populares": reporte
     }
-from typing import List, Dict
-from fastapi import APIRouter, Query, Depends
-from sqlmodel import Session, select
-from models.clase import Clase
-from database import get_session
 
-from typing import List, Dict
 
 @admin_inscripcion_router.get("/alertas/cupos-criticos", response_model=Dict[str, List[Dict]])
 def obtener_alertas_cupos_criticos(
     porcentaje_alerta: int = Query(80, ge=1, le=100, description="Porcentaje a partir del cual alertar"),
-    session: Session = Depends(get_session),
+    repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
 ):
     """
     Devuelve un diccionario con la lista de clases cuyo cupo esté por encima del porcentaje indicado.
     Ejemplo porcentaje_alerta=80 => clases con más del 80% del cupo ocupado.
     """
-    clases_query = session.exec(select(Clase)).all()
-    alertas = []
-
-    for clase in clases_query:
-        if clase.cupo_maximo and clase.inscripciones:
-            try:
-                cupo_max = int(clase.cupo_maximo)
-                ocupadas = len([i for i in clase.inscripciones if i.estado == "activo"])
-                porcentaje_ocupacion = (ocupadas / cupo_max) * 100
-
-                if porcentaje_ocupacion >= porcentaje_alerta:
-                    alertas.append({
-                        "nombre": clase.nombre,
-                        "instructor": getattr(clase, "instructor", None),
-                        "cupo_maximo": cupo_max,
-                        "ocupadas": ocupadas,
-                        "porcentaje_ocupacion": round(porcentaje_ocupacion, 2),
-                    })
-            except (ValueError, TypeError):
-                # Ignorar clases con cupo_maximo no válido
-                pass
-
-    return {"alertas": alertas}  # ✅ clave explícita
+    return {"alertas": repositorio.obtener_clases_cupo_critico(porcentaje_alerta)}  # ✅ clave explícita
 
 @admin_inscripcion_router.get("/reporte/clientes-activos")
 def generar_reporte_clientes_activos(
+    limite: int = Query(10, ge=1, le=100, description="Cantidad de clientes a devolver"),
+    fecha_inicio: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD)"),
+    fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
+    estado: Optional[str] = Query(None),
     repositorio: RepositorioInscripciones = Depends(get_repositorio_inscripciones)
 ):
     """Generar reporte de clientes más activos"""
-    reporte = repositorio.obtener_clientes_activos() or []
-
-    for item in reporte:
-        if "total_inscripciones" not in item and "inscripciones" in item:
-            item["total_inscripciones"] = item["inscripciones"]
+    filtros = _parse_filtros_reporte(fecha_inicio, fecha_fin, estado)
+    reporte = repositorio.obtener_clientes_activos(limite=limite, **filtros) or []
 
     return {
         "total_clientes": len(reporte),
-        "clientes_activos": sorted(
-            reporte, 
-            key=lambda x: x.get("total_inscripciones", 0),
-            reverse=True
-        )[:10]
+        "clientes_activos": reporte
     }
 
 
@@ -1,25 +1,27 @@
 # routers/mercado_pago_router.py
-from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy import select
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Dict, Any
 import json
 
-from database import get_session
+from database import get_session, get_async_session
 from Casos_de_uso.Pagos.procesar_pago_mercadopago import ProcesarPagoMercadoPagoCase
 from Casos_de_uso.Pagos.verificar_estado_pago import VerificarEstadoPagoCase
 from models import Pago, PagoCreate, Cliente, Transaccion, EstadoPago
 from servicios.mercado_pago import MercadoPagoService
 from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
-from config import get_db, MP_ACCESS_TOKEN, FRONTEND_URL, BACKEND_URL
-import requests
+from servicios.cliente_mercado_pago import api_mercadopago
+from servicios.webhooks import despertar_workers, metricas_webhooks
+from Adaptadores.adaptadorWebhookAsyncSQL import AdaptadorWebhookAsyncSQL
+from routers.admin.mercado_pago_router import datos_notificacion
+from config import get_db, FRONTEND_URL, BACKEND_URL
 import uuid
 from datetime import datetime
 
 mercado_pago_router = APIRouter(prefix="/api/mercado-pago", tags=["mercado-pago"])
 
-MP_BASE_URL = "https://api.mercadopago.com/checkout/preferences"
-HEADERS = {"Authorization": f"Bearer {MP_ACCESS_TOKEN}"}
 
 @mercado_pago_router.get("/pagos")
 def obtener_historial_pagos(db: Session = Depends(get_db)):
@@ -73,11 +75,11 @@ def crear_preferencia(pago_data: PagoCreate, db: Session = Depends(get_db)):
         "external_reference": str(uuid.uuid4()),
     }
 
-    response = requests.post(MP_BASE_URL, json=preferencia_data, headers=HEADERS)
-    if response.status_code != 201:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+    response = api_mercadopago("POST", "/checkout/preferences", json=preferencia_data)
+    if response["status"] != 201:
+        raise HTTPException(status_code=response["status"], detail=response["response"])
 
-    preferencia = response.json()
+    preferencia = response["response"]
 
     # Crear registro local de pago
     nuevo_pago = Pago(
@@ -102,41 +104,22 @@ def crear_preferencia(pago_data: PagoCreate, db: Session = Depends(get_db)):
     
 @mercado_pago_router.post("/webhook")
 async def webhook(
-    request: Request, 
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session)
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Webhook para notificaciones de Mercado Pago.
-    Procesa la notificación y actualiza el estado del pago local.
+    Se guarda en la bandeja y se responde enseguida; el estado del pago
+    local lo actualizan los workers de servicios.webhooks.
     """
-    try:
-        data = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Payload inválido")
-
-    payment_id = data.get("data", {}).get("id")
-    if not payment_id:
+    tipo, payment_id = await datos_notificacion(request)
+    if tipo != "payment" or not payment_id:
         return {"message": "sin id de pago"}
 
-    # Obtener info del pago desde Mercado Pago
-    resp = requests.get(f"https://api.mercadopago.com/v1/payments/{payment_id}", headers=HEADERS)
-    if resp.status_code != 200:
-        return {"message": "error al consultar pago", "detalle": resp.text}
-
-    pago_info = resp.json()
-    referencia = pago_info.get("external_reference")
-    estado = pago_info.get("status")
-
-    # Buscar pago local por referencia
-    pago = session.exec(select(Pago).where(Pago.referencia == referencia)).first()
-    if pago:
-        pago.estado_pago = EstadoPago[estado] if estado in EstadoPago.__members__ else EstadoPago.PENDIENTE
-        pago.fecha_actualizacion = datetime.utcnow()
-        session.add(pago)
-        session.commit()
-
-    return {"message": "notificación procesada", "estado": estado}
+    nueva = await AdaptadorWebhookAsyncSQL(session).registrar(tipo, payment_id)
+    metricas_webhooks.registrar_recepcion(nueva)
+    despertar_workers()
+    return {"message": "notificación recibida"}
     
 @mercado_pago_router.post("/crear-pago")
 def crear_pago_mercadopago(
@@ -1,11 +1,12 @@
 # routers/admin_pago_router.py
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlmodel import Session, select
 from typing import List, Optional
 from datetime import datetime, timedelta
 import uuid
 
-from database import get_session
+from database import get_session, get_async_session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.pago import (
     Pago, PagoCreate, PagoRead, PagoUpdate, PagoEstadoUpdate,
     PagoStatsResponse, EstadoPago
@@ -13,6 +14,10 @@ from models.pago import (
 from models.cliente import Cliente
 from models.transaccion import Transaccion
 from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+from Adaptadores.adaptadorPagoAsyncSQL import AdaptadorPagoAsyncSQL
+from Adaptadores.paginacion import LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from routers.exportacion import PATRON_EXPORTACION, respuesta_exportacion
+from routers.lotes import detalles_lote
 from Dominio.repositorios.repositorioPago import RepositorioPago
 
 # Importar casos de uso
@@ -29,6 +34,7 @@ def get_repositorio_pagos(session: Session = Depends(get_session)) -> Repositori
 
 @admin_pago_router.get("/", response_model=List[PagoRead])
 def listar_todos_los_pagos(
+    response: Response,
     estado_pago: Optional[EstadoPago] = Query(None),
     id_usuario: Optional[str] = Query(None),
     transaccion_id: Optional[int] = Query(None),
@@ -37,44 +43,41 @@ def listar_todos_los_pagos(
     fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
     monto_minimo: Optional[float] = Query(None, description="Monto mínimo"),
     monto_maximo: Optional[float] = Query(None, description="Monto máximo"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO, description="Cantidad de pagos por página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor por la página anterior"),
+    export: Optional[str] = Query(None, regex=PATRON_EXPORTACION, description="ndjson o csv: descarga completa en streaming"),
     repositorio: RepositorioPago = Depends(get_repositorio_pagos)
 ):
-    """Obtener todos los pagos (con filtros avanzados) - Solo para administradores"""
+    """Obtener los pagos paginados (con filtros avanzados) - Solo para administradores"""
     try:
         fecha_ini = datetime.strptime(fecha_inicio, "%Y-%m-%d") if fecha_inicio else None
-        fecha_fin_dt = datetime.strptime(fecha_fin, "%Y-%m-%d") if fecha_fin else None
+        fecha_fin_dt = datetime.strptime(fecha_fin, "%Y-%m-%d") + timedelta(days=1) if fecha_fin else None
     except ValueError:
         raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
     
-    pagos = repositorio.listar_todos_los_pagos()
-    
-    # Aplicar filtros adicionales
-    if estado_pago:
-        pagos = [p for p in pagos if p.estado_pago == estado_pago]
-    
-    if id_usuario:
-        pagos = [p for p in pagos if p.id_usuario == id_usuario]
-    
-    if transaccion_id:
-        pagos = [p for p in pagos if p.transaccion_id == transaccion_id]
-    
-    if metodo_pago:
-        pagos = [p for p in pagos if p.metodo_pago == metodo_pago]
-    
-    if fecha_ini:
-        pagos = [p for p in pagos if p.fecha_creacion >= fecha_ini]
-    
-    if fecha_fin_dt:
-        fecha_fin_dt = fecha_fin_dt + timedelta(days=1)
-        pagos = [p for p in pagos if p.fecha_creacion < fecha_fin_dt]
+    filtros = dict(
+        estado_pago=estado_pago,
+        id_usuario=id_usuario,
+        transaccion_id=transaccion_id,
+        metodo_pago=metodo_pago,
+        fecha_inicio=fecha_ini,
+        fecha_fin=fecha_fin_dt,
+        monto_minimo=monto_minimo,
+        monto_maximo=monto_maximo
+    )
+    if export:
+        return respuesta_exportacion(repositorio.exportar_pagos(**filtros), export, "pagos")
     
-    if monto_minimo is not None:
-        pagos = [p for p in pagos if p.monto >= monto_minimo]
+    try:
+        pagina = repositorio.listar_pagos_paginados(limit=limit, cursor=cursor, **filtros)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if monto_maximo is not None:
-        pagos = [p for p in pagos if p.monto <= monto_maximo]
+    # El cuerpo sigue siendo una lista; el cursor de la página siguiente viaja en un header
+    if pagina["next_cursor"]:
+        response.headers["X-Next-Cursor"] = pagina["next_cursor"]
     
-    return sorted(pagos, key=lambda x: x.fecha_creacion, reverse=True)
+    return pagina["items"]
 
 @admin_pago_router.get("/{pago_id}", response_model=PagoRead)
 def obtener_pago_detallado(
@@ -87,6 +90,22 @@ def obtener_pago_detallado(
         raise HTTPException(status_code=404, detail="Pago no encontrado")
     return pago
 
+@admin_pago_router.get("/{pago_id}/estado")
+async def consultar_estado_pago(
+    pago_id: int,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Estado actual de un pago, pensado para el polling del checkout"""
+    pago = await AdaptadorPagoAsyncSQL(session).consultar_pago(pago_id)
+    if not pago:
+        raise HTTPException(status_code=404, detail="Pago no encontrado")
+    return {
+        "pago_id": pago.id,
+        "estado_pago": pago.estado_pago,
+        "monto": pago.monto,
+        "fecha_actualizacion": pago.fecha_actualizacion
+    }
+
 @admin_pago_router.get("/referencia/{referencia}/completo", response_model=PagoRead)
 def obtener_pago_por_referencia_completo(
     referencia: str, 
@@ -245,31 +264,16 @@ def eliminar_pago_admin(
 @admin_pago_router.delete("/batch/eliminar", status_code=status.HTTP_200_OK)
 def eliminar_pagos_masivos(
     pago_ids: List[int] = Query(..., description="Lista de IDs a eliminar"),
-    session: Session = Depends(get_session)
+    repositorio: RepositorioPago = Depends(get_repositorio_pagos)
 ):
     """Eliminar múltiples pagos de forma masiva - Solo para administradores"""
-    caso_uso = EliminarPagoAdminCase(session)
-    resultados = []
-    
-    for pago_id in pago_ids:
-        try:
-            eliminado = caso_uso.ejecutar(pago_id)
-            resultados.append({
-                "id": pago_id,
-                "eliminado": eliminado,
-                "mensaje": "Eliminado correctamente" if eliminado else "No encontrado"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": pago_id,
-                "eliminado": False,
-                "error": str(e)
-            })
-    
+    resultados = repositorio.eliminar_pagos_permanentemente(pago_ids)
+    detalles = detalles_lote(pago_ids, resultados, "eliminado", "Eliminado correctamente")
+
     return {
         "total_solicitados": len(pago_ids),
-        "eliminados_exitosos": len([r for r in resultados if r.get("eliminado")]),
-        "detalles": resultados
+        "eliminados_exitosos": len([r for r in detalles if r.get("eliminado")]),
+        "detalles": detalles
     }
 
 @admin_pago_router.get("/estadisticas/avanzadas", response_model=PagoStatsResponse)
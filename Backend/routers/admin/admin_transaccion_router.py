@@ -1,5 +1,5 @@
 # routers/admin_transaccion_router.py
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlmodel import Session, select
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from models.transaccion import (
 )
 from models.cliente import Cliente
 from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
+from Adaptadores.paginacion import LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from routers.exportacion import PATRON_EXPORTACION, respuesta_exportacion
+from routers.lotes import detalles_lote
 from Dominio.repositorios.repositorioTransaccion import RepositorioTransaccion
 
 # Importar casos de uso
@@ -27,6 +30,7 @@ def get_repositorio_transacciones(session: Session = Depends(get_session)) -> Re
 
 @admin_transaccion_router.get("/", response_model=List[TransaccionRead])
 def listar_todas_las_transacciones(
+    response: Response,
     estado: Optional[EstadoPago] = Query(None),
     cliente_dni: Optional[str] = Query(None),
     metodo_pago: Optional[MetodoPago] = Query(None),
@@ -34,41 +38,40 @@ def listar_todas_las_transacciones(
     fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
     monto_minimo: Optional[float] = Query(None, description="Monto mínimo"),
     monto_maximo: Optional[float] = Query(None, description="Monto máximo"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO, description="Cantidad de transacciones por página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor por la página anterior"),
+    export: Optional[str] = Query(None, regex=PATRON_EXPORTACION, description="ndjson o csv: descarga completa en streaming"),
     repositorio: RepositorioTransaccion = Depends(get_repositorio_transacciones)
 ):
-    """Obtener todas las transacciones (con filtros avanzados) - Solo para administradores"""
+    """Obtener las transacciones paginadas (con filtros avanzados) - Solo para administradores"""
     try:
         fecha_ini = datetime.strptime(fecha_inicio, "%Y-%m-%d") if fecha_inicio else None
-        fecha_fin_dt = datetime.strptime(fecha_fin, "%Y-%m-%d") if fecha_fin else None
+        fecha_fin_dt = datetime.strptime(fecha_fin, "%Y-%m-%d") + timedelta(days=1) if fecha_fin else None
     except ValueError:
         raise HTTPException(status_code=400, detail="Formato de fecha inválido. Use YYYY-MM-DD")
     
-    transacciones = repositorio.listar_todas_las_transacciones()
-    
-    # Aplicar filtros adicionales
-    if estado:
-        transacciones = [t for t in transacciones if t.estado == estado]
-    
-    if cliente_dni:
-        transacciones = [t for t in transacciones if t.cliente_dni == cliente_dni]
-    
-    if metodo_pago:
-        transacciones = [t for t in transacciones if t.metodo_pago == metodo_pago]
-    
-    if fecha_ini:
-        transacciones = [t for t in transacciones if t.fecha_creacion >= fecha_ini]
-    
-    if fecha_fin_dt:
-        fecha_fin_dt = fecha_fin_dt + timedelta(days=1)
-        transacciones = [t for t in transacciones if t.fecha_creacion < fecha_fin_dt]
+    filtros = dict(
+        estado=estado,
+        cliente_dni=cliente_dni,
+        metodo_pago=metodo_pago,
+        fecha_inicio=fecha_ini,
+        fecha_fin=fecha_fin_dt,
+        monto_minimo=monto_minimo,
+        monto_maximo=monto_maximo
+    )
+    if export:
+        return respuesta_exportacion(repositorio.exportar_transacciones(**filtros), export, "transacciones")
     
-    if monto_minimo is not None:
-        transacciones = [t for t in transacciones if t.monto >= monto_minimo]
+    try:
+        pagina = repositorio.listar_transacciones_paginadas(limit=limit, cursor=cursor, **filtros)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if monto_maximo is not None:
-        transacciones = [t for t in transacciones if t.monto <= monto_maximo]
+    # El cuerpo sigue siendo una lista; el cursor de la página siguiente viaja en un header
+    if pagina["next_cursor"]:
+        response.headers["X-Next-Cursor"] = pagina["next_cursor"]
     
-    return sorted(transacciones, key=lambda x: x.fecha_creacion, reverse=True)
+    return pagina["items"]
 
 @admin_transaccion_router.get("/{transaccion_id}", response_model=TransaccionRead)
 def obtener_transaccion_detallada(
@@ -207,31 +210,16 @@ def eliminar_transaccion_admin(
 @admin_transaccion_router.delete("/batch/eliminar", status_code=status.HTTP_200_OK)
 def eliminar_transacciones_masivas(
     transaccion_ids: List[int] = Query(..., description="Lista de IDs a eliminar"),
-    session: Session = Depends(get_session)
+    repositorio: RepositorioTransaccion = Depends(get_repositorio_transacciones)
 ):
     """Eliminar múltiples transacciones de forma masiva - Solo para administradores"""
-    caso_uso = EliminarTransaccionAdminCase(session)
-    resultados = []
-    
-    for transaccion_id in transaccion_ids:
-        try:
-            eliminada = caso_uso.ejecutar(transaccion_id)
-            resultados.append({
-                "id": transaccion_id,
-                "eliminada": eliminada,
-                "mensaje": "Eliminada correctamente" if eliminada else "No encontrada"
-            })
-        except Exception as e:
-            resultados.append({
-                "id": transaccion_id,
-                "eliminada": False,
-                "error": str(e)
-            })
-    
+    resultados = repositorio.eliminar_transacciones_permanentemente(transaccion_ids)
+    detalles = detalles_lote(transaccion_ids, resultados, "eliminada", "Eliminada correctamente")
+
     return {
         "total_solicitadas": len(transaccion_ids),
-        "eliminadas_exitosas": len([r for r in resultados if r.get("eliminada")]),
-        "detalles": resultados
+        "eliminadas_exitosas": len([r for r in detalles if r.get("eliminada")]),
+        "detalles": detalles
     }
 
 @admin_transaccion_router.get("/estadisticas/avanzadas", response_model=TransaccionStatsResponse)
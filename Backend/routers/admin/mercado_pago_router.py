@@ -10,14 +10,16 @@ from sqlmodel import Session
 from typing import Dict, Any
 import json
 
-from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
-from database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from Adaptadores.adaptadorWebhookAsyncSQL import AdaptadorWebhookAsyncSQL
+from database import get_session, get_async_session
 from Casos_de_uso.Pagos.procesar_pago_mercadopago import ProcesarPagoMercadoPagoCase
 from Casos_de_uso.Pagos.verificar_estado_pago import VerificarEstadoPagoCase
 from models.cliente import Cliente
 from models.pago import EstadoPago, Pago, PagoCreate
 from models.transaccion import Transaccion
-from servicios.mercado_pago import MercadoPagoService
+from servicios.webhooks import despertar_workers, metricas_webhooks
 
 MP_ACCESS_TOKEN = os.getenv("MERCADOPAGO_ACCESS_TOKEN")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -26,6 +28,21 @@ MP_BASE_URL = "https://api.mercadopago.com/checkout/preferences"
 HEADERS = {"Authorization": f"Bearer {MP_ACCESS_TOKEN}"}
 
 mercado_pago_router = APIRouter(prefix="/api/mercado-pago", tags=["mercado-pago"])
+
+
+async def datos_notificacion(request: Request):
+    """(tipo, id del recurso) de una notificación: cuerpo JSON o query string (?type=&data.id= / ?topic=&id=)"""
+    try:
+        data = await request.json()
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    parametros = request.query_params
+    tipo = data.get("type") or data.get("topic") or parametros.get("type") or parametros.get("topic")
+    recurso_id = (data.get("data") or {}).get("id") or parametros.get("data.id") or parametros.get("id")
+    return tipo, str(recurso_id) if recurso_id else None
+
 class PreferenciaCreate(BaseModel):
     cliente_dni: str
     monto: float
@@ -71,32 +88,22 @@ def verificar_pago(
     return resultado
 
 @mercado_pago_router.post("/webhook")
-async def webhook_mercadopago(request: Request, session: Session = Depends(get_session)):
-    """Webhook para notificaciones de Mercado Pago"""
+async def webhook_mercadopago(request: Request, session: AsyncSession = Depends(get_async_session)):
+    """
+    Webhook para notificaciones de Mercado Pago: se guarda en la bandeja y se
+    responde enseguida; los workers de servicios.webhooks consultan el pago
+    y actualizan el estado local. Los reenvíos del mismo pago se fusionan.
+    """
+    tipo, recurso_id = await datos_notificacion(request)
+    if tipo != "payment" or not recurso_id:
+        return {"status": "ignorada"}
+
     try:
-        data = await request.json()
-        
-        # Mercado Pago envía el ID del pago
-        if data.get("type") == "payment":
-            payment_id = data["data"]["id"]
-            
-            # Usar el servicio para verificar el pago
-            mp_service = MercadoPagoService()
-            payment_info = mp_service.verificar_pago(payment_id)
-            
-            if "error" not in payment_info:
-                # Buscar pago por referencia externa
-                repositorio_pagos = AdaptadorPagoSQL(session)
-                pago = repositorio_pagos.consultar_pago_por_referencia(
-                    payment_info.get("external_reference", "")
-                )
-                
-                if pago:
-                    # Actualizar estado
-                    caso_uso = VerificarEstadoPagoCase(session)
-                    caso_uso.ejecutar(pago.id)
-            
-        return {"status": "ok"}
-        
+        nueva = await AdaptadorWebhookAsyncSQL(session).registrar(tipo, recurso_id)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error procesando webhook: {str(e)}")
\ No newline at end of file
+        # Sin 200 Mercado Pago reintenta la notificación más tarde
+        raise HTTPException(status_code=503, detail=f"No se pudo registrar la notificación: {str(e)}")
+
+    metricas_webhooks.registrar_recepcion(nueva)
+    despertar_workers()
+    return {"status": "ok"}
@@ -0,0 +1,65 @@
+# routers/exportacion.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+TIPOS_EXPORTACION = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+PATRON_EXPORTACION = "^(ndjson|csv)$"
+FILAS_POR_BLOQUE = 500
+
+
+def _valor_exportable(valor: Any) -> Any:
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+
+def _bloques_ndjson(filas: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    bloque = []
+    for fila in filas:
+        bloque.append(json.dumps({k: _valor_exportable(v) for k, v in fila.items()}, ensure_ascii=False))
+        if len(bloque) >= FILAS_POR_BLOQUE:
+            yield "\n".join(bloque) + "\n"
+            bloque = []
+    if bloque:
+        yield "\n".join(bloque) + "\n"
+
+
+def _bloques_csv(filas: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    escritor = None
+    pendientes = 0
+    for fila in filas:
+        if escritor is None:
+            # El encabezado sale de la primera fila
+            escritor = csv.DictWriter(buffer, fieldnames=list(fila.keys()))
+            escritor.writeheader()
+        escritor.writerow({k: _valor_exportable(v) for k, v in fila.items()})
+        pendientes += 1
+        if pendientes >= FILAS_POR_BLOQUE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pendientes = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def respuesta_exportacion(filas: Iterable[Dict[str, Any]], formato: str, nombre: str) -> StreamingResponse:
+    """Enviar las filas a medida que llegan de la base, como NDJSON o CSV"""
+    bloques = _bloques_csv(filas) if formato == "csv" else _bloques_ndjson(filas)
+    return StreamingResponse(
+        bloques,
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'},
+    )
@@ -0,0 +1,92 @@
+# routers/importacion.py
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from routers.exportacion import TIPOS_EXPORTACION
+
+PATRON_IMPORTACION = "^(ndjson|csv)$"
+FILAS_POR_LOTE = 1000
+
+Fila = Tuple[int, Dict[str, Any]]
+
+
+def formato_de(content_type: Optional[str], formato: Optional[str]) -> Optional[str]:
+    """Formato pedido por query o, si no, deducido del Content-Type (los mismos de la exportación)"""
+    if formato:
+        return formato
+    tipo = (content_type or "").split(";")[0].strip().lower()
+    for nombre, media_type in TIPOS_EXPORTACION.items():
+        if tipo == media_type:
+            return nombre
+    return None
+
+
+async def _lineas(bloques: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Líneas completas del cuerpo a medida que llegan los bloques, sin leerlo entero"""
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    pendiente = ""
+    async for bloque in bloques:
+        pendiente += decodificador.decode(bloque)
+        *lineas, pendiente = pendiente.split("\n")
+        for linea in lineas:
+            yield linea.rstrip("\r")
+    pendiente += decodificador.decode(b"", final=True)
+    if pendiente.rstrip("\r"):
+        yield pendiente.rstrip("\r")
+
+
+async def _filas_ndjson(bloques: AsyncIterator[bytes]) -> AsyncIterator[Fila]:
+    numero = 0
+    async for linea in _lineas(bloques):
+        numero += 1
+        if not linea.strip():
+            continue
+        try:
+            datos = json.loads(linea)
+        except ValueError as e:
+            datos = {"_error": f"JSON inválido: {e}"}
+        if not isinstance(datos, dict):
+            datos = {"_error": "Cada línea debe ser un objeto JSON"}
+        yield numero, datos
+
+
+async def _filas_csv(bloques: AsyncIterator[bytes]) -> AsyncIterator[Fila]:
+    encabezado: Optional[List[str]] = None
+    registro = ""
+    numero = 0
+    async for linea in _lineas(bloques):
+        registro = f"{registro}\n{linea}" if registro else linea
+        # Un campo entre comillas puede contener saltos de línea: el registro
+        # está completo cuando las comillas quedan balanceadas
+        if registro.count('"') % 2:
+            continue
+        valores = next(csv.reader([registro]), [])
+        registro = ""
+        if not any(v.strip() for v in valores):
+            continue
+        if encabezado is None:
+            encabezado = [v.strip() for v in valores]
+            continue
+        numero += 1
+        if len(valores) != len(encabezado):
+            yield numero, {"_error": f"Se esperaban {len(encabezado)} columnas y hay {len(valores)}"}
+        else:
+            yield numero, dict(zip(encabezado, valores))
+    if registro:
+        yield numero + 1, {"_error": "Comillas sin cerrar al final del archivo"}
+
+
+async def lotes_de_filas(bloques: AsyncIterator[bytes], formato: str,
+                         filas_por_lote: int = FILAS_POR_LOTE) -> AsyncIterator[List[Fila]]:
+    """Filas (número, datos) del cuerpo subido, agrupadas de a filas_por_lote"""
+    filas = _filas_csv(bloques) if formato == "csv" else _filas_ndjson(bloques)
+    lote: List[Fila] = []
+    async for fila in filas:
+        lote.append(fila)
+        if len(lote) >= filas_por_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
@@ -0,0 +1,15 @@
+# routers/lotes.py
+from typing import Any, Dict, List, Optional
+
+
+def detalles_lote(ids: List[int], resultados: Dict[int, Optional[str]], campo: str,
+                  mensaje_ok: str, clave_motivo: str = "error") -> List[Dict[str, Any]]:
+    """Detalle por id de una operación masiva, en el orden pedido y con el formato de siempre"""
+    detalles = []
+    for id_ in ids:
+        motivo = resultados.get(id_)
+        if motivo is None:
+            detalles.append({"id": id_, campo: True, "mensaje": mensaje_ok})
+        else:
+            detalles.append({"id": id_, campo: False, clave_motivo: motivo})
+    return detalles
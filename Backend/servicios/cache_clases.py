@@ -0,0 +1,334 @@
+# servicios/cache_clases.py
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, time as hora
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.instrumentation import manager_of_class
+
+from models.clase import Clase
+from servicios import invalidacion
+
+TTL_SEGUNDOS = int(os.getenv("CACHE_CLASES_TTL", "300"))
+MAX_ENTRADAS = int(os.getenv("CACHE_CLASES_MAX_ENTRADAS", "1024"))
+
+
+class BackendCache(ABC):
+    """Almacén clave -> bytes con TTL; la lógica del catálogo vive en CacheCatalogoClases"""
+
+    nombre = "backend"
+
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def guardar(self, clave: str, valor: bytes, ttl: int) -> None:
+        pass
+
+    def obtener_varios(self, claves: List[str]) -> List[Optional[bytes]]:
+        return [self.obtener(clave) for clave in claves]
+
+    @abstractmethod
+    def eliminar(self, clave: str) -> None:
+        pass
+
+    @abstractmethod
+    def incrementar(self, clave: str) -> int:
+        pass
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {}
+
+
+class CacheMemoria(BackendCache):
+    """LRU con TTL dentro del proceso (backend por defecto)"""
+
+    nombre = "memoria"
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS, reloj: Callable[[], float] = time.monotonic):
+        self.max_entradas = max_entradas
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        # Los contadores de versión van aparte: si el LRU los expulsara
+        # volverían a 0 y revivirían entradas de versiones anteriores
+        self._contadores: Dict[str, int] = {}
+        self.expulsiones = 0
+        self.expiradas = 0
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        with self._lock:
+            if clave in self._contadores:
+                return str(self._contadores[clave]).encode()
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            vence, valor = entrada
+            if vence is not None and vence <= self._reloj():
+                del self._entradas[clave]
+                self.expiradas += 1
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave: str, valor: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entradas[clave] = (self._reloj() + ttl if ttl else None, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+
+    def eliminar(self, clave: str) -> None:
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def incrementar(self, clave: str) -> int:
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + 1
+            return self._contadores[clave]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._contadores.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "expulsiones": self.expulsiones,
+                "expiradas": self.expiradas,
+            }
+
+
+class CacheRedis(BackendCache):
+    """
+    Backend compartido entre procesos sobre cualquier cliente compatible con
+    la API de redis-py (get/set/delete/incr): Redis, Valkey, KeyDB, etc.
+    """
+
+    nombre = "redis"
+
+    def __init__(self, cliente=None, url: Optional[str] = None, prefijo: str = "gimnasio:"):
+        if cliente is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_CLASES_BACKEND=redis requiere el paquete 'redis'")
+            cliente = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.cliente = cliente
+        self.prefijo = prefijo
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        return self.cliente.get(self.prefijo + clave)
+
+    def obtener_varios(self, claves: List[str]) -> List[Optional[bytes]]:
+        # Un solo MGET en vez de un GET por clave
+        return self.cliente.mget([self.prefijo + clave for clave in claves]) if claves else []
+
+    def guardar(self, clave: str, valor: bytes, ttl: int) -> None:
+        self.cliente.set(self.prefijo + clave, valor, ex=ttl or None)
+
+    def eliminar(self, clave: str) -> None:
+        self.cliente.delete(self.prefijo + clave)
+
+    def incrementar(self, clave: str) -> int:
+        return int(self.cliente.incr(self.prefijo + clave))
+
+    def estadisticas(self) -> Dict[str, Any]:
+        try:
+            info = self.cliente.info("stats")
+            return {"expulsiones": info.get("evicted_keys"), "expiradas": info.get("expired_keys")}
+        except Exception:
+            return {}
+
+
+# Los contadores de ocupación cambian con cada inscripción y ninguna respuesta
+# del catálogo los expone (la ocupación se lee con inscritos_activos_total):
+# quedan fuera de la cache para que inscribirse no la invalide
+_CONTADORES = {"inscritos_activos", "inscritos_historicos"}
+_CACHEADAS = [columna.name for columna in Clase.__table__.columns if columna.name not in _CONTADORES]
+
+
+def _columnas(clase: Clase) -> Dict[str, Any]:
+    return {nombre: getattr(clase, nombre) for nombre in _CACHEADAS}
+
+
+# Columnas de fecha/hora: en JSON viajan como ISO y se vuelven a parsear al leer
+_TEMPORALES = {nombre: campo.type_.fromisoformat for nombre, campo in Clase.__fields__.items()
+               if campo.type_ in (datetime, date, hora)}
+
+
+def _a_json(valor: Any) -> str:
+    if isinstance(valor, (datetime, date, hora)):
+        return valor.isoformat()
+    raise TypeError(f"{type(valor).__name__} no se puede guardar en la cache")
+
+
+def _serializar(filas: Any) -> bytes:
+    """JSON y no pickle: lo que se lee de un Redis compartido no debe poder ejecutar código"""
+    return json.dumps(filas, default=_a_json).encode()
+
+
+def _desde_json(fila: Dict[str, Any]) -> Dict[str, Any]:
+    for nombre, parsear in _TEMPORALES.items():
+        if isinstance(fila.get(nombre), str):
+            fila[nombre] = parsear(fila[nombre])
+    return fila
+
+
+def _hidratar(fila: Dict[str, Any]) -> Clase:
+    """
+    Clase sin sesión armada como lo hace el ORM al cargar una fila, sin
+    pasar por __init__: la validación de Clase(**fila) costaba más que
+    la consulta que la cache evita.
+    """
+    clase = manager_of_class(Clase).new_instance()
+    object.__setattr__(clase, "__fields_set__", set(fila))
+    clase.__dict__.update(fila)
+    return clase
+
+
+class CacheCatalogoClases:
+    """
+    Catálogo de clases cacheado. Cada entrada lleva en la clave la versión
+    vigente al momento de leer: las escrituras incrementan la versión en
+    lugar de borrar claves, así una lectura lenta que termina después de
+    una escritura guarda bajo una versión que ya nadie consulta.
+
+    - Listados: una versión común, porque un cambio en cualquier clase puede
+      hacerla entrar o salir de cualquier listado.
+    - Clase por id: versión propia de cada clase, así modificar una no
+      invalida el detalle de las demás.
+    """
+
+    def __init__(self, backend: BackendCache, ttl_segundos: int = TTL_SEGUNDOS):
+        self.backend = backend
+        self.ttl_segundos = ttl_segundos
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    # ---- claves ----
+    def _version(self, clave: str) -> int:
+        valor = self.backend.obtener(clave)
+        return int(valor) if valor else 0
+
+    def clave_listado(self, consulta: str, filtros: Dict[str, Any]) -> str:
+        version = self._version("clases:version")
+        return f"clases:v{version}:{consulta}:{json.dumps(filtros, sort_keys=True, default=str)}"
+
+    def clave_clase(self, clase_id: int) -> str:
+        return f"clase:{clase_id}:v{self._version(f'clase:{clase_id}:version')}"
+
+    # ---- lectura ----
+    def _leer(self, clave: str) -> Optional[Any]:
+        valor = self.backend.obtener(clave)
+        with self._lock:
+            if valor is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+        return json.loads(valor)
+
+    def obtener_listado(self, clave: str) -> Optional[List[Clase]]:
+        filas = self._leer(clave)
+        return None if filas is None else [_hidratar(_desde_json(fila)) for fila in filas]
+
+    def guardar_listado(self, clave: str, clases: List[Clase]) -> None:
+        self.backend.guardar(clave, _serializar([_columnas(c) for c in clases]), self.ttl_segundos)
+
+    def obtener_clase(self, clave: str) -> Optional[Clase]:
+        fila = self._leer(clave)
+        return None if fila is None else _hidratar(_desde_json(fila))
+
+    def guardar_clase(self, clave: str, clase: Clase) -> None:
+        self.backend.guardar(clave, _serializar(_columnas(clase)), self.ttl_segundos)
+
+    # ---- escritura ----
+    def invalidar_clase(self, clase_id: int, clase: Optional[Clase] = None) -> None:
+        """Invalidar una clase y los listados; si se pasa la clase ya guardada, se escribe directo"""
+        self.backend.incrementar(f"clase:{clase_id}:version")
+        self.backend.incrementar("clases:version")
+        with self._lock:
+            self.invalidaciones += 1
+        if clase is not None:
+            self.guardar_clase(self.clave_clase(clase_id), clase)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            datos = {
+                "backend": self.backend.nombre,
+                "ttl_segundos": self.ttl_segundos,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "invalidaciones": self.invalidaciones,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            }
+        datos.update(self.backend.estadisticas())
+        return datos
+
+
+def crear_backend_cache() -> BackendCache:
+    backend = os.getenv("CACHE_CLASES_BACKEND", "memoria").lower()
+    if backend == "redis":
+        return CacheRedis(url=os.getenv("CACHE_CLASES_URL"))
+    return CacheMemoria()
+
+
+cache_clases = CacheCatalogoClases(crear_backend_cache())
+
+
+# Cualquier escritura de clases por la sesión invalida la cache compartida,
+# no solo las que pasan por AdaptadorClaseCache: el adaptador SQL usado
+# directo y los UPDATE/DELETE masivos. Las que solo mueven los contadores
+# de ocupación no tocan nada cacheado y se ignoran. Se aplica al confirmar.
+def _invalidar_clases(clase_ids: set) -> None:
+    for clase_id in clase_ids:
+        cache_clases.invalidar_clase(clase_id)
+
+
+invalidacion.registrar("clases", _invalidar_clases)
+
+
+@event.listens_for(Clase, "after_insert")
+@event.listens_for(Clase, "after_delete")
+def _clase_escrita(mapper, connection, clase: Clase) -> None:
+    invalidacion.anotar_objeto(clase, "clases", clase.id)
+
+
+@event.listens_for(Clase, "after_update")
+def _clase_modificada(mapper, connection, clase: Clase) -> None:
+    atributos = inspect(clase).attrs
+    if any(atributos[nombre].history.has_changes() for nombre in _CACHEADAS):
+        invalidacion.anotar_objeto(clase, "clases", clase.id)
+
+
+def _solo_contadores(sentencia) -> bool:
+    valores = sentencia._ordered_values or list((sentencia._values or {}).items())
+    return bool(valores) and {getattr(columna, "key", columna) for columna, _ in valores} <= _CONTADORES
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _escritura_masiva(estado) -> None:
+    if not (estado.is_update or estado.is_delete) or estado.bind_mapper is not inspect(Clase):
+        return
+    if estado.is_update and _solo_contadores(estado.statement):
+        return  # reserva_cupo y similares: solo ocupación
+    # Las filas afectadas se leen antes del UPDATE/DELETE, en la misma transacción
+    consulta = select(Clase.id)
+    if estado.statement.whereclause is not None:
+        consulta = consulta.where(estado.statement.whereclause)
+    clase_ids = estado.session.execute(consulta).scalars().all()
+    invalidacion.anotar(estado.session, "clases", clase_ids)
@@ -0,0 +1,339 @@
+# servicios/cliente_mercado_pago.py
+"""
+Cliente HTTP compartido por todo el proceso para la API de Mercado Pago.
+
+Extiende mercadopago.http.HttpClient (get/post/put/delete que devuelven
+{"status", "response"}), así el SDK lo usa tal cual, y suma:
+
+- Una sola requests.Session con pool de conexiones keep-alive.
+- Timeouts de conexión y lectura explícitos (el SDK usa 60 s para todo).
+- Reintentos acotados con backoff exponencial y jitter completo ante
+  errores de red, 429 y 5xx. Los POST llevan X-Idempotency-Key, así
+  reintentarlos no duplica preferencias ni reembolsos.
+- Un corta circuitos: después de N fallas seguidas deja de llamar durante
+  unos segundos y responde enseguida con CircuitoAbiertoError.
+- Histogramas de latencia por operación, expuestos en /health/mercado-pago.
+
+MERCADOPAGO_API_URL permite apuntar a un servidor local de prueba.
+"""
+import bisect
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import mercadopago
+import requests
+from mercadopago.http import HttpClient
+from requests.adapters import HTTPAdapter
+
+API_URL_OFICIAL = "https://api.mercadopago.com"
+API_URL = os.getenv("MERCADOPAGO_API_URL", API_URL_OFICIAL).rstrip("/")
+TIMEOUT_CONEXION = float(os.getenv("MERCADOPAGO_TIMEOUT_CONEXION", "3.05"))
+TIMEOUT_LECTURA = float(os.getenv("MERCADOPAGO_TIMEOUT_LECTURA", "10"))
+MAX_REINTENTOS = int(os.getenv("MERCADOPAGO_MAX_REINTENTOS", "2"))
+BACKOFF_BASE = float(os.getenv("MERCADOPAGO_BACKOFF_BASE", "0.2"))
+BACKOFF_TOPE = float(os.getenv("MERCADOPAGO_BACKOFF_TOPE", "2"))
+POOL_CONEXIONES = int(os.getenv("MERCADOPAGO_POOL_CONEXIONES", "20"))
+CIRCUITO_UMBRAL_FALLOS = int(os.getenv("MERCADOPAGO_CIRCUITO_UMBRAL", "5"))
+CIRCUITO_SEGUNDOS_ABIERTO = float(os.getenv("MERCADOPAGO_CIRCUITO_SEGUNDOS", "30"))
+
+ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+LIMITES_LATENCIA_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CircuitoAbiertoError(Exception):
+    """Mercado Pago viene fallando: no se lo llama hasta que pase la ventana de espera"""
+
+    def __init__(self, segundos_restantes: float):
+        self.segundos_restantes = segundos_restantes
+        super().__init__(f"Mercado Pago no disponible, reintentar en {segundos_restantes:.0f} s")
+
+
+class CortaCircuitos:
+    """
+    cerrado -> abierto tras `umbral_fallos` fallas seguidas; abierto ->
+    semiabierto al vencer `segundos_abierto`, donde pasa una sola llamada
+    de prueba: si sale bien se cierra, si falla vuelve a abrirse.
+    """
+
+    def __init__(self, umbral_fallos: int = CIRCUITO_UMBRAL_FALLOS,
+                 segundos_abierto: float = CIRCUITO_SEGUNDOS_ABIERTO,
+                 reloj: Callable[[], float] = time.monotonic):
+        self.umbral_fallos = umbral_fallos
+        self.segundos_abierto = segundos_abierto
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self.estado = "cerrado"
+        self.fallos_seguidos = 0
+        self.aperturas = 0
+        self.rechazadas = 0
+        self._abierto_hasta = 0.0
+        self._prueba_en_curso = False
+
+    def permitir(self) -> None:
+        with self._lock:
+            if self.estado == "abierto":
+                restante = self._abierto_hasta - self._reloj()
+                if restante > 0:
+                    self.rechazadas += 1
+                    raise CircuitoAbiertoError(restante)
+                self.estado = "semiabierto"
+            if self.estado == "semiabierto":
+                if self._prueba_en_curso:
+                    self.rechazadas += 1
+                    raise CircuitoAbiertoError(0)
+                self._prueba_en_curso = True
+
+    def registrar_exito(self) -> None:
+        with self._lock:
+            self.estado = "cerrado"
+            self.fallos_seguidos = 0
+            self._prueba_en_curso = False
+
+    def registrar_fallo(self) -> None:
+        with self._lock:
+            self.fallos_seguidos += 1
+            self._prueba_en_curso = False
+            if self.estado == "semiabierto" or self.fallos_seguidos >= self.umbral_fallos:
+                if self.estado != "abierto":
+                    self.aperturas += 1
+                self.estado = "abierto"
+                self._abierto_hasta = self._reloj() + self.segundos_abierto
+
+    def liberar_prueba(self) -> None:
+        """La llamada terminó sin resultado (excepción ajena a la red): otra puede probar"""
+        with self._lock:
+            self._prueba_en_curso = False
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"estado": self.estado, "fallos_seguidos": self.fallos_seguidos,
+                    "aperturas": self.aperturas, "rechazadas": self.rechazadas}
+
+
+class HistogramaLatencia:
+    """Cantidad de llamadas por rango de milisegundos, con suma y máximo"""
+
+    def __init__(self, limites_ms: Tuple[float, ...] = LIMITES_LATENCIA_MS):
+        self.limites_ms = limites_ms
+        self.cubetas = [0] * (len(limites_ms) + 1)
+        self.cantidad = 0
+        self.suma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, ms: float) -> None:
+        self.cubetas[bisect.bisect_left(self.limites_ms, ms)] += 1
+        self.cantidad += 1
+        self.suma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Límite superior de la cubeta donde cae el percentil p (None si cae en la última)"""
+        if not self.cantidad:
+            return None
+        objetivo = p * self.cantidad
+        acumulado = 0
+        for limite, cantidad in zip(self.limites_ms, self.cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return limite
+        return None
+
+    def resumen(self) -> Dict[str, Any]:
+        etiquetas = [f"<={limite}" for limite in self.limites_ms] + [f">{self.limites_ms[-1]}"]
+        return {
+            "cantidad": self.cantidad,
+            "promedio_ms": round(self.suma_ms / self.cantidad, 2) if self.cantidad else 0.0,
+            "maximo_ms": round(self.maximo_ms, 2),
+            "p50_ms": self.percentil(0.5),
+            "p95_ms": self.percentil(0.95),
+            "p99_ms": self.percentil(0.99),
+            "cubetas_ms": dict(zip(etiquetas, self.cubetas)),
+        }
+
+
+def _operacion(metodo: str, url: str) -> str:
+    """'GET /v1/payments/{id}': los ids no abren un histograma por pago"""
+    return f"{metodo} {re.sub(r'/[0-9][^/]*', '/{id}', urlsplit(url).path or '/')}"
+
+
+class ClienteHttpMercadoPago(HttpClient):
+    """HttpClient del SDK de Mercado Pago con pool, timeouts, reintentos y corta circuitos"""
+
+    def __init__(self,
+                 api_url: str = API_URL,
+                 timeout: Tuple[float, float] = (TIMEOUT_CONEXION, TIMEOUT_LECTURA),
+                 max_reintentos: int = MAX_REINTENTOS,
+                 backoff_base: float = BACKOFF_BASE,
+                 backoff_tope: float = BACKOFF_TOPE,
+                 pool_conexiones: int = POOL_CONEXIONES,
+                 corta_circuitos: Optional[CortaCircuitos] = None,
+                 dormir: Callable[[float], None] = time.sleep):
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.max_reintentos = max_reintentos
+        self.backoff_base = backoff_base
+        self.backoff_tope = backoff_tope
+        self.corta_circuitos = corta_circuitos or CortaCircuitos()
+        self._dormir = dormir
+
+        self.sesion = requests.Session()
+        # Los reintentos los maneja request(): el adapter solo aporta el pool
+        adapter = HTTPAdapter(pool_connections=pool_conexiones, pool_maxsize=pool_conexiones, max_retries=0)
+        self.sesion.mount("https://", adapter)
+        self.sesion.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._histogramas: Dict[str, HistogramaLatencia] = {}
+        self.llamadas = 0
+        self.reintentos = 0
+        self.fallos = 0
+
+    def _url(self, url: str) -> str:
+        # El SDK arma las URLs con la base oficial fija
+        if url.startswith(API_URL_OFICIAL):
+            return self.api_url + url[len(API_URL_OFICIAL):]
+        return url
+
+    def _espera(self, intento: int) -> float:
+        """Backoff exponencial con jitter completo: evita que los reintentos lleguen todos juntos"""
+        return random.uniform(0, min(self.backoff_tope, self.backoff_base * (2 ** intento)))
+
+    def _registrar(self, operacion: str, ms: float, reintentos: int, fallo: bool) -> None:
+        with self._lock:
+            self._histogramas.setdefault(operacion, HistogramaLatencia()).registrar(ms)
+            self.llamadas += 1
+            self.reintentos += reintentos
+            self.fallos += int(fallo)
+
+    def request(self, method: str, url: str, maxretries=None, timeout=None, **kwargs) -> Dict[str, Any]:
+        """
+        Misma firma y respuesta que HttpClient.request del SDK. `maxretries` y
+        `timeout` del SDK se ignoran: mandan los de este cliente.
+        """
+        url = self._url(url)
+        operacion = _operacion(method, url)
+        if method == "POST":
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.setdefault("X-Idempotency-Key", str(uuid.uuid4()))
+            kwargs["headers"] = headers
+
+        self.corta_circuitos.permitir()
+        registrado = False
+        try:
+            inicio = time.perf_counter()
+            intento = 0
+            while True:
+                try:
+                    respuesta = self.sesion.request(method, url, timeout=self.timeout, **kwargs)
+                    error = None
+                    fallo = respuesta.status_code in ESTADOS_REINTENTABLES
+                    reintentable = fallo
+                except requests.RequestException as e:
+                    respuesta, error = None, e
+                    fallo = True
+                    reintentable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+                if not reintentable or intento >= self.max_reintentos:
+                    break
+                intento += 1
+                espera = self._espera(intento)
+                if respuesta is not None and respuesta.headers.get("Retry-After", "").isdigit():
+                    espera = max(espera, min(float(respuesta.headers["Retry-After"]), self.backoff_tope))
+                print(f"⚠️ Mercado Pago {operacion}: reintento {intento} en {espera:.2f} s "
+                      f"({error or respuesta.status_code})")
+                self._dormir(espera)
+
+            if fallo:
+                self.corta_circuitos.registrar_fallo()
+            else:
+                self.corta_circuitos.registrar_exito()
+            registrado = True
+            self._registrar(operacion, (time.perf_counter() - inicio) * 1000, intento, fallo)
+        finally:
+            if not registrado:
+                # Excepción inesperada (no de requests): no cuenta como falla, pero
+                # la llamada de prueba del semiabierto no puede quedar tomada
+                self.corta_circuitos.liberar_prueba()
+
+        if error is not None:
+            raise error
+        resultado = {"status": respuesta.status_code, "response": None}
+        if respuesta.status_code != 204 and respuesta.content:
+            try:
+                resultado["response"] = respuesta.json()
+            except ValueError:
+                print(f"⚠️ Mercado Pago {operacion}: respuesta no es JSON")
+        return resultado
+
+    def get(self, url, headers, params=None, timeout=None, maxretries=None):
+        return self.request("GET", url=url, headers=headers, params=params)
+
+    def post(self, url, headers, data=None, params=None, timeout=None, maxretries=None):
+        return self.request("POST", url=url, headers=headers, data=data, params=params)
+
+    def put(self, url, headers, data=None, params=None, timeout=None, maxretries=None):
+        return self.request("PUT", url=url, headers=headers, data=data, params=params)
+
+    def delete(self, url, headers, params=None, timeout=None, maxretries=None):
+        return self.request("DELETE", url=url, headers=headers, params=params)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "api_url": self.api_url,
+                "timeout_conexion": self.timeout[0],
+                "timeout_lectura": self.timeout[1],
+                "llamadas": self.llamadas,
+                "reintentos": self.reintentos,
+                "fallos": self.fallos,
+                "corta_circuitos": self.corta_circuitos.estadisticas(),
+                "latencias": {operacion: h.resumen() for operacion, h in sorted(self._histogramas.items())},
+            }
+
+
+_lock_compartido = threading.Lock()
+_cliente: Optional[ClienteHttpMercadoPago] = None
+_sdk = None
+
+
+def obtener_cliente_http() -> ClienteHttpMercadoPago:
+    """Cliente único del proceso (se crea en el primer uso)"""
+    global _cliente
+    with _lock_compartido:
+        if _cliente is None:
+            _cliente = ClienteHttpMercadoPago()
+        return _cliente
+
+
+def obtener_sdk():
+    """SDK de Mercado Pago compartido, sobre el cliente HTTP del proceso"""
+    global _sdk
+    cliente = obtener_cliente_http()
+    with _lock_compartido:
+        if _sdk is None:
+            access_token = os.getenv("MERCADOPAGO_ACCESS_TOKEN", "TEST-YOUR-ACCESS-TOKEN")
+            _sdk = mercadopago.SDK(access_token, http_client=cliente)
+        return _sdk
+
+
+def reiniciar_cliente(cliente: Optional[ClienteHttpMercadoPago] = None) -> None:
+    """Reemplazar el cliente compartido (tests, cambio de configuración)"""
+    global _cliente, _sdk
+    with _lock_compartido:
+        if _cliente is not None and _cliente is not cliente:
+            _cliente.sesion.close()
+        _cliente = cliente
+        _sdk = None
+
+
+def api_mercadopago(metodo: str, ruta: str, **kwargs) -> Dict[str, Any]:
+    """Llamada directa a la API (fuera del SDK) con el cliente y el token compartidos"""
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.setdefault("Authorization", f"Bearer {os.getenv('MERCADOPAGO_ACCESS_TOKEN')}")
+    return obtener_cliente_http().request(metodo, API_URL_OFICIAL + ruta, headers=headers, **kwargs)
@@ -0,0 +1,179 @@
+# servicios/cronograma.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from sqlalchemy import event, inspect
+
+from models.clase import Clase, parsear_hora, weekdays_de_mask
+from models.inscripcion import Inscripcion
+from servicios import invalidacion
+
+# Red de seguridad: con varios procesos, los cambios hechos por otro worker
+# no disparan los eventos de este, así que ninguna entrada vive más que esto
+TTL_SEGUNDOS = 300
+# Clientes con plan en memoria; al pasarse se descarta el usado hace más tiempo
+MAX_CLIENTES = int(os.getenv("CRONOGRAMA_MAX_CLIENTES", "10000"))
+
+
+def compilar_plan(clases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reducir cada clase a (weekday, hora, minuto) una sola vez por cliente"""
+    plan = []
+    for clase in clases:
+        hora_clase = parsear_hora(clase["hora"]) or datetime.min.time()
+        hora, minuto = hora_clase.hour, hora_clase.minute
+        for weekday in weekdays_de_mask(clase["dias_mask"]):
+            plan.append({
+                "clase_id": clase["clase_id"],
+                "nombre": clase["nombre"],
+                "descripcion": clase["descripcion"] or "",
+                "weekday": weekday,
+                "hora": hora,
+                "minuto": minuto,
+            })
+    return plan
+
+
+def expandir_plan(plan: List[Dict[str, Any]], desde: datetime, hasta: datetime) -> List[Dict[str, Any]]:
+    """Ocurrencias de cada regla semanal dentro de [desde, hasta], ordenadas por fecha"""
+    ocurrencias = []
+    for regla in plan:
+        # Primera fecha >= desde con el weekday de la regla, sin iterar día por día
+        primera = desde.date() + timedelta(days=(regla["weekday"] - desde.weekday()) % 7)
+        inicio = datetime.combine(primera, datetime.min.time()).replace(hour=regla["hora"], minute=regla["minuto"])
+        if inicio < desde:
+            inicio += timedelta(days=7)
+        if inicio > hasta:
+            continue
+        semanas = (hasta - inicio).days // 7 + 1
+        for semana in range(semanas):
+            ocurrencias.append({
+                "clase_id": regla["clase_id"],
+                "nombre": regla["nombre"],
+                "descripcion": regla["descripcion"],
+                "fecha": inicio + timedelta(weeks=semana),
+            })
+    ocurrencias.sort(key=lambda x: (x["fecha"], x["clase_id"]))
+    return ocurrencias
+
+
+class MotorCronograma:
+    """
+    Cachea por cliente el plan semanal (clases + días + hora) y genera las
+    ocurrencias de cualquier ventana a partir de él. Las entradas se
+    invalidan cuando cambia una inscripción del cliente o una de sus clases,
+    y a lo sumo quedan `max_clientes` (LRU).
+    """
+
+    def __init__(self, ttl_segundos: int = TTL_SEGUNDOS, reloj: Callable[[], float] = time.monotonic,
+                 max_clientes: int = MAX_CLIENTES):
+        self.ttl_segundos = ttl_segundos
+        self.max_clientes = max_clientes
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        # dni -> (momento, plan, clases del cliente)
+        self._planes: "OrderedDict[str, Tuple[float, List[Dict[str, Any]], Set[int]]]" = OrderedDict()
+        self._clientes_por_clase: Dict[int, set] = {}
+        # Sube con cada invalidación: un plan cargado antes no se guarda
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener_plan(self, cliente_dni: str, cargar: Callable[[str], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        ahora = self._reloj()
+        with self._lock:
+            entrada = self._planes.get(cliente_dni)
+            if entrada and ahora - entrada[0] < self.ttl_segundos:
+                self._planes.move_to_end(cliente_dni)
+                self.aciertos += 1
+                return entrada[1]
+            self.fallos += 1
+            generacion = self._generacion
+
+        clases = cargar(cliente_dni)
+        plan = compilar_plan(clases)
+        with self._lock:
+            if generacion != self._generacion:
+                # Se invalidó algo mientras se cargaba: el plan puede estar viejo
+                return plan
+            self._quitar(cliente_dni)
+            clase_ids = {clase["clase_id"] for clase in clases}
+            self._planes[cliente_dni] = (ahora, plan, clase_ids)
+            for clase_id in clase_ids:
+                self._clientes_por_clase.setdefault(clase_id, set()).add(cliente_dni)
+            while len(self._planes) > self.max_clientes:
+                self._quitar(next(iter(self._planes)))
+        return plan
+
+    def _quitar(self, cliente_dni: str) -> None:
+        """Sacar la entrada del cliente y sus referencias por clase (con el lock tomado)"""
+        entrada = self._planes.pop(cliente_dni, None)
+        if entrada is None:
+            return
+        for clase_id in entrada[2]:
+            clientes = self._clientes_por_clase.get(clase_id)
+            if clientes is not None:
+                clientes.discard(cliente_dni)
+                if not clientes:
+                    del self._clientes_por_clase[clase_id]
+
+    def cronograma(self, cliente_dni: str, cargar: Callable[[str], List[Dict[str, Any]]],
+                   desde: datetime, hasta: datetime) -> List[Dict[str, Any]]:
+        return expandir_plan(self.obtener_plan(cliente_dni, cargar), desde, hasta)
+
+    def invalidar_cliente(self, cliente_dni: str) -> None:
+        self.invalidar_clientes({cliente_dni})
+
+    def invalidar_clientes(self, clientes: Set[str]) -> None:
+        with self._lock:
+            self._generacion += 1
+            for cliente_dni in clientes:
+                self._quitar(cliente_dni)
+
+    def invalidar_clase(self, clase_id: int) -> None:
+        self.invalidar_clases({clase_id})
+
+    def invalidar_clases(self, clase_ids: Set[int]) -> None:
+        with self._lock:
+            self._generacion += 1
+            for clase_id in clase_ids:
+                for cliente_dni in list(self._clientes_por_clase.get(clase_id, ())):
+                    self._quitar(cliente_dni)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._generacion += 1
+            self._planes.clear()
+            self._clientes_por_clase.clear()
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {"clientes_en_cache": len(self._planes), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+motor_cronograma = MotorCronograma()
+
+
+# Los eventos de mapper cubren todos los caminos de escritura por ORM
+# (adaptadores y casos de uso que usan la sesión directamente). Solo anotan
+# en la sesión; la cache se limpia en after_commit (servicios/invalidacion)
+@event.listens_for(Inscripcion, "after_insert")
+@event.listens_for(Inscripcion, "after_update")
+@event.listens_for(Inscripcion, "after_delete")
+def _inscripcion_modificada(mapper, connection, inscripcion) -> None:
+    # Si la inscripción cambió de cliente, el anterior también queda desactualizado
+    invalidacion.anotar_objeto(inscripcion, "cronograma_clientes", inscripcion.cliente_dni,
+                               *inspect(inscripcion).attrs.cliente_dni.history.deleted)
+
+
+@event.listens_for(Clase, "after_update")
+@event.listens_for(Clase, "after_delete")
+def _clase_modificada(mapper, connection, clase) -> None:
+    invalidacion.anotar_objeto(clase, "cronograma_clases", clase.id)
+
+
+invalidacion.registrar("cronograma_clientes", motor_cronograma.invalidar_clientes)
+invalidacion.registrar("cronograma_clases", motor_cronograma.invalidar_clases)
@@ -0,0 +1,49 @@
+# servicios/invalidacion.py
+"""
+Invalidaciones de cache diferidas al COMMIT.
+
+Los eventos de mapper corren durante el flush, antes de confirmar: si la
+cache se limpiara ahí, una lectura concurrente podría recargarla desde el
+estado todavía sin confirmar (o el anterior) y guardarla hasta el TTL.
+Los eventos solo anotan en la sesión qué quedó desactualizado; cada cache
+registra su manejador y se lo llama recién en after_commit. Un rollback
+descarta lo anotado.
+"""
+from typing import Callable, Dict, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+_CLAVE = "invalidar_al_confirmar"
+_manejadores: Dict[str, Callable[[set], None]] = {}
+
+
+def registrar(tipo: str, manejador: Callable[[set], None]) -> None:
+    """Manejador que recibe el conjunto de valores anotados para `tipo` en cada COMMIT"""
+    _manejadores[tipo] = manejador
+
+
+def anotar(session: Session, tipo: str, valores: Iterable) -> None:
+    if session is None:
+        return
+    session.info.setdefault(_CLAVE, {}).setdefault(tipo, set()).update(v for v in valores if v is not None)
+
+
+def anotar_objeto(objeto, tipo: str, *valores) -> None:
+    """Para eventos de mapper, que reciben la conexión y no la sesión"""
+    anotar(object_session(objeto), tipo, valores)
+
+
+@event.listens_for(Session, "after_commit")
+def _aplicar(session: Session) -> None:
+    for tipo, valores in session.info.pop(_CLAVE, {}).items():
+        try:
+            _manejadores[tipo](valores)
+        except Exception as e:
+            # La escritura ya está confirmada: una cache caída no la deshace
+            print(f"⚠️ No se pudo invalidar la cache {tipo}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(session: Session) -> None:
+    session.info.pop(_CLAVE, None)
@@ -1,21 +1,22 @@
 # servicios/mercado_pago_service.py
-import mercadopago
 import os
 from typing import Dict, Any, Optional
 from datetime import datetime
 import uuid
 
+from servicios.cliente_mercado_pago import obtener_sdk
+
 class MercadoPagoService:
-    def __init__(self):
-        # Configurar con tus credenciales de Mercado Pago
-        self.access_token = os.getenv('MERCADOPAGO_ACCESS_TOKEN', 'TEST-YOUR-ACCESS-TOKEN')
-        self.sdk = mercadopago.SDK(self.access_token)
+    def __init__(self, sdk=None):
+        # SDK compartido por el proceso: conexiones reutilizadas, timeouts y reintentos acotados
+        self.sdk = sdk or obtener_sdk()
     
     def crear_preferencia_pago(self, pago_data: Dict[str, Any]) -> Dict[str, Any]:
         """Crear una preferencia de pago en Mercado Pago"""
         try:
-            # Generar ID único para la referencia
-            referencia_interna = f"MP-{uuid.uuid4().hex[:8].upper()}"
+            # La referencia del pago local, si viene, es la external_reference:
+            # con ella se encuentra el pago al conciliar
+            referencia_interna = pago_data.get("referencia") or f"MP-{uuid.uuid4().hex[:8].upper()}"
             
             preference_data = {
                 "items": [
@@ -66,30 +67,52 @@ class MercadoPagoService:
         except Exception as e:
             return {"error": f"Error en Mercado Pago: {str(e)}"}
     
+    def _datos_pago(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": payment["id"],
+            "status": payment["status"],
+            "status_detail": payment["status_detail"],
+            "external_reference": payment.get("external_reference", ""),
+            "amount": payment["transaction_amount"],
+            "currency": payment["currency_id"],
+            "date_created": payment["date_created"],
+            "date_approved": payment.get("date_approved"),
+            "payment_method": payment["payment_method_id"],
+            "payer": payment["payer"]
+        }
+
     def verificar_pago(self, payment_id: str) -> Dict[str, Any]:
         """Verificar el estado de un pago en Mercado Pago"""
         try:
             payment_result = self.sdk.payment().get(payment_id)
             
             if payment_result["status"] == 200:
-                payment = payment_result["response"]
-                return {
-                    "id": payment["id"],
-                    "status": payment["status"],
-                    "status_detail": payment["status_detail"],
-                    "external_reference": payment.get("external_reference", ""),
-                    "amount": payment["transaction_amount"],
-                    "currency": payment["currency_id"],
-                    "date_created": payment["date_created"],
-                    "date_approved": payment.get("date_approved"),
-                    "payment_method": payment["payment_method_id"],
-                    "payer": payment["payer"]
-                }
+                return self._datos_pago(payment_result["response"])
             else:
                 return {"error": "No se pudo obtener información del pago"}
                 
         except Exception as e:
             return {"error": f"Error al verificar pago: {str(e)}"}
+
+    def verificar_pago_por_referencia(self, referencia: str) -> Dict[str, Any]:
+        """Último pago de Mercado Pago con esa external_reference"""
+        try:
+            search_result = self.sdk.payment().search({
+                "external_reference": referencia,
+                "sort": "date_created",
+                "criteria": "desc",
+                "limit": 1
+            })
+
+            if search_result["status"] != 200:
+                return {"error": "No se pudo buscar el pago en Mercado Pago"}
+            resultados = (search_result["response"] or {}).get("results") or []
+            if not resultados:
+                return {"error": "Mercado Pago no tiene pagos con esa referencia", "sin_pago": True}
+            return self._datos_pago(resultados[0])
+
+        except Exception as e:
+            return {"error": f"Error al buscar pago: {str(e)}"}
     
     def procesar_webhook(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Procesar notificación webhook de Mercado Pago"""
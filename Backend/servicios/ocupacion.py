@@ -0,0 +1,96 @@
+# servicios/ocupacion.py
+"""
+Reconciliación de los contadores de ocupación de Clase
+(inscritos_activos / inscritos_historicos) y de sus fragmentos de cupo
+a partir de las inscripciones.
+
+Los eventos de Inscripcion los mantienen al día en cada escritura por ORM;
+esto cubre lo que queda afuera (cargas masivas, SQL manual, datos previos
+a las columnas). Uso:
+
+    python -m servicios.ocupacion
+"""
+from typing import Dict
+
+from sqlalchemy import and_, bindparam, case, func, or_, select
+
+from models.clase import Clase
+from models.cupo_fragmento import CupoFragmento
+from models.inscripcion import Inscripcion, EstadoInscripcion
+
+
+def _conteos(*agrupar):
+    """Conteos reales agrupados por clase (y fragmento), en una sola pasada sobre inscripcion"""
+    return (
+        select(
+            *agrupar,
+            func.sum(case((Inscripcion.estado == EstadoInscripcion.ACTIVO, 1), else_=0)).label("activos"),
+            func.count(Inscripcion.id).label("historicos"),
+        )
+        .group_by(*agrupar)
+    )
+
+
+def _corregir(conexion, tabla, claves, activos_col, historicos_col, conteos) -> int:
+    """UPDATE masivo de las filas de `tabla` cuyos contadores no coinciden con `conteos`"""
+    activos = func.coalesce(conteos.c.activos, 0)
+    historicos = func.coalesce(conteos.c.historicos, 0)
+    desfasadas = conexion.execute(
+        select(*(tabla.c[columna] for columna in claves), activos, historicos)
+        .select_from(tabla.outerjoin(conteos, and_(*(conteos.c[alias] == tabla.c[columna]
+                                                     for columna, alias in claves.items()))))
+        .where(or_(tabla.c[activos_col] != activos, tabla.c[historicos_col] != historicos))
+    ).all()
+
+    if desfasadas:
+        parametros = []
+        for *clave, cantidad_activos, cantidad_historicos in desfasadas:
+            fila = {f"_{columna}": valor for columna, valor in zip(claves, clave)}
+            fila.update(_activos=int(cantidad_activos), _historicos=int(cantidad_historicos))
+            parametros.append(fila)
+        conexion.execute(
+            tabla.update()
+            .where(*(tabla.c[columna] == bindparam(f"_{columna}") for columna in claves))
+            .values({activos_col: bindparam("_activos"), historicos_col: bindparam("_historicos")}),
+            parametros,
+        )
+    return len(desfasadas)
+
+
+def reconciliar_ocupacion(conexion) -> Dict[str, int]:
+    """
+    Recalcular los contadores de todas las clases y de sus fragmentos de
+    cupo. Solo se escriben las filas cuyo contador difiere, con un UPDATE
+    masivo. Las inscripciones que entren mientras corre pueden quedar
+    fuera: conviene correrlo con poco tráfico.
+    """
+    clase = Clase.__table__
+    fragmento = CupoFragmento.__table__
+
+    # Las inscripciones con fragmento cuentan en su fila de clase_cupo_fragmento
+    por_clase = (
+        _conteos(Inscripcion.clase_id.label("clase_id"))
+        .where(Inscripcion.cupo_fragmento.is_(None))
+        .subquery()
+    )
+    por_fragmento = (
+        _conteos(Inscripcion.clase_id.label("clase_id"), Inscripcion.cupo_fragmento.label("fragmento"))
+        .where(Inscripcion.cupo_fragmento.is_not(None))
+        .subquery()
+    )
+
+    corregidas = _corregir(conexion, clase, {"id": "clase_id"},
+                           "inscritos_activos", "inscritos_historicos", por_clase)
+    fragmentos = _corregir(conexion, fragmento, {"clase_id": "clase_id", "fragmento": "fragmento"},
+                           "activos", "historicos", por_fragmento)
+
+    total = conexion.execute(select(func.count()).select_from(clase)).scalar_one()
+    return {"clases": total, "corregidas": corregidas, "fragmentos_corregidos": fragmentos}
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    with engine.begin() as conexion:
+        resultado = reconciliar_ocupacion(conexion)
+    print(f"✅ Ocupación reconciliada: {resultado['corregidas']} de {resultado['clases']} clases corregidas")
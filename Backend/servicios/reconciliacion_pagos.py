@@ -0,0 +1,143 @@
+# servicios/reconciliacion_pagos.py
+"""
+Conciliación de pagos pendientes con Mercado Pago.
+
+Un pago pendiente solo se actualizaba si alguien llamaba a
+/verificar-pago/{id} o llegaba un webhook. Este job toma los PENDIENTE
+con más de N minutos (índice estado_pago, fecha_creacion), los busca en
+Mercado Pago por su referencia con a lo sumo `concurrencia` consultas a la
+vez y aplica los cambios con un UPDATE por estado destino.
+
+Los pagos que Mercado Pago ya informó en un estado final se recuerdan en
+la cache (memoria o Redis, como el catálogo de clases): si el UPDATE no
+llegó a aplicarse, la próxima vuelta no vuelve a consultarlos. Los que
+siguen pendientes o que Mercado Pago no conoce anotan la consulta en
+ultima_conciliacion y se repiten recién pasado REVISION_MINUTOS; los de
+más de MAX_DIAS ya no se consultan. Uso:
+
+    python -m servicios.reconciliacion_pagos [minutos]
+"""
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlmodel import Session
+
+from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+from Casos_de_uso.Pagos.verificar_estado_pago import mapear_estado_mp
+from models.pago import EstadoPago
+from servicios.cache_clases import BackendCache, crear_backend_cache
+
+ANTIGUEDAD_MINUTOS = int(os.getenv("RECONCILIACION_PAGOS_MINUTOS", "30"))
+CONCURRENCIA = int(os.getenv("RECONCILIACION_PAGOS_CONCURRENCIA", "8"))
+MAX_PAGOS = int(os.getenv("RECONCILIACION_PAGOS_MAX", "5000"))
+REVISION_MINUTOS = int(os.getenv("RECONCILIACION_PAGOS_REVISION_MINUTOS", "360"))
+MAX_DIAS = int(os.getenv("RECONCILIACION_PAGOS_MAX_DIAS", "30"))
+INTERVALO_SEGUNDOS = int(os.getenv("RECONCILIACION_PAGOS_INTERVALO_SEGUNDOS", "600"))
+# Los estados finales no cambian más: se recuerdan por un día
+TTL_FINALES_SEGUNDOS = 24 * 3600
+
+ESTADOS_FINALES_MP = {"approved", "rejected", "cancelled", "refunded", "charged_back"}
+OBSERVACION = "Conciliado con Mercado Pago"
+
+cache_finales: BackendCache = crear_backend_cache()
+
+
+def _clave_final(referencia: str) -> str:
+    return f"mp:pago_final:{referencia}"
+
+
+async def reconciliar_pagos_pendientes(engine,
+                                       antiguedad_minutos: int = ANTIGUEDAD_MINUTOS,
+                                       concurrencia: int = CONCURRENCIA,
+                                       max_pagos: int = MAX_PAGOS,
+                                       servicio=None,
+                                       cache: Optional[BackendCache] = None) -> Dict[str, Any]:
+    """Una pasada de conciliación; devuelve cuántos se consultaron y cuántos cambiaron"""
+    if servicio is None:
+        from servicios.mercado_pago import MercadoPagoService
+        servicio = MercadoPagoService()
+    cache = cache or cache_finales
+
+    def _pendientes():
+        ahora = datetime.utcnow()
+        with Session(engine) as session:
+            return AdaptadorPagoSQL(session).listar_pendientes_vencidos(
+                antes_de=ahora - timedelta(minutes=antiguedad_minutos),
+                desde=ahora - timedelta(days=MAX_DIAS),
+                revisados_antes_de=ahora - timedelta(minutes=REVISION_MINUTOS),
+                limite=max_pagos)
+
+    pendientes = await asyncio.to_thread(_pendientes)
+    resultado = {"pendientes": len(pendientes), "consultados": 0, "desde_cache": 0, "errores": 0,
+                 "sin_pago": 0, "actualizados": 0}
+    # La cache puede ser Redis: una sola lectura (MGET) en un hilo, fuera del event loop
+    guardados = await asyncio.to_thread(cache.obtener_varios, [_clave_final(p["referencia"]) for p in pendientes])
+    limite = asyncio.Semaphore(concurrencia)
+    finales: Dict[str, str] = {}
+
+    async def estado_en_mp(pago: Dict[str, Any], guardado: Optional[bytes]) -> Optional[str]:
+        if guardado is not None:
+            resultado["desde_cache"] += 1
+            return guardado.decode()
+        async with limite:
+            # El SDK es sincrónico: cada consulta en un hilo, sobre el pool HTTP compartido
+            info = await asyncio.to_thread(servicio.verificar_pago_por_referencia, pago["referencia"])
+        resultado["consultados"] += 1
+        if "error" in info:
+            resultado["sin_pago" if info.get("sin_pago") else "errores"] += 1
+            # Sin pago en Mercado Pago sigue pendiente (y se anota la consulta); un error se reintenta
+            return "" if info.get("sin_pago") else None
+        if info["status"] in ESTADOS_FINALES_MP:
+            finales[pago["referencia"]] = info["status"]
+        return info["status"]
+
+    estados = await asyncio.gather(*(estado_en_mp(p, g) for p, g in zip(pendientes, guardados)))
+
+    cambios = defaultdict(list)
+    sin_cambios = []
+    for pago, estado_mp in zip(pendientes, estados):
+        if estado_mp is None:
+            continue
+        estado = mapear_estado_mp(estado_mp)
+        if estado != EstadoPago.PENDIENTE:
+            cambios[estado].append(pago["id"])
+        else:
+            sin_cambios.append(pago["id"])
+
+    def _guardar():
+        for referencia, estado_mp in finales.items():
+            cache.guardar(_clave_final(referencia), estado_mp.encode(), TTL_FINALES_SEGUNDOS)
+        with Session(engine) as session:
+            repositorio = AdaptadorPagoSQL(session)
+            if sin_cambios:
+                repositorio.marcar_conciliados(sin_cambios, datetime.utcnow())
+            return repositorio.aplicar_estados_pendientes(cambios, OBSERVACION) if cambios else 0
+
+    if finales or cambios or sin_cambios:
+        resultado["actualizados"] = await asyncio.to_thread(_guardar)
+    return resultado
+
+
+async def tarea_reconciliacion_pagos(engine, intervalo: int = INTERVALO_SEGUNDOS) -> None:
+    """Job de fondo del lifespan: concilia los pendientes cada `intervalo`"""
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            resultado = await reconciliar_pagos_pendientes(engine)
+            if resultado["pendientes"]:
+                print(f"✅ Pagos pendientes conciliados: {resultado}")
+        except Exception as e:
+            print(f"❌ Error conciliando pagos pendientes: {e}")
+
+
+if __name__ == "__main__":
+    import sys
+    from database import engine
+
+    minutos = int(sys.argv[1]) if len(sys.argv) > 1 else ANTIGUEDAD_MINUTOS
+    resultado = asyncio.run(reconciliar_pagos_pendientes(engine, antiguedad_minutos=minutos))
+    print(f"✅ Conciliación: {resultado['actualizados']} de {resultado['pendientes']} pagos pendientes actualizados "
+          f"({resultado['consultados']} consultas a Mercado Pago, {resultado['desde_cache']} desde cache)")
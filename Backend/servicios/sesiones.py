@@ -0,0 +1,46 @@
+# servicios/sesiones.py
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlmodel import Session, select
+
+from Adaptadores.adaptadorClaseSesionSQL import AdaptadorClaseSesionSQL
+from models.clase import Clase
+
+# Cuántos días hacia adelante se mantienen materializados en clase_sesion
+HORIZONTE_DIAS = int(os.getenv("SESIONES_HORIZONTE_DIAS", "56"))
+# Cada cuánto corre el job que corre el horizonte hacia adelante
+INTERVALO_SEGUNDOS = int(os.getenv("SESIONES_INTERVALO_SEGUNDOS", "3600"))
+
+
+def ventana_horizonte(desde: Optional[datetime] = None):
+    desde = desde or datetime.now().replace(second=0, microsecond=0)
+    return desde, desde + timedelta(days=HORIZONTE_DIAS)
+
+
+def regenerar_sesiones_clase(session: Session, clase: Clase) -> Dict[str, int]:
+    """Rehacer las sesiones futuras de una clase después de cambiar su horario"""
+    desde, hasta = ventana_horizonte()
+    return AdaptadorClaseSesionSQL(session).sincronizar_sesiones([clase], desde, hasta)
+
+
+def generar_sesiones(engine) -> Dict[str, int]:
+    """Completar el horizonte de sesiones de todas las clases"""
+    desde, hasta = ventana_horizonte()
+    with Session(engine) as session:
+        clases = session.exec(select(Clase)).all()
+        return AdaptadorClaseSesionSQL(session).sincronizar_sesiones(clases, desde, hasta)
+
+
+async def tarea_generacion_sesiones(engine, intervalo: int = INTERVALO_SEGUNDOS) -> None:
+    """Job de fondo del lifespan: genera sesiones al arrancar y luego cada `intervalo`"""
+    while True:
+        try:
+            resultado = await asyncio.to_thread(generar_sesiones, engine)
+            print(f"✅ Sesiones de clase sincronizadas: {resultado}")
+        except Exception as e:
+            # Con varios workers puede chocar con otra generación; se reintenta en la próxima vuelta
+            print(f"❌ Error generando sesiones de clase: {e}")
+        await asyncio.sleep(intervalo)
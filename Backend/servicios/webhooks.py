@@ -0,0 +1,163 @@
+# servicios/webhooks.py
+"""
+Procesamiento de la bandeja de webhooks de Mercado Pago.
+
+El endpoint del webhook solo inserta en webhook_entrada y responde 200;
+acá un pool de workers toma las entradas pendientes, consulta el pago en
+Mercado Pago y actualiza el pago local con VerificarEstadoPagoCase. La
+concurrencia está acotada (WEBHOOKS_CONCURRENCIA): una ráfaga de reenvíos
+se acumula en la tabla en vez de multiplicar llamadas a Mercado Pago.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlmodel import Session
+
+from Adaptadores.adaptadorWebhookSQL import AdaptadorWebhookSQL
+from servicios.cliente_mercado_pago import HistogramaLatencia
+
+CONCURRENCIA = int(os.getenv("WEBHOOKS_CONCURRENCIA", "4"))
+MAX_INTENTOS = int(os.getenv("WEBHOOKS_MAX_INTENTOS", "8"))
+# Sin trabajo, cada cuánto se revisa la tabla (el webhook además despierta a los workers)
+INTERVALO_SEGUNDOS = float(os.getenv("WEBHOOKS_INTERVALO_SEGUNDOS", "2"))
+# Cuánto dura la reserva de una entrada tomada por un worker
+RESERVA_SEGUNDOS = float(os.getenv("WEBHOOKS_RESERVA_SEGUNDOS", "60"))
+ESPERA_BASE_SEGUNDOS = 5
+ESPERA_TOPE_SEGUNDOS = 600
+VENTANA_RITMO_SEGUNDOS = 60
+LIMITES_RETRASO_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+
+
+class MetricasWebhooks:
+    """Contadores del proceso: ritmo de procesamiento y retraso desde la recepción"""
+
+    def __init__(self, reloj=time.monotonic):
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self.recibidas = 0
+        self.reenvios = 0
+        self.procesadas = 0
+        self.reintentos = 0
+        self.fallidas = 0
+        self._procesadas_recientes: deque = deque()
+        self.retraso = HistogramaLatencia(LIMITES_RETRASO_MS)
+
+    def registrar_recepcion(self, nueva: bool) -> None:
+        with self._lock:
+            self.recibidas += 1
+            self.reenvios += int(not nueva)
+
+    def registrar_procesada(self, recibida: datetime) -> None:
+        with self._lock:
+            self.procesadas += 1
+            self._procesadas_recientes.append(self._reloj())
+            self.retraso.registrar((datetime.utcnow() - recibida).total_seconds() * 1000)
+
+    def registrar_fallo(self, definitivo: bool) -> None:
+        with self._lock:
+            if definitivo:
+                self.fallidas += 1
+            else:
+                self.reintentos += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            limite = self._reloj() - VENTANA_RITMO_SEGUNDOS
+            while self._procesadas_recientes and self._procesadas_recientes[0] < limite:
+                self._procesadas_recientes.popleft()
+            return {
+                "recibidas": self.recibidas,
+                "reenvios_fusionados": self.reenvios,
+                "procesadas": self.procesadas,
+                "reintentos": self.reintentos,
+                "fallidas": self.fallidas,
+                "procesadas_por_segundo": round(len(self._procesadas_recientes) / VENTANA_RITMO_SEGUNDOS, 3),
+                "retraso_procesamiento": self.retraso.resumen(),
+            }
+
+
+metricas_webhooks = MetricasWebhooks()
+_despertador: Optional[asyncio.Event] = None
+
+
+def despertar_workers() -> None:
+    """Avisar que entró una notificación, para no esperar a la próxima revisión"""
+    if _despertador is not None:
+        _despertador.set()
+
+
+def _espera_reintento(intentos: int) -> float:
+    """Backoff exponencial; el jitter reparte en el tiempo los reintentos de una misma caída"""
+    espera = min(ESPERA_TOPE_SEGUNDOS, ESPERA_BASE_SEGUNDOS * (2 ** intentos))
+    return random.uniform(espera / 2, espera)
+
+
+def procesar_entrada(engine, entrada: Dict[str, Any], max_intentos: int = MAX_INTENTOS) -> bool:
+    """Procesar una entrada reservada, en su propia sesión; True si quedó procesada"""
+    from Casos_de_uso.Pagos.verificar_estado_pago import VerificarEstadoPagoCase
+
+    with Session(engine) as session:
+        try:
+            if entrada["tipo"] == "payment":
+                resultado = VerificarEstadoPagoCase(session).ejecutar_por_pago_mp(entrada["recurso_id"])
+            else:
+                resultado = {"ignorada": f"Tipo de notificación no soportado: {entrada['tipo']}"}
+            error = resultado.get("error")
+        except Exception as e:
+            session.rollback()
+            error = str(e)
+
+        repositorio = AdaptadorWebhookSQL(session)
+        if error is None:
+            if repositorio.marcar_procesada(entrada):
+                metricas_webhooks.registrar_procesada(entrada["recibida"])
+            return True
+
+        definitivo = entrada["intentos"] + 1 >= max_intentos
+        print(f"⚠️ Webhook {entrada['tipo']} {entrada['recurso_id']} (intento {entrada['intentos'] + 1}): {error}")
+        repositorio.registrar_fallo(entrada, error, max_intentos, _espera_reintento(entrada["intentos"]))
+        metricas_webhooks.registrar_fallo(definitivo)
+        return False
+
+
+def tomar_pendientes(engine, limite: int):
+    with Session(engine) as session:
+        return AdaptadorWebhookSQL(session).tomar_pendientes(limite, RESERVA_SEGUNDOS)
+
+
+def resumen_bandeja(engine) -> Dict[str, Any]:
+    with Session(engine) as session:
+        return AdaptadorWebhookSQL(session).resumen()
+
+
+async def tarea_procesar_webhooks(engine, concurrencia: int = CONCURRENCIA,
+                                  intervalo: float = INTERVALO_SEGUNDOS) -> None:
+    """Job de fondo del lifespan: drena la bandeja con a lo sumo `concurrencia` entradas a la vez"""
+    global _despertador
+    _despertador = asyncio.Event()
+    limite = asyncio.Semaphore(concurrencia)
+
+    async def procesar(entrada: Dict[str, Any]) -> None:
+        async with limite:
+            await asyncio.to_thread(procesar_entrada, engine, entrada)
+
+    while True:
+        # Se limpia antes de consultar: un aviso que llegue durante la consulta no se pierde
+        _despertador.clear()
+        try:
+            entradas = await asyncio.to_thread(tomar_pendientes, engine, concurrencia * 2)
+            if entradas:
+                await asyncio.gather(*(procesar(entrada) for entrada in entradas))
+                continue
+        except Exception as e:
+            print(f"❌ Error procesando la bandeja de webhooks: {e}")
+        try:
+            await asyncio.wait_for(_despertador.wait(), timeout=intervalo)
+        except asyncio.TimeoutError:
+            pass
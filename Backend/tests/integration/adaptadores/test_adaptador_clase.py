@@ -0,0 +1,219 @@
+# tests/integration/adaptadores/test_adaptador_clase.py
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _crear_clase_con_inscripciones(db_session, nombre, cupo_maximo, activas, canceladas):
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+
+    clase = Clase(nombre=nombre, cupo_maximo=cupo_maximo, instructor="Ana", hora="18:00")
+    db_session.add(clase)
+    db_session.commit()
+    db_session.refresh(clase)
+
+    estados = [EstadoInscripcion.ACTIVO] * activas + [EstadoInscripcion.CANCELADO] * canceladas
+    for estado in estados:
+        db_session.add(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase.id, estado=estado))
+    db_session.commit()
+    return clase
+
+
+def test_obtener_estadisticas_clases_en_bloque(db_session):
+    """Activas, históricas y ocupación de varias clases en una sola consulta"""
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+
+    llena = _crear_clase_con_inscripciones(db_session, "Spinning", 4, activas=3, canceladas=2)
+    vacia = _crear_clase_con_inscripciones(db_session, "Pilates", 10, activas=0, canceladas=0)
+    repositorio = AdaptadorClaseSQL(db_session)
+
+    estadisticas = repositorio.obtener_estadisticas_clases([llena.id, vacia.id])
+
+    assert estadisticas[llena.id]["inscripciones_activas"] == 3
+    assert estadisticas[llena.id]["total_inscripciones_historicas"] == 5
+    assert estadisticas[llena.id]["cupos_disponibles"] == 1
+    assert estadisticas[llena.id]["porcentaje_ocupacion"] == 75.0
+    # La clase sin inscripciones aparece igual gracias al LEFT JOIN
+    assert estadisticas[vacia.id]["inscripciones_activas"] == 0
+    assert estadisticas[vacia.id]["total_inscripciones_historicas"] == 0
+    assert repositorio.obtener_estadisticas_clase(llena.id) == estadisticas[llena.id]
+    assert repositorio.obtener_estadisticas_clases([]) == {}
+
+
+def test_adaptador_async_lista_clases_con_filtros():
+    """La variante async filtra en SQL igual que el listado sync"""
+    import asyncio
+    from sqlmodel import SQLModel
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from database import crear_engine_async
+    from models.clase import Clase
+    from Adaptadores.adaptadorClaseAsyncSQL import AdaptadorClaseAsyncSQL
+
+    async def escenario():
+        engine = crear_engine_async("sqlite:///:memory:")
+        async with engine.begin() as conexion:
+            await conexion.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all([
+                Clase(nombre="Yoga", hora="09:00", dificultad="Baja"),
+                Clase(nombre="Box", hora="19:00", dificultad="Alta"),
+                Clase(nombre="Aqua", hora="09:30", dificultad="Baja", activa=False),
+            ])
+            await session.commit()
+            repositorio = AdaptadorClaseAsyncSQL(session)
+            todas = await repositorio.listar_clases()
+            activas_manana = await repositorio.listar_clases(activas=True, horario="09")
+        await engine.dispose()
+        return todas, activas_manana
+
+    todas, activas_manana = asyncio.run(escenario())
+
+    assert [c.nombre for c in todas] == ["Box", "Yoga", "Aqua"]
+    assert [c.nombre for c in activas_manana] == ["Yoga"]
+
+
+def test_dias_mask_sincronizado_y_filtro_por_dia_hora(db_session):
+    """dias_mask sigue a dias_semana y el filtro por día se resuelve con el bit"""
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+    from models.clase import Clase
+
+    repositorio = AdaptadorClaseSQL(db_session)
+    funcional = repositorio.crear_clase(Clase(nombre="Funcional", hora="06:15", dias_semana=["lunes", "miercoles"]))
+    repositorio.crear_clase(Clase(nombre="Stretching", hora="06:15", dias_semana=["martes"]))
+
+    assert funcional.dias_mask == 0b101
+    assert [c.nombre for c in repositorio.listar_clases_por_dia_hora("miércoles", "06:15")] == ["Funcional"]
+
+    repositorio.actualizar_clase(funcional.id, {"dias_semana": ["martes", "domingo"]})
+    assert funcional.dias_mask == 0b1000010
+    martes = repositorio.listar_clases(horario="06:15", dia_semana="martes")
+    assert [c.nombre for c in martes] == ["Funcional", "Stretching"]
+    assert repositorio.listar_clases_por_dia_hora("lunes", "06:15") == []
+
+
+def test_sesiones_materializadas_se_regeneran_al_cambiar_horario(db_session):
+    """Crear y reprogramar una clase mantiene clase_sesion en sincronía"""
+    from datetime import datetime, timedelta
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+    from Adaptadores.adaptadorClaseSesionSQL import AdaptadorClaseSesionSQL
+    from models.clase import Clase
+
+    repositorio = AdaptadorClaseSQL(db_session)
+    sesiones = AdaptadorClaseSesionSQL(db_session)
+    instructor = f"Instructor {generar_dni_aleatorio()}"
+    clase = repositorio.crear_clase(Clase(nombre="HIIT", hora="07:00", instructor=instructor,
+                                          dias_semana=["lunes", "jueves"]))
+    desde, hasta = datetime.now(), datetime.now() + timedelta(days=14)
+
+    generadas = sesiones.listar_sesiones(desde, hasta, instructor=instructor)
+    assert len(generadas) == 4
+    assert {s["fecha_hora"].weekday() for s in generadas} == {0, 3}
+    assert all(s["fecha_hora"].hour == 7 and s["nombre"] == "HIIT" for s in generadas)
+
+    repositorio.actualizar_clase(clase.id, {"dias_semana": ["sabado"], "hora": "10:30"})
+    reprogramadas = sesiones.listar_sesiones(desde, hasta, clase_id=clase.id)
+    assert len(reprogramadas) == 2
+    assert all(s["fecha_hora"].weekday() == 5 and s["fecha_hora"].minute == 30 for s in reprogramadas)
+
+    # Una segunda sincronización no tiene nada que hacer
+    resultado = sesiones.sincronizar_sesiones([clase], desde, hasta)
+    assert resultado == {"creadas": 0, "eliminadas": 0, "actualizadas": 0}
+
+    repositorio.eliminar_clase(clase.id)
+    assert sesiones.listar_sesiones(desde, hasta, clase_id=clase.id) == []
+
+
+def test_listar_clases_por_rango_horario(db_session):
+    """hora_desde/hora_hasta filtran sobre la columna TIME, incluso cruzando medianoche"""
+    from datetime import time
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+    from models.clase import Clase
+
+    repositorio = AdaptadorClaseSQL(db_session)
+    instructor = f"Instructor {generar_dni_aleatorio()}"
+    for nombre, hora in [("Madrugada", "00:30"), ("Mañana", "09:00"), ("Tarde", "19:00"), ("Noche", "21:45")]:
+        repositorio.crear_clase(Clase(nombre=nombre, hora=hora, instructor=instructor))
+
+    def nombres(**filtros):
+        return [c.nombre for c in repositorio.listar_clases(instructor=instructor, **filtros)]
+
+    assert nombres(hora_desde=time(18, 0)) == ["Noche", "Tarde"]
+    assert nombres(hora_desde=time(8, 0), hora_hasta=time(19, 0)) == ["Mañana", "Tarde"]
+    assert nombres(hora_desde=time(21, 0), hora_hasta=time(1, 0)) == ["Madrugada", "Noche"]
+    assert nombres(horario="09:00") == ["Mañana"]
+    # Mismo filtro que el listado async: "21" abarca de 21:00 a 21:59
+    assert nombres(horario="21") == ["Noche"]
+    assert [c.nombre for c in repositorio.listar_clases_por_horario("21")
+            if c.instructor == instructor] == ["Noche"]
+
+
+def test_cache_de_clases_invalida_en_escrituras(db_session):
+    """Las lecturas repetidas salen de la cache y cada escritura la invalida"""
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+    from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
+    from models.clase import Clase
+    from servicios.cache_clases import CacheCatalogoClases, CacheMemoria
+
+    cache = CacheCatalogoClases(CacheMemoria(max_entradas=2))
+    repositorio = AdaptadorClaseCache(AdaptadorClaseSQL(db_session), cache)
+    instructor = f"Instructor {generar_dni_aleatorio()}"
+    clase = repositorio.crear_clase(Clase(nombre="Cycling", hora="18:00", instructor=instructor))
+
+    assert [c.nombre for c in repositorio.listar_clases(instructor=instructor)] == ["Cycling"]
+    assert [c.nombre for c in repositorio.listar_clases(instructor=instructor)] == ["Cycling"]
+    # crear_clase dejó escrita la clase: el detalle ya es un acierto
+    assert repositorio.obtener_clase_por_id(clase.id).nombre == "Cycling"
+    assert (cache.aciertos, cache.fallos) == (2, 1)
+
+    repositorio.actualizar_clase(clase.id, {"nombre": "Cycling Pro"})
+    assert [c.nombre for c in repositorio.listar_clases(instructor=instructor)] == ["Cycling Pro"]
+    assert repositorio.obtener_clase_por_id(clase.id).nombre == "Cycling Pro"
+
+    repositorio.eliminar_clase(clase.id)
+    assert repositorio.listar_clases(instructor=instructor) == []
+    assert repositorio.obtener_clase_por_id(clase.id).activa is False
+
+    repositorio.listar_clases(activas=False, instructor=instructor)
+    estadisticas = cache.estadisticas()
+    assert estadisticas["invalidaciones"] == 3
+    assert estadisticas["expulsiones"] >= 1 and estadisticas["entradas"] == 2
+
+
+def test_cache_de_clases_se_invalida_por_cualquier_camino_de_escritura(db_session):
+    """Adaptador SQL directo y UPDATE masivo invalidan la cache compartida, guardada en JSON; inscribirse no"""
+    import json
+    from datetime import time
+    from sqlalchemy import update
+    from Adaptadores.adaptadorClaseSQL import AdaptadorClaseSQL
+    from Adaptadores.adaptadorClaseCache import AdaptadorClaseCache
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion
+    from servicios.cache_clases import cache_clases
+
+    sql = AdaptadorClaseSQL(db_session)
+    cacheado = AdaptadorClaseCache(sql, cache_clases)
+    clase = sql.crear_clase(Clase(nombre="Spinning", hora="07:30", cupo_maximo=10))
+
+    leida = cacheado.obtener_clase_por_id(clase.id)
+    assert leida.hora == time(7, 30)
+    fila = json.loads(cache_clases.backend.obtener(cache_clases.clave_clase(clase.id)))
+    assert fila["nombre"] == "Spinning" and fila["hora"] == "07:30:00"
+    assert cacheado.obtener_clase_por_id(clase.id).hora == time(7, 30)
+
+    sql.actualizar_clase(clase.id, {"nombre": "Spinning Pro"})
+    assert cacheado.obtener_clase_por_id(clase.id).nombre == "Spinning Pro"
+
+    # Los contadores de ocupación no viajan en la cache: inscribirse no la invalida
+    assert "inscritos_activos" not in json.loads(cache_clases.backend.obtener(cache_clases.clave_clase(clase.id)))
+    versiones = cache_clases.clave_clase(clase.id), cache_clases.clave_listado("listar_clases", {})
+    AdaptadorInscripcionesSQL(db_session).crear_inscripcion_con_cupo(
+        Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase.id))
+    db_session.execute(update(Clase).where(Clase.id == clase.id)
+                       .values(inscritos_historicos=Clase.inscritos_historicos + 1))
+    db_session.commit()
+    assert db_session.get(Clase, clase.id).inscritos_activos == 1
+    assert (cache_clases.clave_clase(clase.id), cache_clases.clave_listado("listar_clases", {})) == versiones
+
+    db_session.execute(update(Clase).where(Clase.id == clase.id).values(cupo_maximo=5))
+    db_session.commit()
+    assert cacheado.obtener_clase_por_id(clase.id).cupo_maximo == 5
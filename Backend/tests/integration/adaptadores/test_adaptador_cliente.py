@@ -0,0 +1,75 @@
+# tests/integration/adaptadores/test_adaptador_cliente.py
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _fila(dni, correo, **kwargs):
+    datos = {"dni": dni, "nombre": f"Cliente {dni}", "fecha_nacimiento": "1990-05-01",
+             "telefono": "341000000", "correo": correo, "ciudad": ""}
+    datos.update(kwargs)
+    return datos
+
+
+def test_importar_clientes_rechaza_por_fila_y_crea_el_resto(db_session):
+    """Un lote se valida con una consulta y se inserta junto; los errores se informan por fila"""
+    from Adaptadores.adaptadorClienteSQL import AdaptadorClienteSQL
+    from models.cliente import Cliente
+
+    existente = generar_dni_aleatorio()
+    db_session.add(Cliente(**_fila(existente, f"{existente}@test.com", password="x")))
+    db_session.commit()
+
+    nuevos = [generar_dni_aleatorio() for _ in range(3)]
+    filas = list(enumerate([
+        _fila(nuevos[0], f"{nuevos[0]}@test.com"),
+        _fila(existente, "otro@test.com"),                      # DNI ya registrado
+        _fila(nuevos[1], f"{existente}@test.com"),              # correo ya registrado
+        _fila(nuevos[2], f"{nuevos[2]}@test.com", fecha_nacimiento="no-es-fecha"),
+        _fila(nuevos[0], "repetido@test.com"),                  # DNI repetido en el archivo
+    ], start=1))
+
+    resultado = AdaptadorClienteSQL(db_session).importar_clientes(filas)
+
+    assert resultado["creados"] == 1
+    assert [(e["fila"], e["error"]) for e in resultado["errores"] if e["fila"] != 4] == [
+        (2, "Ya existe un usuario con ese DNI."),
+        (3, "Ya existe un usuario con ese correo."),
+        (5, "DNI repetido en el archivo"),
+    ]
+    assert [e["fila"] for e in resultado["errores"]] == [2, 3, 4, 5]
+
+    creado = db_session.query(Cliente).filter(Cliente.dni == nuevos[0]).one()
+    assert creado.password == nuevos[0]
+    assert creado.activo is True
+    assert creado.ciudad is None
+
+
+def test_eliminar_usuarios_rechaza_los_que_tienen_historial_o_lista_de_espera(db_session):
+    """Los clientes con dependencias (incluida la lista de espera) se rechazan y el resto del lote se borra"""
+    from datetime import date
+    from sqlmodel import select
+    from Adaptadores.adaptadorClienteSQL import AdaptadorClienteSQL
+    from models.clase import Clase
+    from models.cliente import Cliente
+    from models.inscripcion import Inscripcion
+    from models.lista_espera import ListaEspera
+
+    clientes = [Cliente(dni=generar_dni_aleatorio(), nombre="Borrar", fecha_nacimiento=date(1990, 1, 1),
+                        telefono="0", correo=f"borrar{i}@test.com", password="x") for i in range(3)]
+    clase = Clase(nombre="Crossfit", instructor="Ana", cupo_maximo=1)
+    db_session.add_all(clientes + [clase])
+    db_session.commit()
+    ids = [c.id for c in clientes]
+    libre, en_espera, inscripto = ids
+    dni_en_espera = clientes[1].dni
+    db_session.add(ListaEspera(clase_id=clase.id, cliente_dni=dni_en_espera, posicion=1))
+    db_session.add(Inscripcion(cliente_dni=clientes[2].dni, clase_id=clase.id))
+    db_session.commit()
+    inexistente = max(ids) + 1000
+
+    resultados = AdaptadorClienteSQL(db_session).eliminar_usuarios_permanentemente(ids + [inexistente])
+
+    motivo = "El cliente tiene inscripciones, pagos, transacciones, informaciones o listas de espera asociadas"
+    assert resultados == {libre: None, en_espera: motivo, inscripto: motivo, inexistente: "Cliente no encontrado"}
+    restantes = db_session.exec(select(Cliente.id).where(Cliente.id.in_(ids))).all()
+    assert set(restantes) == {en_espera, inscripto}
+    assert db_session.exec(select(ListaEspera).where(ListaEspera.cliente_dni == dni_en_espera)).first() is not None
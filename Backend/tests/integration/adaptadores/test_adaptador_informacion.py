@@ -0,0 +1,38 @@
+# tests/integration/adaptadores/test_adaptador_informacion.py
+
+
+def _crear_informaciones(db_session, cantidad):
+    from models.informacion import Informacion
+
+    informaciones = [Informacion(titulo=f"Aviso {i}", contenido="Texto") for i in range(cantidad)]
+    db_session.add_all(informaciones)
+    db_session.commit()
+    return [i.id for i in informaciones]
+
+
+def test_cambiar_estado_y_eliminar_informaciones_por_lotes(db_session, monkeypatch):
+    """UPDATE y DELETE por lote; cada id informa si se aplicó o si no existe"""
+    from sqlmodel import select
+    import Adaptadores.lotes as lotes
+    from Adaptadores.adaptadorInformacionSQL import AdaptadorInformacionSQL
+    from models.informacion import Informacion
+
+    monkeypatch.setattr(lotes, "TAMANIO_LOTE", 2)
+    ids = _crear_informaciones(db_session, 5)
+    inexistente = max(ids) + 1000
+    repositorio = AdaptadorInformacionSQL(db_session)
+
+    def activas():
+        db_session.expire_all()
+        return {i.id for i in db_session.exec(select(Informacion).where(Informacion.id.in_(ids))).all() if i.activa}
+
+    resultados = repositorio.cambiar_estado_informaciones(ids[:3] + [inexistente], activa=False)
+    assert resultados == {ids[0]: None, ids[1]: None, ids[2]: None, inexistente: "No encontrada"}
+    assert activas() == set(ids[3:])
+    assert repositorio.cambiar_estado_informaciones([ids[0]], activa=True) == {ids[0]: None}
+    assert activas() == {ids[0]} | set(ids[3:])
+
+    resultados = repositorio.eliminar_informaciones(ids[1:4] + [inexistente, ids[1]])
+    assert resultados == {ids[1]: None, ids[2]: None, ids[3]: None, inexistente: "Información no encontrada"}
+    restantes = db_session.exec(select(Informacion.id).where(Informacion.id.in_(ids))).all()
+    assert set(restantes) == {ids[0], ids[4]}
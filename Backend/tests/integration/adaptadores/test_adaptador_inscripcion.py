@@ -0,0 +1,297 @@
+# tests/integration/adaptadores/test_adaptador_inscripcion.py
+from datetime import date, datetime, timedelta
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _crear_clase(db_session, nombre="Funcional", cupo_maximo=20):
+    from models.clase import Clase
+
+    clase = Clase(nombre=nombre, cupo_maximo=cupo_maximo, instructor="Ana", hora="09:00")
+    db_session.add(clase)
+    db_session.commit()
+    db_session.refresh(clase)
+    return clase
+
+
+def _inscribir(db_session, clase, cantidad, **kwargs):
+    from models.inscripcion import Inscripcion
+
+    for _ in range(cantidad):
+        datos = {"cliente_dni": generar_dni_aleatorio(), "clase_id": clase.id}
+        datos.update(kwargs)
+        db_session.add(Inscripcion(**datos))
+    db_session.commit()
+
+
+def test_obtener_estadisticas_agrupa_estado_pago_clase_y_dia(db_session):
+    """Conteos por estado, pago, clase y día salen de una única consulta agrupada"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from models.inscripcion import EstadoInscripcion
+
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+    antes = repositorio.obtener_estadisticas()
+
+    clase = _crear_clase(db_session)
+    hoy = datetime.utcnow()
+    _inscribir(db_session, clase, 3, pagado=True, fecha_inscripcion=hoy)
+    _inscribir(db_session, clase, 2, estado=EstadoInscripcion.CANCELADO, fecha_inscripcion=hoy)
+    _inscribir(db_session, clase, 1, fecha_inscripcion=hoy - timedelta(days=60))
+    despues = repositorio.obtener_estadisticas(dias=30)
+
+    assert despues["total_inscripciones"] - antes["total_inscripciones"] == 6
+    assert despues["activas"] - antes["activas"] == 4
+    assert despues["canceladas"] - antes["canceladas"] == 2
+    assert despues["pagadas"] - antes["pagadas"] == 3
+    assert despues["no_pagadas"] - antes["no_pagadas"] == 3
+
+    por_clase = next(c for c in despues["por_clase"] if c["clase_id"] == clase.id)
+    assert por_clase == {"clase_id": clase.id, "clase_nombre": "Funcional", "total": 6, "activas": 4}
+
+    # La inscripción de hace 60 días queda fuera de la ventana diaria
+    fechas = [d["fecha"] for d in despues["por_dia"]]
+    assert (hoy - timedelta(days=60)).date().isoformat() not in fechas
+    assert hoy.date().isoformat() in fechas
+
+
+def test_obtener_clases_cupo_critico_filtra_por_ocupacion(db_session):
+    """Sólo las clases con ocupación activa >= al porcentaje pasan el HAVING"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from models.inscripcion import EstadoInscripcion
+
+    critica = _crear_clase(db_session, nombre="Crossfit", cupo_maximo=5)
+    _inscribir(db_session, critica, 4)
+    _inscribir(db_session, critica, 3, estado=EstadoInscripcion.CANCELADO)
+    holgada = _crear_clase(db_session, nombre="Stretching", cupo_maximo=10)
+    _inscribir(db_session, holgada, 7)
+
+    alertas = AdaptadorInscripcionesSQL(db_session).obtener_clases_cupo_critico(80)
+    por_id = {a["clase_id"]: a for a in alertas}
+
+    assert por_id[critica.id]["ocupadas"] == 4
+    assert por_id[critica.id]["porcentaje_ocupacion"] == 80.0
+    assert holgada.id not in por_id
+
+
+def test_reportes_populares_agrupan_y_filtran(db_session):
+    """Clases populares y clientes activos se resuelven con GROUP BY + LIMIT"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from models.cliente import Cliente
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+
+    # Ventana futura para aislar estos datos del resto de los tests
+    inicio = datetime(2099, 1, 1)
+    clase_a = _crear_clase(db_session, nombre="Box")
+    clase_b = _crear_clase(db_session, nombre="Zumba")
+    dni = generar_dni_aleatorio()
+    db_session.add(Cliente(dni=dni, nombre="Lucía", fecha_nacimiento=date(1990, 5, 1), telefono="1155550000",
+                           correo=f"{dni}@mail.com", password="secreto123"))
+    db_session.commit()
+
+    for clase, cantidad in ((clase_a, 3), (clase_b, 1)):
+        for i in range(cantidad):
+            db_session.add(Inscripcion(cliente_dni=dni, clase_id=clase.id, fecha_inscripcion=inicio + timedelta(days=i)))
+    db_session.add(Inscripcion(cliente_dni=dni, clase_id=clase_b.id, estado=EstadoInscripcion.CANCELADO,
+                               fecha_inscripcion=inicio))
+    db_session.commit()
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    populares = repositorio.obtener_clases_populares(limite=5, fecha_inicio=inicio)
+    assert [(c["clase_id"], c["cantidad"]) for c in populares] == [(clase_a.id, 3), (clase_b.id, 2)]
+
+    solo_activas = repositorio.obtener_clases_populares(
+        limite=1, fecha_inicio=inicio, fecha_fin=inicio + timedelta(days=2), estado=EstadoInscripcion.ACTIVO
+    )
+    assert solo_activas == [{"clase_id": clase_a.id, "nombre": "Box", "cantidad": 2, "total_inscripciones": 2}]
+
+    clientes = repositorio.obtener_clientes_activos(fecha_inicio=inicio)
+    assert clientes == [{"cliente_dni": dni, "nombre": "Lucía", "cantidad": 5, "total_inscripciones": 5}]
+
+
+def test_crear_inscripcion_con_cupo_rechaza_clase_llena(db_session):
+    """Solo las activas ocupan lugar; con el cupo completo se informa CupoAgotadoError"""
+    import pytest
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+
+    clase = _crear_clase(db_session, nombre="Crossfit", cupo_maximo=2)
+    _inscribir(db_session, clase, 1, estado=EstadoInscripcion.CANCELADO)
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    clase_id = clase.id
+    for _ in range(2):
+        repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    assert len(repositorio.ver_inscripciones_clase(clase_id)) == 3
+
+    with pytest.raises(CupoAgotadoError) as error:
+        repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    assert (error.value.clase_id, error.value.cupo_maximo) == (clase_id, 2)
+
+
+def test_contadores_de_ocupacion_siguen_cada_cambio_de_estado(db_session):
+    """Los contadores de Clase acompañan altas, cancelaciones, reactivaciones y bajas"""
+    from sqlalchemy import text
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+    from servicios.ocupacion import reconciliar_ocupacion
+
+    clase = _crear_clase(db_session, nombre="Spinning", cupo_maximo=5)
+    clase_id = clase.id
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    def contadores():
+        clase = db_session.get(Clase, clase_id)
+        db_session.refresh(clase)
+        return clase.inscritos_activos, clase.inscritos_historicos
+
+    _inscribir(db_session, clase, 1, estado=EstadoInscripcion.CANCELADO)
+    primera = repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    segunda = repositorio.crear_inscripcion(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    assert contadores() == (2, 3)
+
+    assert repositorio.cancelar_inscripcion(primera.id, "viaje")
+    assert contadores() == (1, 3)
+    assert repositorio.reactivar_inscripcion(primera.id) is not None
+    assert contadores() == (2, 3)
+    assert repositorio.completar_inscripcion(segunda.id)
+    assert contadores() == (1, 3)
+    assert repositorio.eliminar_inscripcion(primera.id)
+    assert contadores() == (0, 3)
+    db_session.delete(db_session.get(Inscripcion, segunda.id))
+    db_session.commit()
+    assert contadores() == (0, 2)
+
+    # Lo que se escribe por fuera del ORM se corrige con la reconciliación
+    db_session.execute(text("UPDATE clase SET inscritos_activos = 7, inscritos_historicos = 0 WHERE id = :id"), {"id": clase_id})
+    resultado = reconciliar_ocupacion(db_session.connection())
+    assert resultado["corregidas"] >= 1
+    assert contadores() == (0, 2)
+
+
+def test_cupo_fragmentado_respeta_el_cupo_exacto(db_session):
+    """Con el cupo repartido en filas, las reservas y bajas van al fragmento y el total sigue exacto"""
+    import pytest
+    from sqlmodel import select
+    from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+    from models.cupo_fragmento import CupoFragmento
+    from models.inscripcion import Inscripcion
+    from servicios.ocupacion import reconciliar_ocupacion
+
+    clase = _crear_clase(db_session, nombre="Hot yoga", cupo_maximo=5)
+    clase_id = clase.id
+    _inscribir(db_session, clase, 2)
+    cupos = AdaptadorCupoFragmentoSQL(db_session)
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    assert cupos.fragmentar(clase_id, 3)["inscritos_activos"] == 2
+    fragmentos = db_session.exec(select(CupoFragmento).where(CupoFragmento.clase_id == clase_id)).all()
+    assert sum(f.capacidad for f in fragmentos) == 5
+
+    nuevas = [repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+              for _ in range(3)]
+    assert all(i.cupo_fragmento is not None for i in nuevas)
+    assert cupos.inscritos_activos(clase_id) == 5
+
+    assert repositorio.cancelar_inscripcion(nuevas[0].id, "cambio de horario")
+    assert cupos.inscritos_activos(clase_id) == 4
+    assert reconciliar_ocupacion(db_session.connection())["fragmentos_corregidos"] == 0
+
+    # Volver al contador único conserva la ocupación
+    assert cupos.fragmentar(clase_id, 0)["inscritos_activos"] == 4
+    repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    with pytest.raises(CupoAgotadoError):
+        repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+
+
+def test_reactivar_y_cambiar_de_clase_respetan_el_cupo(db_session):
+    """Reactivar o mover una inscripción activa ocupa lugar con la misma reserva condicional que un alta"""
+    import pytest
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    def preparar():
+        """Clase llena (cupo 1) con una cancelada, y otra clase con una activa"""
+        llena = _crear_clase(db_session, nombre="Boxeo", cupo_maximo=1)
+        otra = _crear_clase(db_session, nombre="Pilates", cupo_maximo=3)
+        clases = (llena.id, otra.id)
+        ocupante = repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clases[0]))
+        cancelada = repositorio.crear_inscripcion(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clases[0],
+                                                              estado=EstadoInscripcion.CANCELADO))
+        movida = repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clases[1]))
+        return clases, (ocupante.id, cancelada.id, movida.id)
+
+    def contadores(clase_id):
+        clase = db_session.get(Clase, clase_id)
+        db_session.refresh(clase)
+        return clase.inscritos_activos, clase.inscritos_historicos
+
+    # Con el lugar libre la reactivación entra, sin volver a sumar en los históricos
+    (llena_id, otra_id), ids = preparar()
+    assert repositorio.cancelar_inscripcion(ids[0], "lesión")
+    assert repositorio.reactivar_inscripcion(ids[1]) is not None
+    assert contadores(llena_id) == (1, 2)
+
+    # Moverse a una clase con lugar lo libera en la de origen
+    assert repositorio.actualizar_inscripcion(ids[1], {"clase_id": otra_id}).clase_id == otra_id
+    assert contadores(llena_id) == (0, 1) and contadores(otra_id) == (2, 2)
+
+    # Sin lugar se rechaza (el rollback del adaptador descarta también los datos del test: se vuelven a armar)
+    for cambio in (lambda ids, llena_id: repositorio.reactivar_inscripcion(ids[1]),
+                   lambda ids, llena_id: repositorio.actualizar_inscripcion(ids[1], {"estado": EstadoInscripcion.ACTIVO}),
+                   lambda ids, llena_id: repositorio.actualizar_inscripcion(ids[2], {"clase_id": llena_id})):
+        (llena_id, otra_id), ids = preparar()
+        with pytest.raises(CupoAgotadoError):
+            cambio(ids, llena_id)
+
+
+def test_cambiar_cupo_fragmentado_descuenta_el_contador_de_la_clase(db_session):
+    """Las inscripciones sin fragmento ocupan cupo: el reparto las descuenta y el cupo se cambia junto con los fragmentos"""
+    import pytest
+    from sqlmodel import select
+    from Adaptadores.adaptadorCupoFragmentoSQL import AdaptadorCupoFragmentoSQL
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Casos_de_uso.Clases.modificar_clase import ModificarClaseCase
+    from Dominio.repositorios.repositorioInscripciones import CupoAgotadoError
+    from models.clase import Clase
+    from models.cupo_fragmento import CupoFragmento
+    from models.inscripcion import Inscripcion
+
+    clase = _crear_clase(db_session, nombre="Spinning", cupo_maximo=6)
+    clase_id = clase.id
+    cupos = AdaptadorCupoFragmentoSQL(db_session)
+    cupos.fragmentar(clase_id, 2)
+    # Altas escritas por ORM sin fragmento cuentan en el contador de la clase
+    _inscribir(db_session, clase, 2)
+    assert db_session.get(Clase, clase_id).inscritos_activos == 2
+    assert cupos.inscritos_activos(clase_id) == 2
+
+    ModificarClaseCase(db_session).ejecutar(clase_id, {"cupo_maximo": 5, "instructor": "Bruno"})
+    clase = db_session.get(Clase, clase_id)
+    assert (clase.cupo_maximo, clase.instructor) == (5, "Bruno")
+    fragmentos = db_session.exec(select(CupoFragmento).where(CupoFragmento.clase_id == clase_id)).all()
+    assert sum(f.capacidad for f in fragmentos) + clase.inscritos_activos == 5
+
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+    for _ in range(3):
+        repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+    assert cupos.inscritos_activos(clase_id) == 5
+    with pytest.raises(CupoAgotadoError):
+        repositorio.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=generar_dni_aleatorio(), clase_id=clase_id))
+
+
+def test_cambiar_cupo_no_baja_de_los_activos(db_session):
+    import pytest
+    from Casos_de_uso.Clases.modificar_clase import ModificarClaseCase
+
+    clase = _crear_clase(db_session, nombre="Pilates", cupo_maximo=4)
+    clase_id = clase.id
+    _inscribir(db_session, clase, 3)
+    with pytest.raises(ValueError):
+        ModificarClaseCase(db_session).ejecutar(clase_id, {"cupo_maximo": 2})
@@ -0,0 +1,50 @@
+# tests/integration/adaptadores/test_adaptador_lista_espera.py
+from datetime import date
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _crear_cliente(db_session):
+    from models.cliente import Cliente
+
+    dni = generar_dni_aleatorio()
+    db_session.add(Cliente(dni=dni, nombre="Espera", fecha_nacimiento=date(1990, 1, 1),
+                           telefono="0", correo=f"{dni}@gimnasio.test", password="x"))
+    db_session.commit()
+    return dni
+
+
+def test_cancelar_promueve_la_cabeza_de_la_lista_de_espera(db_session):
+    """FIFO por clase: al cancelar, el primero de la cola ocupa el lugar en la misma transacción"""
+    import pytest
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Adaptadores.adaptadorListaEsperaSQL import AdaptadorListaEsperaSQL
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion, EstadoInscripcion
+
+    clase = Clase(nombre="Pilates reformer", cupo_maximo=1, instructor="Eva", hora="10:00")
+    db_session.add(clase)
+    db_session.commit()
+    clase_id = clase.id
+
+    inscripciones = AdaptadorInscripcionesSQL(db_session)
+    lista_espera = AdaptadorListaEsperaSQL(db_session)
+    titular = inscripciones.crear_inscripcion_con_cupo(Inscripcion(cliente_dni=_crear_cliente(db_session), clase_id=clase_id))
+    primero, segundo = _crear_cliente(db_session), _crear_cliente(db_session)
+    lista_espera.anotar(clase_id, primero)
+    lista_espera.anotar(clase_id, segundo)
+    assert (lista_espera.consultar_posicion(clase_id, primero), lista_espera.consultar_posicion(clase_id, segundo)) == (1, 2)
+
+    with pytest.raises(ValueError):
+        lista_espera.anotar(clase_id, primero)
+
+    assert inscripciones.cancelar_inscripcion(titular.id, "lesión")
+    activos = [i.cliente_dni for i in inscripciones.ver_inscripciones_clase(clase_id) if i.estado == EstadoInscripcion.ACTIVO]
+    assert activos == [primero]
+    assert lista_espera.consultar_posicion(clase_id, primero) is None
+    assert lista_espera.consultar_posicion(clase_id, segundo) == 1
+    clase = db_session.get(Clase, clase_id)
+    db_session.refresh(clase)
+    assert clase.inscritos_activos == 1
+
+    assert lista_espera.quitar(clase_id, segundo)
+    assert lista_espera.consultar_posicion(clase_id, segundo) is None
@@ -0,0 +1,194 @@
+# tests/integration/adaptadores/test_adaptador_pago.py
+import pytest
+from datetime import datetime, timedelta
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _crear_pagos(db_session, dni, cantidad, **kwargs):
+    from models.pago import Pago, EstadoPago
+
+    base = datetime(2024, 1, 1, 10, 0, 0)
+    for i in range(cantidad):
+        datos = {
+            "id_usuario": dni,
+            "monto": 100.0 + i,
+            "concepto": f"Cuota {i}",
+            "metodo_pago": "efectivo",
+            "estado_pago": EstadoPago.COMPLETADO if i % 2 else EstadoPago.PENDIENTE,
+            # Dos pagos por fecha para ejercitar el desempate por id
+            "fecha_creacion": base + timedelta(days=i // 2),
+        }
+        datos.update(kwargs)
+        db_session.add(Pago(**datos))
+    db_session.commit()
+
+
+def test_listar_pagos_paginados_recorre_todas_las_paginas(db_session):
+    """Las páginas no se solapan y respetan el orden (fecha_creacion, id) descendente"""
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+
+    dni = generar_dni_aleatorio()
+    _crear_pagos(db_session, dni, 7)
+    repositorio = AdaptadorPagoSQL(db_session)
+
+    vistos = []
+    cursor = None
+    paginas = 0
+    while True:
+        pagina = repositorio.listar_pagos_paginados(limit=3, cursor=cursor, id_usuario=dni)
+        vistos.extend(pagina["items"])
+        paginas += 1
+        cursor = pagina["next_cursor"]
+        if not cursor:
+            break
+
+    assert paginas == 3
+    assert len({p.id for p in vistos}) == 7
+    claves = [(p.fecha_creacion, p.id) for p in vistos]
+    assert claves == sorted(claves, reverse=True)
+
+
+def test_listar_pagos_paginados_aplica_filtros(db_session):
+    """Estado, monto y rango de fechas se resuelven en la consulta"""
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+    from models.pago import EstadoPago
+
+    dni = generar_dni_aleatorio()
+    _crear_pagos(db_session, dni, 6)
+    repositorio = AdaptadorPagoSQL(db_session)
+
+    pagina = repositorio.listar_pagos_paginados(
+        id_usuario=dni,
+        estado_pago=EstadoPago.COMPLETADO,
+        monto_minimo=102.0,
+        fecha_fin=datetime(2024, 1, 3),
+    )
+
+    assert [p.monto for p in pagina["items"]] == [103.0]
+    assert pagina["next_cursor"] is None
+
+
+def test_listar_pagos_paginados_cursor_invalido(db_session):
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+
+    with pytest.raises(ValueError):
+        AdaptadorPagoSQL(db_session).listar_pagos_paginados(cursor="no-es-un-cursor")
+
+
+def test_obtener_estadisticas_avanzadas_agrupa_por_estado(db_session):
+    """Las estadísticas reflejan conteos y montos por estado"""
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+
+    repositorio = AdaptadorPagoSQL(db_session)
+    antes = repositorio.obtener_estadisticas_avanzadas()
+
+    # 4 pagos: pendientes 100 y 102, completados 101 y 103
+    _crear_pagos(db_session, generar_dni_aleatorio(), 4)
+    despues = repositorio.obtener_estadisticas_avanzadas()
+
+    assert despues["total"] - antes["total"] == 4
+    assert despues["pendientes"] - antes["pendientes"] == 2
+    assert despues["completados"] - antes["completados"] == 2
+    assert despues["monto_total"] - antes["monto_total"] == pytest.approx(406.0)
+    assert despues["monto_completado"] - antes["monto_completado"] == pytest.approx(204.0)
+
+
+def test_exportar_pagos_devuelve_filas_planas_filtradas(db_session):
+    """La exportación recorre filas como diccionarios, en el orden del listado"""
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+    from models.pago import EstadoPago
+
+    dni = generar_dni_aleatorio()
+    _crear_pagos(db_session, dni, 5)
+
+    filas = list(AdaptadorPagoSQL(db_session).exportar_pagos(id_usuario=dni, estado_pago=EstadoPago.PENDIENTE))
+
+    assert [f["monto"] for f in filas] == [104.0, 102.0, 100.0]
+    assert all(isinstance(f, dict) and f["id_usuario"] == dni for f in filas)
+
+
+def test_eliminar_pagos_permanentemente_por_lotes(db_session, monkeypatch):
+    """Un DELETE por lote; cada id informa si se eliminó, si no existe o si estaba completado"""
+    from sqlmodel import select
+    import Adaptadores.lotes as lotes
+    from Adaptadores.adaptadorPagoSQL import AdaptadorPagoSQL
+    from models.pago import Pago, EstadoPago
+
+    monkeypatch.setattr(lotes, "TAMANIO_LOTE", 2)
+    dni = generar_dni_aleatorio()
+    _crear_pagos(db_session, dni, 5)
+    pagos = db_session.exec(select(Pago).where(Pago.id_usuario == dni).order_by(Pago.id)).all()
+    ids = [p.id for p in pagos]
+    completados = {p.id for p in pagos if p.estado_pago == EstadoPago.COMPLETADO}
+    inexistente = max(ids) + 1000
+
+    resultados = AdaptadorPagoSQL(db_session).eliminar_pagos_permanentemente(ids + [inexistente, ids[0]])
+
+    assert resultados[inexistente] == "Pago no encontrado"
+    assert {i for i in ids if resultados[i] is None} == set(ids) - completados
+    assert all(resultados[i] == "No se puede eliminar un pago completado" for i in completados)
+    restantes = db_session.exec(select(Pago.id).where(Pago.id_usuario == dni)).all()
+    assert set(restantes) == completados
+
+
+def test_conciliacion_actualiza_pendientes_vencidos_y_recuerda_estados_finales(tmp_path, stub):
+    """Los pendientes viejos se buscan en Mercado Pago por referencia; los finales quedan en cache"""
+    import asyncio
+    from sqlmodel import Session, SQLModel, create_engine
+    from models.pago import EstadoPago, Pago
+    from servicios import cliente_mercado_pago
+    from servicios.cache_clases import CacheMemoria
+    from servicios.mercado_pago import MercadoPagoService
+    from servicios.reconciliacion_pagos import reconciliar_pagos_pendientes
+
+    # El job usa la base desde hilos: una base en archivo, no la :memory: compartida
+    engine = create_engine(f"sqlite:///{tmp_path / 'pagos.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    db_session = Session(engine)
+
+    dni = generar_dni_aleatorio()
+    viejo = datetime.utcnow() - timedelta(hours=2)
+    for sufijo, fecha in (("A", viejo), ("B", viejo + timedelta(seconds=1)), ("C", viejo + timedelta(seconds=2)),
+                          ("D", viejo + timedelta(seconds=3)), ("NUEVO", datetime.utcnow()),
+                          ("VIEJISIMO", viejo - timedelta(days=90))):
+        db_session.add(Pago(id_usuario=dni, monto=100, concepto="Cuota", metodo_pago="mercado_pago",
+                            referencia=f"MP-{dni}-{sufijo}", fecha_creacion=fecha))
+    db_session.commit()
+
+    def pago_mp(sufijo, estado):
+        return {"results": [{"id": 1, "status": estado, "status_detail": "", "transaction_amount": 100,
+                             "external_reference": f"MP-{dni}-{sufijo}", "currency_id": "ARS",
+                             "date_created": "2024-01-01T00:00:00", "payment_method_id": "visa", "payer": {}}]}
+
+    # D ya se vio aprobado en una vuelta anterior: no se consulta de nuevo
+    cache = CacheMemoria()
+    cache.guardar(f"mp:pago_final:MP-{dni}-D", b"approved", 60)
+    stub.respuestas = [(200, pago_mp("A", "approved"), 0), (200, pago_mp("B", "in_process"), 0),
+                       (200, {"results": []}, 0)]
+    cliente_mercado_pago.reiniciar_cliente(cliente_mercado_pago.ClienteHttpMercadoPago(
+        api_url=f"http://127.0.0.1:{stub.server_port}", max_reintentos=0, dormir=lambda segundos: None))
+    try:
+        resultado = asyncio.run(reconciliar_pagos_pendientes(
+            engine, antiguedad_minutos=30, concurrencia=1,
+            servicio=MercadoPagoService(), cache=cache))
+    finally:
+        cliente_mercado_pago.reiniciar_cliente()
+
+    assert resultado == {"pendientes": 4, "consultados": 3, "desde_cache": 1, "errores": 0,
+                         "sin_pago": 1, "actualizados": 2}
+    assert [p["ruta"].split("?")[0] for p in stub.pedidos] == ["/v1/payments/search"] * 3
+    assert f"external_reference=MP-{dni}-A" in stub.pedidos[0]["ruta"]
+    assert cache.obtener(f"mp:pago_final:MP-{dni}-A") == b"approved"
+    assert cache.obtener(f"mp:pago_final:MP-{dni}-B") is None
+
+    db_session.expire_all()
+    pagos = {p.referencia.rsplit("-", 1)[1]: p for p in db_session.query(Pago).filter(Pago.id_usuario == dni)}
+    assert {sufijo: EstadoPago(p.estado_pago) for sufijo, p in pagos.items()} == {
+        "A": EstadoPago.COMPLETADO, "B": EstadoPago.PENDIENTE, "C": EstadoPago.PENDIENTE,
+        "D": EstadoPago.COMPLETADO, "NUEVO": EstadoPago.PENDIENTE, "VIEJISIMO": EstadoPago.PENDIENTE}
+    # Los que siguen pendientes (B) o que Mercado Pago no conoce (C) no se repiten en la próxima vuelta
+    assert pagos["B"].ultima_conciliacion and pagos["C"].ultima_conciliacion
+    segunda = asyncio.run(reconciliar_pagos_pendientes(engine, antiguedad_minutos=30, servicio=MercadoPagoService(),
+                                                       cache=cache))
+    assert segunda["pendientes"] == 0 and len(stub.pedidos) == 3
+    db_session.close()
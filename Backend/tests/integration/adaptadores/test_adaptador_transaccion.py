@@ -0,0 +1,109 @@
+# tests/integration/adaptadores/test_adaptador_transaccion.py
+from datetime import datetime, timedelta
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _crear_transacciones(db_session, dni, cantidad):
+    from models.transaccion import Transaccion, EstadoPago, MetodoPago
+
+    base = datetime(2024, 3, 1, 9, 0, 0)
+    for i in range(cantidad):
+        db_session.add(Transaccion(
+            cliente_dni=dni,
+            monto=50.0 * (i + 1),
+            metodo_pago=MetodoPago.EFECTIVO if i % 2 else MetodoPago.TRANSFERENCIA,
+            estado=EstadoPago.COMPLETADO if i % 3 == 0 else EstadoPago.PENDIENTE,
+            fecha=base + timedelta(days=i),
+        ))
+    db_session.commit()
+
+
+def test_listar_transacciones_paginadas_con_filtros(db_session):
+    """Los filtros de estado, fecha y monto se combinan con el cursor"""
+    from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
+    from models.transaccion import EstadoPago
+
+    dni = generar_dni_aleatorio()
+    _crear_transacciones(db_session, dni, 10)
+    repositorio = AdaptadorTransaccionSQL(db_session)
+
+    filtros = {
+        "cliente_dni": dni,
+        "estado": EstadoPago.PENDIENTE,
+        "fecha_inicio": datetime(2024, 3, 2),
+        "monto_maximo": 400.0,
+    }
+    primera = repositorio.listar_transacciones_paginadas(limit=2, **filtros)
+    segunda = repositorio.listar_transacciones_paginadas(limit=2, cursor=primera["next_cursor"], **filtros)
+
+    # Pendientes con monto <= 400: i = 1, 2, 4, 5, 7
+    assert [t.monto for t in primera["items"]] == [400.0, 300.0]
+    assert [t.monto for t in segunda["items"]] == [250.0, 150.0]
+    tercera = repositorio.listar_transacciones_paginadas(limit=2, cursor=segunda["next_cursor"], **filtros)
+    assert [t.monto for t in tercera["items"]] == [100.0]
+    assert tercera["next_cursor"] is None
+
+
+def test_obtener_estadisticas_avanzadas_agrupa_por_estado(db_session):
+    """Conteos y montos por estado salen de una consulta agrupada"""
+    from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
+
+    repositorio = AdaptadorTransaccionSQL(db_session)
+    antes = repositorio.obtener_estadisticas_avanzadas()
+
+    # i = 0, 3 completadas (50 + 200); i = 1, 2, 4 pendientes (100 + 150 + 250)
+    _crear_transacciones(db_session, generar_dni_aleatorio(), 5)
+    despues = repositorio.obtener_estadisticas_avanzadas()
+
+    assert despues["total"] - antes["total"] == 5
+    assert despues["completadas"] - antes["completadas"] == 2
+    assert despues["pendientes"] - antes["pendientes"] == 3
+    assert despues["monto_pendiente"] - antes["monto_pendiente"] == 500.0
+    assert despues["monto_completado"] - antes["monto_completado"] == 250.0
+
+
+def test_eliminar_transacciones_desvincula_pagos_e_inscripciones(db_session, monkeypatch):
+    """El DELETE por lote deja pagos e inscripciones sin transacción; las completadas no se tocan"""
+    from sqlmodel import select
+    import Adaptadores.adaptadorTransaccionSQL as modulo
+    from Adaptadores.adaptadorTransaccionSQL import AdaptadorTransaccionSQL
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion
+    from models.pago import Pago
+    from models.transaccion import Transaccion, EstadoPago
+
+    dni = generar_dni_aleatorio()
+    _crear_transacciones(db_session, dni, 3)
+    transacciones = db_session.exec(select(Transaccion).where(Transaccion.cliente_dni == dni)
+                                    .order_by(Transaccion.id)).all()
+    completada, pendiente, otra_pendiente = [t.id for t in transacciones]
+    assert transacciones[0].estado == EstadoPago.COMPLETADO
+    clase = Clase(nombre="Funcional", instructor="Ana")
+    db_session.add(clase)
+    db_session.commit()
+    for transaccion_id in (completada, pendiente):
+        db_session.add(Pago(id_usuario=dni, monto=10, concepto="Cuota", metodo_pago="efectivo",
+                            transaccion_id=transaccion_id))
+        db_session.add(Inscripcion(cliente_dni=dni, clase_id=clase.id, transaccion_id=transaccion_id))
+    db_session.commit()
+
+    def vinculos(transaccion_id):
+        return (len(db_session.exec(select(Pago.id).where(Pago.transaccion_id == transaccion_id)).all()),
+                len(db_session.exec(select(Inscripcion.id).where(Inscripcion.transaccion_id == transaccion_id)).all()))
+
+    resultados = AdaptadorTransaccionSQL(db_session).eliminar_transacciones_permanentemente([completada, pendiente])
+    assert resultados == {completada: "No se puede eliminar una transacción completada", pendiente: None}
+    db_session.expire_all()
+    assert db_session.get(Transaccion, pendiente) is None
+    assert vinculos(pendiente) == (0, 0)
+    assert vinculos(completada) == (1, 1)
+
+    # Si se completa entre la consulta y las sentencias, no se desvincula ni se borra
+    original = modulo.procesar_en_lotes
+    monkeypatch.setattr(modulo, "procesar_en_lotes",
+                        lambda *args, **kwargs: original(*args, **{**kwargs, "motivo_rechazo": None}))
+    AdaptadorTransaccionSQL(db_session).eliminar_transacciones_permanentemente([completada, otra_pendiente])
+    db_session.expire_all()
+    assert db_session.get(Transaccion, completada) is not None
+    assert vinculos(completada) == (1, 1)
+    assert db_session.get(Transaccion, otra_pendiente) is None
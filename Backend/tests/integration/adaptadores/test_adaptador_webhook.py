@@ -0,0 +1,81 @@
+# tests/integration/adaptadores/test_adaptador_webhook.py
+from datetime import datetime, timedelta
+
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def test_bandeja_fusiona_reenvios_y_no_cierra_una_entrada_renotificada(db_session):
+    """Un solo registro por pago; si llega otro aviso mientras se procesa, la entrada sigue pendiente"""
+    from Adaptadores.adaptadorWebhookSQL import AdaptadorWebhookSQL
+    from models.webhook_entrada import EstadoWebhook, WebhookEntrada
+
+    bandeja = AdaptadorWebhookSQL(db_session)
+    recurso = generar_dni_aleatorio()
+
+    assert bandeja.registrar("payment", recurso) is True
+    assert bandeja.registrar("payment", recurso) is False
+
+    [entrada] = [e for e in bandeja.tomar_pendientes(50, reserva_segundos=60) if e["recurso_id"] == recurso]
+    assert entrada["notificaciones"] == 2
+    # Reservada: no la toma otro worker
+    assert all(e["recurso_id"] != recurso for e in bandeja.tomar_pendientes(50, reserva_segundos=60))
+
+    bandeja.registrar("payment", recurso)            # llega otro aviso durante el procesamiento
+    assert bandeja.marcar_procesada(entrada) is False
+
+    [repetida] = [e for e in bandeja.tomar_pendientes(50, reserva_segundos=60) if e["recurso_id"] == recurso]
+    assert bandeja.marcar_procesada(repetida) is True
+
+    fila = db_session.query(WebhookEntrada).filter(WebhookEntrada.recurso_id == recurso).one()
+    db_session.refresh(fila)
+    assert fila.estado == EstadoWebhook.PROCESADA
+
+    # Un aviso sobre una entrada cerrada la reabre: el pago puede haber cambiado de estado
+    bandeja.registrar("payment", recurso)
+    db_session.refresh(fila)
+    assert fila.estado == EstadoWebhook.PENDIENTE and fila.intentos == 0
+
+
+def test_worker_actualiza_el_pago_y_reintenta_con_espera(db_session, stub):
+    """El worker consulta el pago en Mercado Pago (servidor local) y aplica el estado al pago local"""
+    from Adaptadores.adaptadorWebhookSQL import AdaptadorWebhookSQL
+    from models.cliente import Cliente
+    from models.pago import EstadoPago, Pago
+    from models.webhook_entrada import EstadoWebhook, WebhookEntrada
+    from servicios import cliente_mercado_pago, webhooks
+
+    dni = generar_dni_aleatorio()
+    db_session.add(Cliente(dni=dni, nombre="Ana", fecha_nacimiento=datetime(1990, 1, 1).date(),
+                           telefono="1", correo=f"{dni}@test.com", password=dni))
+    db_session.add(Pago(id_usuario=dni, monto=100, concepto="Cuota", metodo_pago="mercado_pago",
+                        referencia=f"MP-{dni}"))
+    db_session.commit()
+
+    cliente_mercado_pago.reiniciar_cliente(cliente_mercado_pago.ClienteHttpMercadoPago(
+        api_url=f"http://127.0.0.1:{stub.server_port}", max_reintentos=0, dormir=lambda segundos: None))
+    try:
+        bandeja = AdaptadorWebhookSQL(db_session)
+        bandeja.registrar("payment", f"9{dni}")
+        [entrada] = [e for e in bandeja.tomar_pendientes(50, 60) if e["recurso_id"] == f"9{dni}"]
+
+        # Mercado Pago caído: queda pendiente con el próximo intento más adelante
+        stub.respuestas = [(503, {}, 0)]
+        assert webhooks.procesar_entrada(db_session.connection(), entrada, max_intentos=3) is False
+        fila = db_session.query(WebhookEntrada).filter(WebhookEntrada.recurso_id == f"9{dni}").one()
+        assert fila.estado == EstadoWebhook.PENDIENTE and fila.intentos == 1 and fila.ultimo_error
+
+        entrada["intentos"] = 1
+        stub.respuestas = [(200, {"id": int(f"9{dni}"), "status": "approved", "status_detail": "accredited",
+                                  "external_reference": f"MP-{dni}", "transaction_amount": 100,
+                                  "currency_id": "ARS", "date_created": "2024-01-01T00:00:00",
+                                  "payment_method_id": "visa", "payer": {}}, 0)]
+        assert webhooks.procesar_entrada(db_session.connection(), entrada, max_intentos=3) is True
+    finally:
+        cliente_mercado_pago.reiniciar_cliente()
+
+    assert [p["ruta"] for p in stub.pedidos] == [f"/v1/payments/9{dni}"] * 2
+    db_session.expire_all()
+    assert db_session.query(Pago).filter(Pago.referencia == f"MP-{dni}").one().estado_pago == EstadoPago.COMPLETADO
+    fila = db_session.query(WebhookEntrada).filter(WebhookEntrada.recurso_id == f"9{dni}").one()
+    assert fila.estado == EstadoWebhook.PROCESADA and fila.procesada is not None
+    assert bandeja.resumen()["retraso_segundos"] < timedelta(minutes=5).total_seconds()
@@ -0,0 +1,113 @@
+# tests/integration/api/test_importacion_router.py
+import asyncio
+import json
+
+URL = "/api/admin/clientes/masivo/importar"
+ENCABEZADO = "dni,nombre,fecha_nacimiento,telefono,correo,ciudad"
+
+
+def _fila_ndjson(i: int, prefijo: str) -> str:
+    return json.dumps({"dni": f"{prefijo}{i:06d}", "nombre": f"Cliente {i}", "fecha_nacimiento": "1990-01-01",
+                       "telefono": "123", "correo": f"{prefijo}{i}@gimnasio.test"})
+
+
+def _cliente(db_session, dni):
+    from sqlmodel import select
+    from models.cliente import Cliente
+
+    return db_session.exec(select(Cliente).where(Cliente.dni == dni)).first()
+
+
+def _post_en_bloques(bloques, content_type):
+    """POST al ASGI con el cuerpo partido en `bloques` (TestClient lo manda en un solo mensaje)"""
+    from app import app
+
+    mensajes = [{"type": "http.request", "body": b, "more_body": True} for b in bloques]
+    mensajes.append({"type": "http.request", "body": b"", "more_body": False})
+    enviados = []
+
+    async def receive():
+        return mensajes.pop(0) if mensajes else {"type": "http.disconnect"}
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": URL, "raw_path": URL.encode(), "query_string": b"", "root_path": "",
+             "headers": [(b"content-type", content_type.encode()), (b"host", b"test")],
+             "client": ("test", 1), "server": ("test", 80)}
+    asyncio.run(app(scope, receive, send))
+    estado = next(m["status"] for m in enviados if m["type"] == "http.response.start")
+    cuerpo = b"".join(m.get("body", b"") for m in enviados if m["type"] == "http.response.body")
+    return estado, json.loads(cuerpo)
+
+
+def test_importar_csv_con_bom_y_campo_multilinea(client, db_session):
+    """El BOM no ensucia el primer encabezado y un campo entre comillas puede tener saltos de línea"""
+    cuerpo = ("﻿" + ENCABEZADO + "\r\n"
+              "bom00001,Ana,1990-01-01,123,ana@bom.test,\"Villa\r\nCarlos Paz\"\r\n"
+              "bom00002,\"Pérez, Juan\",1985-05-05,456,juan@bom.test,\r\n").encode("utf-8")
+
+    respuesta = client.post(URL, content=cuerpo, headers={"Content-Type": "text/csv; charset=utf-8"})
+
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {"total_filas": 2, "creados": 2, "rechazados": 0, "errores": []}
+    assert _cliente(db_session, "bom00001").ciudad == "Villa\nCarlos Paz"
+    assert _cliente(db_session, "bom00002").nombre == "Pérez, Juan"
+
+
+def test_importar_csv_con_caracter_partido_entre_bloques(client, db_session):
+    """Un carácter UTF-8 de varios bytes partido entre dos bloques del cuerpo se decodifica entero"""
+    cuerpo = (ENCABEZADO + "\nmb000001,Muñoz,1990-01-01,123,munoz@mb.test,Córdoba\n").encode("utf-8")
+    corte = cuerpo.index("ñ".encode("utf-8")) + 1
+    assert len("ñ".encode("utf-8")) == 2
+
+    estado, resultado = _post_en_bloques([cuerpo[:corte], cuerpo[corte:]], "text/csv")
+
+    assert estado == 200
+    assert resultado["creados"] == 1 and resultado["errores"] == []
+    cliente = _cliente(db_session, "mb000001")
+    assert (cliente.nombre, cliente.ciudad) == ("Muñoz", "Córdoba")
+
+
+def test_importar_ndjson_informa_lineas_invalidas(client, db_session):
+    """Las líneas que no son un objeto JSON se informan con su número y no frenan a las demás"""
+    lineas = [_fila_ndjson(1, "nd"), "{no es json", "[1, 2]", "", _fila_ndjson(2, "nd"),
+              json.dumps({"dni": "nd-sin-datos"})]
+
+    respuesta = client.post(URL, content="\n".join(lineas).encode(),
+                            headers={"Content-Type": "application/x-ndjson"})
+
+    assert respuesta.status_code == 200
+    resultado = respuesta.json()
+    assert (resultado["total_filas"], resultado["creados"], resultado["rechazados"]) == (5, 2, 3)
+    assert [e["fila"] for e in resultado["errores"]] == [2, 3, 6]
+    assert resultado["errores"][0]["error"].startswith("JSON inválido")
+    assert resultado["errores"][1]["error"] == "Cada línea debe ser un objeto JSON"
+    assert resultado["errores"][2]["dni"] == "nd-sin-datos"
+
+
+def test_importar_archivo_de_varios_lotes(client, db_session):
+    """Más de FILAS_POR_LOTE filas: todas se importan y los errores conservan su número de fila"""
+    from sqlmodel import func, select
+    from models.cliente import Cliente
+    from routers.importacion import FILAS_POR_LOTE
+
+    filas = 2 * FILAS_POR_LOTE + 500
+    lineas = [_fila_ndjson(i, "lt") for i in range(1, filas + 1)]
+    lineas[FILAS_POR_LOTE + 10] = lineas[0]  # DNI repetido en el segundo lote
+
+    respuesta = client.post(URL, params={"formato": "ndjson"}, content="\n".join(lineas).encode())
+
+    assert respuesta.status_code == 200
+    resultado = respuesta.json()
+    assert (resultado["total_filas"], resultado["creados"]) == (filas, filas - 1)
+    assert [(e["fila"], e["error"]) for e in resultado["errores"]] == \
+        [(FILAS_POR_LOTE + 11, "Ya existe un usuario con ese DNI.")]
+    importados = db_session.exec(select(func.count(Cliente.id)).where(Cliente.dni.like("lt%"))).one()
+    assert importados == filas - 1
+
+
+def test_importar_sin_formato_reconocible(client):
+    respuesta = client.post(URL, content=b"a,b\n1,2\n", headers={"Content-Type": "text/plain"})
+    assert respuesta.status_code == 415
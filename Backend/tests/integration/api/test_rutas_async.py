@@ -0,0 +1,124 @@
+# tests/integration/api/test_rutas_async.py
+from datetime import date
+from sqlmodel import Session, select
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _guardar(engine, *objetos):
+    with Session(engine) as session:
+        session.add_all(objetos)
+        session.commit()
+        for objeto in objetos:
+            session.refresh(objeto)
+    return objetos
+
+
+def _cliente(dni=None, **datos):
+    from models.cliente import Cliente
+
+    dni = dni or generar_dni_aleatorio()
+    valores = {"dni": dni, "nombre": "Async", "fecha_nacimiento": date(1990, 1, 1), "telefono": "123",
+               "correo": f"{dni}@async.test", "password": "secreta"}
+    valores.update(datos)
+    return Cliente(**valores)
+
+
+def test_listar_clases_async(async_client):
+    """GET /api/admin/clases/ lee con la sesión async y filtra por rango de horario"""
+    from models.clase import Clase
+
+    instructor = f"Instructor {generar_dni_aleatorio()}"
+    _guardar(async_client.engine,
+             Clase(nombre="Yoga temprano", hora="07:15", instructor=instructor, dias_semana=["lunes"]),
+             Clase(nombre="Box nocturno", hora="21:00", instructor=instructor, dias_semana=["martes"]))
+
+    respuesta = async_client.get("/api/admin/clases/", params={"instructor": instructor})
+    assert respuesta.status_code == 200
+    assert sorted(c["nombre"] for c in respuesta.json()) == ["Box nocturno", "Yoga temprano"]
+
+    respuesta = async_client.get("/api/admin/clases/", params={"instructor": instructor, "horario": "07"})
+    assert [c["nombre"] for c in respuesta.json()] == ["Yoga temprano"]
+    assert async_client.get("/api/admin/clases/", params={"horario": "tarde"}).status_code == 400
+
+
+def test_login_async(async_client):
+    """POST /api/admin/clientes/login valida credenciales y cuenta activa"""
+    activo, inactivo = _guardar(async_client.engine, _cliente(), _cliente(activo=False))
+    url = "/api/admin/clientes/login"
+
+    respuesta = async_client.post(url, json={"correo": activo.correo, "password": "secreta"})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["dni"] == activo.dni
+    assert async_client.post(url, json={"correo": activo.correo, "password": "otra"}).status_code == 401
+    assert async_client.post(url, json={"correo": inactivo.correo, "password": "secreta"}).status_code == 403
+
+
+def test_crear_inscripcion_async_respeta_el_cupo(async_client):
+    """POST /api/admin/inscripciones/ reserva el lugar; con la clase llena responde 409"""
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion
+
+    clase, primero, segundo = _guardar(async_client.engine, Clase(nombre="Spinning", cupo_maximo=1),
+                                       _cliente(), _cliente())
+
+    def inscribir(cliente):
+        return async_client.post("/api/admin/inscripciones/", json={
+            "cliente_dni": cliente.dni, "clase_id": clase.id, "fecha_inscripcion": "2025-06-02T10:00:00"})
+
+    respuesta = inscribir(primero)
+    assert respuesta.status_code == 201
+    assert respuesta.json()["cliente_dni"] == primero.dni
+    assert inscribir(segundo).status_code == 409
+    assert async_client.post("/api/admin/inscripciones/", json={
+        "cliente_dni": "no-existe", "clase_id": clase.id,
+        "fecha_inscripcion": "2025-06-02T10:00:00"}).status_code == 400
+
+    with Session(async_client.engine) as session:
+        assert session.get(Clase, clase.id).inscritos_activos == 1
+        assert len(session.exec(select(Inscripcion).where(Inscripcion.clase_id == clase.id)).all()) == 1
+
+
+def test_posicion_lista_espera_async(async_client):
+    """GET /api/admin/inscripciones/espera/{clase}/{dni} devuelve la posición en la cola"""
+    from models.clase import Clase
+    from models.lista_espera import ListaEspera
+
+    clase, primero, segundo = _guardar(async_client.engine, Clase(nombre="Pilates", cupo_maximo=1),
+                                       _cliente(), _cliente())
+    _guardar(async_client.engine, ListaEspera(clase_id=clase.id, cliente_dni=primero.dni, posicion=1),
+             ListaEspera(clase_id=clase.id, cliente_dni=segundo.dni, posicion=2))
+
+    respuesta = async_client.get(f"/api/admin/inscripciones/espera/{clase.id}/{segundo.dni}")
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {"clase_id": clase.id, "cliente_dni": segundo.dni, "posicion": 2}
+    assert async_client.get(f"/api/admin/inscripciones/espera/{clase.id}/otro").status_code == 404
+
+
+def test_estado_pago_async(async_client):
+    """GET /api/admin/pagos/{id}/estado lee el pago con la sesión async"""
+    from models.pago import Pago, EstadoPago
+
+    cliente, = _guardar(async_client.engine, _cliente())
+    pago, = _guardar(async_client.engine, Pago(id_usuario=cliente.dni, monto=100, concepto="Cuota",
+                                               metodo_pago="Mercado Pago", estado_pago=EstadoPago.COMPLETADO))
+
+    respuesta = async_client.get(f"/api/admin/pagos/{pago.id}/estado")
+    assert respuesta.status_code == 200
+    assert (respuesta.json()["pago_id"], respuesta.json()["estado_pago"]) == (pago.id, "completado")
+    assert async_client.get(f"/api/admin/pagos/{pago.id + 1000}/estado").status_code == 404
+
+
+def test_webhook_async_registra_en_la_bandeja(async_client):
+    """POST /api/mercado-pago/webhook guarda la notificación y fusiona los reenvíos"""
+    from models.webhook_entrada import WebhookEntrada
+
+    notificacion = {"type": "payment", "data": {"id": "98765"}}
+    assert async_client.post("/api/mercado-pago/webhook", json=notificacion).json() == {"status": "ok"}
+    assert async_client.post("/api/mercado-pago/webhook", params={"topic": "payment", "id": "98765"}).json() == \
+        {"status": "ok"}
+    assert async_client.post("/api/mercado-pago/webhook", json={"type": "merchant_order"}).json() == \
+        {"status": "ignorada"}
+
+    with Session(async_client.engine) as session:
+        entradas = session.exec(select(WebhookEntrada).where(WebhookEntrada.recurso_id == "98765")).all()
+    assert [(e.tipo, e.notificaciones) for e in entradas] == [("payment", 2)]
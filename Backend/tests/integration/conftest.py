@@ -1,7 +1,12 @@
 import pytest
 import sys
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
 from sqlmodel import create_engine, Session, SQLModel
 from typing import Generator
 
@@ -15,7 +20,9 @@ from database import get_session
 # Usar SQLite en memoria para tests
 @pytest.fixture(scope="session")
 def engine():
-    test_engine = create_engine("sqlite:///:memory:", echo=True)
+    # Una sola conexión compartida: las rutas corren en el threadpool de FastAPI
+    test_engine = create_engine("sqlite:///:memory:", echo=True,
+                                connect_args={"check_same_thread": False}, poolclass=StaticPool)
     SQLModel.metadata.create_all(bind=test_engine)
     yield test_engine
     SQLModel.metadata.drop_all(bind=test_engine)
@@ -45,4 +52,77 @@ def client(db_session):
     with TestClient(app) as test_client:
         yield test_client
     
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def async_client(tmp_path):
+    """
+    TestClient con get_session y get_async_session sobre la misma base SQLite
+    en archivo: las rutas async ven lo que el test guarda con `async_client.engine`
+    """
+    from sqlalchemy.pool import NullPool
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from database import crear_engine_async, get_async_session
+
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine_sync = create_engine(url, connect_args={"check_same_thread": False})
+    # NullPool: ninguna conexión aiosqlite queda atada al loop del TestClient
+    engine_async = crear_engine_async(url, poolclass=NullPool)
+    SQLModel.metadata.create_all(engine_sync)
+
+    def override_get_session() -> Generator[Session, None, None]:
+        with Session(engine_sync) as session:
+            yield session
+
+    async def override_get_async_session():
+        async with AsyncSession(engine_async, expire_on_commit=False) as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    with TestClient(app) as test_client:
+        test_client.engine = engine_sync
+        yield test_client
+
+    app.dependency_overrides.clear()
+    engine_sync.dispose()
+
+
+class _StubMercadoPago(BaseHTTPRequestHandler):
+    """Servidor local que responde lo que indique la cola `respuestas` del server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _responder(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        cuerpo = self.rfile.read(largo) if largo else b""
+        self.server.pedidos.append({
+            "metodo": self.command, "ruta": self.path, "puerto": self.client_address[1],
+            "idempotencia": self.headers.get("X-Idempotency-Key"), "cuerpo": cuerpo,
+        })
+        estado, datos, demora = self.server.respuestas.pop(0) if self.server.respuestas else (200, {}, 0)
+        time.sleep(demora)
+        contenido = json.dumps(datos).encode()
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    do_GET = do_POST = _responder
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    """Servidor HTTP local que hace de API de Mercado Pago"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubMercadoPago)
+    server.pedidos, server.respuestas = [], []
+    hilo = threading.Thread(target=server.serve_forever, daemon=True)
+    hilo.start()
+    yield server
+    server.shutdown()
+    server.server_close()
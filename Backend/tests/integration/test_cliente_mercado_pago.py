@@ -0,0 +1,90 @@
+# tests/integration/test_cliente_mercado_pago.py
+import pytest
+import requests
+
+
+def _cliente(stub, **kwargs):
+    from servicios.cliente_mercado_pago import ClienteHttpMercadoPago
+
+    opciones = {"timeout": (1, 0.5), "max_reintentos": 2, "dormir": lambda segundos: None}
+    opciones.update(kwargs)
+    return ClienteHttpMercadoPago(api_url=f"http://127.0.0.1:{stub.server_port}", **opciones)
+
+
+def test_sdk_reintenta_5xx_con_la_misma_clave_y_reutiliza_la_conexion(stub):
+    """El SDK pasa por el cliente: reintenta el 503 y el POST conserva su X-Idempotency-Key"""
+    import mercadopago
+    from servicios.mercado_pago import MercadoPagoService
+
+    cliente = _cliente(stub)
+    stub.respuestas = [(503, {}, 0), (201, {"id": "pref-1", "init_point": "a", "sandbox_init_point": "b"}, 0),
+                       (200, {"id": 77, "status": "approved"}, 0)]
+    servicio = MercadoPagoService(sdk=mercadopago.SDK("TEST-TOKEN", http_client=cliente))
+
+    preferencia = servicio.crear_preferencia_pago({"concepto": "Cuota", "monto": 100, "cliente_dni": "123"})
+    pago = servicio.sdk.payment().get(77)
+
+    assert preferencia["preference_id"] == "pref-1"
+    assert pago == {"status": 200, "response": {"id": 77, "status": "approved"}}
+    assert [p["ruta"] for p in stub.pedidos] == ["/checkout/preferences", "/checkout/preferences", "/v1/payments/77"]
+    assert stub.pedidos[0]["idempotencia"] and stub.pedidos[0]["idempotencia"] == stub.pedidos[1]["idempotencia"]
+    assert len({p["puerto"] for p in stub.pedidos}) == 1  # keep-alive: una sola conexión
+
+    estadisticas = cliente.estadisticas()
+    assert estadisticas["reintentos"] == 1
+    assert estadisticas["latencias"]["GET /v1/payments/{id}"]["cantidad"] == 1
+    assert estadisticas["latencias"]["POST /checkout/preferences"]["cantidad"] == 1
+
+
+def test_timeout_de_lectura_y_corta_circuitos(stub):
+    """Los timeouts cuentan como falla; con el circuito abierto no se llama al servidor"""
+    from servicios.cliente_mercado_pago import CircuitoAbiertoError, CortaCircuitos
+
+    ahora = [0.0]
+    circuito = CortaCircuitos(umbral_fallos=2, segundos_abierto=30, reloj=lambda: ahora[0])
+    cliente = _cliente(stub, max_reintentos=1, corta_circuitos=circuito)
+    url = "https://api.mercadopago.com/v1/payments/1"
+
+    stub.respuestas = [(200, {}, 1), (200, {}, 1)]
+    with pytest.raises(requests.Timeout):
+        cliente.get(url, headers={})
+    stub.respuestas = [(500, {}, 0), (500, {}, 0)]
+    assert cliente.get(url, headers={})["status"] == 500
+    assert circuito.estado == "abierto"
+
+    pedidos = len(stub.pedidos)
+    with pytest.raises(CircuitoAbiertoError):
+        cliente.get(url, headers={})
+    assert len(stub.pedidos) == pedidos
+
+    # Vencida la espera pasa una llamada de prueba; si sale bien, se cierra
+    ahora[0] = 31
+    stub.respuestas = [(200, {"id": 1}, 0)]
+    assert cliente.get(url, headers={})["response"] == {"id": 1}
+    assert circuito.estadisticas() == {"estado": "cerrado", "fallos_seguidos": 0, "aperturas": 1, "rechazadas": 1}
+    assert cliente.estadisticas()["fallos"] == 2
+
+
+def test_semiabierto_libera_la_prueba_ante_una_excepcion_inesperada(stub):
+    """Si la llamada de prueba termina con una excepción ajena a requests, la siguiente puede probar"""
+    from servicios.cliente_mercado_pago import CortaCircuitos
+
+    ahora = [0.0]
+    circuito = CortaCircuitos(umbral_fallos=1, segundos_abierto=30, reloj=lambda: ahora[0])
+    cliente = _cliente(stub, max_reintentos=0, corta_circuitos=circuito)
+    url = "https://api.mercadopago.com/v1/payments/1"
+
+    stub.respuestas = [(500, {}, 0)]
+    cliente.get(url, headers={})
+    assert circuito.estado == "abierto"
+
+    ahora[0] = 31
+    original = cliente.sesion.request
+    cliente.sesion.request = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("bug"))
+    with pytest.raises(RuntimeError):
+        cliente.get(url, headers={})
+    cliente.sesion.request = original
+
+    stub.respuestas = [(200, {"id": 1}, 0)]
+    assert cliente.get(url, headers={})["response"] == {"id": 1}
+    assert circuito.estado == "cerrado"
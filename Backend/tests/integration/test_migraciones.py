@@ -0,0 +1,114 @@
+# tests/integration/test_migraciones.py
+from sqlalchemy import create_engine, text
+
+
+def test_agregar_columnas_faltantes_rellena_dias_mask():
+    """Una tabla clase anterior a dias_mask recibe la columna ya calculada"""
+    from sqlmodel import SQLModel
+    import models.cliente, models.clase, models.inscripcion  # noqa: F401
+    from migraciones import aplicar_migraciones
+
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("DROP INDEX ix_clase_hora_dias_mask"))
+        conexion.execute(text("ALTER TABLE clase DROP COLUMN dias_mask"))
+        conexion.execute(text(
+            "INSERT INTO clase (nombre, activa, fecha_creacion, dias_semana, hora) "
+            "VALUES ('Yoga', 1, '2024-01-01', '[\"lunes\", \"viernes\"]', '08:00')"
+        ))
+
+    aplicar_migraciones(engine)
+
+    with engine.connect() as conexion:
+        assert conexion.execute(text("SELECT dias_mask FROM clase")).scalar() == 0b10001
+
+
+def test_convertir_hora_clase_a_time():
+    """Las horas guardadas como texto pasan a TIME y recuperan su índice"""
+    from datetime import time
+    from sqlalchemy import inspect
+    from sqlmodel import SQLModel
+    import models.cliente, models.clase, models.inscripcion  # noqa: F401
+    from migraciones import aplicar_migraciones
+
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("DROP INDEX ix_clase_hora_dias_mask"))
+        conexion.execute(text("DROP INDEX ix_clase_hora"))
+        conexion.execute(text("ALTER TABLE clase DROP COLUMN hora"))
+        conexion.execute(text("ALTER TABLE clase ADD COLUMN hora VARCHAR"))
+        conexion.execute(text(
+            "INSERT INTO clase (nombre, activa, fecha_creacion, dias_semana, dias_mask, hora) VALUES "
+            "('Yoga', 1, '2024-01-01', '[]', 0, '8:30'), ('Box', 1, '2024-01-01', '[]', 0, 'tarde')"
+        ))
+
+    aplicar_migraciones(engine)
+
+    from models.clase import Clase
+    with engine.connect() as conexion:
+        horas = dict(conexion.execute(Clase.__table__.select().with_only_columns(Clase.nombre, Clase.hora)).all())
+    assert horas == {"Yoga": time(8, 30), "Box": None}
+    indices = {ix["name"] for ix in inspect(engine).get_indexes("clase")}
+    assert {"ix_clase_hora", "ix_clase_hora_dias_mask"} <= indices
+
+
+
+def test_convertir_hora_retoma_una_conversion_cortada():
+    """Una corrida anterior que dejó hora_nueva (con o sin la hora vieja) se completa al reiniciar"""
+    from datetime import time
+    from sqlalchemy import inspect
+    from sqlmodel import SQLModel
+    import models.cliente, models.clase, models.inscripcion  # noqa: F401
+    from migraciones import aplicar_migraciones
+    from models.clase import Clase
+
+    def tabla_a_medias(hora_vieja: bool):
+        engine = create_engine("sqlite:///:memory:")
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conexion:
+            conexion.execute(text("DROP INDEX ix_clase_hora_dias_mask"))
+            conexion.execute(text("DROP INDEX ix_clase_hora"))
+            conexion.execute(text("ALTER TABLE clase DROP COLUMN hora"))
+            conexion.execute(text("ALTER TABLE clase ADD COLUMN hora_nueva TIME"))
+            if hora_vieja:
+                conexion.execute(text("ALTER TABLE clase ADD COLUMN hora VARCHAR"))
+                conexion.execute(text(
+                    "INSERT INTO clase (nombre, activa, fecha_creacion, dias_semana, dias_mask, hora) "
+                    "VALUES ('Yoga', 1, '2024-01-01', '[]', 0, '8:30')"))
+            else:
+                conexion.execute(text(
+                    "INSERT INTO clase (nombre, activa, fecha_creacion, dias_semana, dias_mask, hora_nueva) "
+                    "VALUES ('Yoga', 1, '2024-01-01', '[]', 0, '08:30:00.000000')"))
+        return engine
+
+    for hora_vieja in (True, False):
+        engine = tabla_a_medias(hora_vieja)
+        aplicar_migraciones(engine)
+        aplicar_migraciones(engine)
+
+        with engine.connect() as conexion:
+            horas = conexion.execute(Clase.__table__.select().with_only_columns(Clase.hora)).scalars().all()
+        assert horas == [time(8, 30)]
+        columnas = {col["name"] for col in inspect(engine).get_columns("clase")}
+        assert "hora_nueva" not in columnas
+        assert "ix_clase_hora" in {ix["name"] for ix in inspect(engine).get_indexes("clase")}
+
+def test_elimina_el_indice_suelto_de_dias_mask():
+    """ix_clase_hora_dias_mask ya cubre dias_mask: el índice suelto de bases viejas se descarta"""
+    from sqlalchemy import inspect
+    from sqlmodel import SQLModel
+    import models.cliente, models.clase, models.inscripcion  # noqa: F401
+    from migraciones import aplicar_migraciones
+
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("CREATE INDEX ix_clase_dias_mask ON clase (dias_mask)"))
+
+    aplicar_migraciones(engine)
+
+    indices = {ix["name"] for ix in inspect(engine).get_indexes("clase")}
+    assert "ix_clase_dias_mask" not in indices
+    assert "ix_clase_hora_dias_mask" in indices
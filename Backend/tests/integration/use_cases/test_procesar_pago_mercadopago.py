@@ -0,0 +1,41 @@
+# tests/integration/use_cases/test_procesar_pago_mercadopago.py
+from sqlalchemy import event
+
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def test_checkout_guarda_transaccion_y_pago_en_un_solo_commit(db_session, stub):
+    """Con la preferencia creada se insertan transacción y pago juntos; si Mercado Pago falla no se toca la base"""
+    import mercadopago
+    from Casos_de_uso.Pagos.procesar_pago_mercadopago import ProcesarPagoMercadoPagoCase
+    from models.pago import EstadoPago, Pago
+    from models.transaccion import Transaccion
+    from servicios.cliente_mercado_pago import ClienteHttpMercadoPago
+    from servicios.mercado_pago import MercadoPagoService
+
+    cliente = ClienteHttpMercadoPago(api_url=f"http://127.0.0.1:{stub.server_port}", max_reintentos=0,
+                                     dormir=lambda segundos: None)
+    servicio = MercadoPagoService(sdk=mercadopago.SDK("TEST-TOKEN", http_client=cliente))
+    caso_uso = ProcesarPagoMercadoPagoCase(db_session, mercado_pago_service=servicio)
+    dni = generar_dni_aleatorio()
+
+    sentencias = []
+    event.listen(db_session.connection(), "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: sentencias.append(sql.split()[0]))
+
+    stub.respuestas = [(500, {}, 0)]
+    assert "error" in caso_uso.ejecutar({"cliente_dni": dni, "monto": 100, "concepto": "Cuota"})
+    assert sentencias == []
+
+    stub.respuestas = [(201, {"id": "pref-1", "init_point": "a", "sandbox_init_point": "b"}, 0)]
+    resultado = caso_uso.ejecutar({"cliente_dni": dni, "monto": 100, "concepto": "Cuota"})
+    assert resultado["success"] and resultado["preference_id"] == "pref-1"
+    assert sentencias == ["INSERT", "INSERT"]
+
+    pago = db_session.get(Pago, resultado["pago_id"])
+    assert pago.transaccion_id == resultado["transaccion_id"]
+    assert EstadoPago(pago.estado_pago) == EstadoPago.PENDIENTE
+    assert pago.referencia == resultado["referencia_interna"]
+    assert (pago.preference_id, pago.referencia_mp) == ("pref-1", pago.referencia)
+    assert b'"external_reference": "%s"' % pago.referencia.encode() in stub.pedidos[-1]["cuerpo"]
+    assert db_session.query(Transaccion).filter(Transaccion.cliente_dni == dni).count() == 1
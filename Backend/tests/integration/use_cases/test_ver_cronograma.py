@@ -0,0 +1,102 @@
+# tests/integration/use_cases/test_ver_cronograma.py
+from datetime import datetime
+from tests.integration.utils import generar_dni_aleatorio
+
+
+def _inscribir_en_clase(db_session, dni, **datos_clase):
+    from models.clase import Clase
+    from models.inscripcion import Inscripcion
+
+    clase = Clase(**datos_clase)
+    db_session.add(clase)
+    db_session.commit()
+    db_session.refresh(clase)
+    db_session.add(Inscripcion(cliente_dni=dni, clase_id=clase.id))
+    db_session.commit()
+    return clase
+
+
+def test_ver_cronograma_genera_ocurrencias_de_la_ventana(db_session):
+    """Solo clases activas, una ocurrencia por día de la semana dentro de [desde, hasta]"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Casos_de_uso.Inscripciones.ver_cronograma import ver_cronograma
+
+    dni = generar_dni_aleatorio()
+    yoga = _inscribir_en_clase(db_session, dni, nombre="Yoga", dias_semana=["lunes", "miercoles"], hora="08:30")
+    _inscribir_en_clase(db_session, dni, nombre="Cerrada", dias_semana=["lunes"], hora="10:00", activa=False)
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+
+    # Lunes 2 de junio de 2025, 09:00: la clase de ese lunes a las 08:30 ya pasó
+    cronograma = ver_cronograma(dni, repositorio, datetime(2025, 6, 2, 9, 0), datetime(2025, 6, 16, 8, 30))
+
+    assert [c["fecha"] for c in cronograma] == [
+        datetime(2025, 6, 4, 8, 30),
+        datetime(2025, 6, 9, 8, 30),
+        datetime(2025, 6, 11, 8, 30),
+        datetime(2025, 6, 16, 8, 30),
+    ]
+    assert {c["clase_id"] for c in cronograma} == {yoga.id}
+
+
+def test_ver_cronograma_se_invalida_al_cambiar_la_clase(db_session):
+    """El plan cacheado se descarta cuando cambia una clase del cliente"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Casos_de_uso.Inscripciones.ver_cronograma import ver_cronograma
+    from servicios.cronograma import motor_cronograma
+
+    dni = generar_dni_aleatorio()
+    clase = _inscribir_en_clase(db_session, dni, nombre="Box", dias_semana=["martes"], hora="19:00")
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+    ventana = (datetime(2025, 6, 2), datetime(2025, 6, 8, 23, 59))
+
+    assert [c["fecha"].hour for c in ver_cronograma(dni, repositorio, *ventana)] == [19]
+    fallos = motor_cronograma.estadisticas()["fallos"]
+    ver_cronograma(dni, repositorio, *ventana)
+    assert motor_cronograma.estadisticas()["fallos"] == fallos  # servido desde la cache
+
+    clase.hora = "07:00"
+    clase.dias_semana = ["martes", "jueves"]
+    db_session.add(clase)
+    db_session.commit()
+
+    assert [c["fecha"] for c in ver_cronograma(dni, repositorio, *ventana)] == [
+        datetime(2025, 6, 3, 7, 0),
+        datetime(2025, 6, 5, 7, 0),
+    ]
+
+
+def test_cronograma_se_invalida_recien_al_confirmar(db_session):
+    """El flush solo anota: hasta el COMMIT el plan cacheado sigue, y se descarta al confirmar"""
+    from Adaptadores.adaptadorInscripcionSQL import AdaptadorInscripcionesSQL
+    from Casos_de_uso.Inscripciones.ver_cronograma import ver_cronograma
+    from servicios.cronograma import motor_cronograma
+
+    dni = generar_dni_aleatorio()
+    clase = _inscribir_en_clase(db_session, dni, nombre="Yoga", dias_semana=["lunes"], hora="08:00")
+    repositorio = AdaptadorInscripcionesSQL(db_session)
+    ventana = (datetime(2025, 6, 2), datetime(2025, 6, 8, 23, 59))
+    ver_cronograma(dni, repositorio, *ventana)
+
+    clase.hora = "10:00"
+    db_session.add(clase)
+    db_session.flush()
+    assert dni in motor_cronograma._planes
+    db_session.commit()
+    assert dni not in motor_cronograma._planes
+
+
+def test_motor_cronograma_descarta_el_cliente_usado_hace_mas_tiempo():
+    from servicios.cronograma import MotorCronograma
+
+    motor = MotorCronograma(max_clientes=2)
+    cargar = lambda dni: [{"clase_id": int(dni), "nombre": "Box", "descripcion": None,
+                           "hora": "19:00", "dias_mask": 1}]
+    motor.obtener_plan("1", cargar)
+    motor.obtener_plan("2", cargar)
+    motor.obtener_plan("1", cargar)  # acierto: "2" queda como el menos usado
+    motor.obtener_plan("3", cargar)
+
+    assert list(motor._planes) == ["1", "3"]
+    assert 2 not in motor._clientes_por_clase
+    motor.invalidar_clase(1)
+    assert motor.estadisticas()["clientes_en_cache"] == 1